@@ -0,0 +1 @@
+"""ESPN scoreboard fetchers that populate Game_Dataframe."""
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Atomic, streaming writer for the Game_Dataframe JSON files. Rows are encoded one at a
+# time into a temp file next to the target, which is fsync'd and then os.replace'd into
+# place, so a reader sees either the old file or the new one, never a truncated one.
+# Every write also publishes a version stamp (nba_games.json -> nba_games.version.json)
+# with the SHA-256 of the bytes written, a counter that goes up whenever they change and
+# the mtime/size of the file it describes (so a stamp is never applied to other content).
+#
+# The output is byte-for-byte what json.dump(rows, f, indent=4) produced before.
+
+CHUNK_BYTES = 1 << 16
+
+
+def version_path(json_path):
+    json_path = Path(json_path)
+    return json_path.with_name(f"{json_path.stem}.version.json")
+
+
+def iter_json_array(rows, indent=4):
+    """Yield the JSON text of a list of rows piece by piece (rows may be any iterable)."""
+    encoder = json.JSONEncoder(indent=indent)
+    pad = "\n" + " " * indent
+    first = True
+    for row in rows:
+        # Encoded strings never contain a raw newline, so re-indenting the row is safe.
+        text = encoder.encode(row).replace("\n", pad)
+        yield ("[" if first else ",") + pad + text
+        first = False
+    yield "[]" if first else "\n]"
+
+
+def hash_json_rows(rows, indent=4):
+    """The SHA-256 of the bytes write_json_rows() would write, computed without building them."""
+    digest = hashlib.sha256()
+    for chunk in iter_json_array(rows, indent):
+        digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def read_version(json_path):
+    """Return the version stamp published with json_path ({"version", "sha256", ...}) or None."""
+    try:
+        with open(version_path(json_path), "r", encoding="utf-8") as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return stamp if isinstance(stamp, dict) else None
+
+
+def _fsync_dir(path):
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_text(path, text):
+    """Atomically replace a (small) file with `text`: temp file, fsync, os.replace."""
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+
+def write_json_rows(json_path, rows, indent=4):
+    """
+    Stream rows into json_path atomically and publish its new version stamp.
+    Returns the stamp; raises OSError (the old file is left untouched) if the write fails.
+    """
+    json_path = Path(json_path)
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = json_path.with_name(f"{json_path.name}.{os.getpid()}.tmp")
+    digest = hashlib.sha256()
+    size = 0
+    chunks = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            buffer = []
+            buffered = 0
+            for chunk in iter_json_array(rows, indent):
+                data = chunk.encode("utf-8")
+                buffer.append(data)
+                buffered += len(data)
+                if buffered >= CHUNK_BYTES:
+                    block = b"".join(buffer)
+                    f.write(block)
+                    digest.update(block)
+                    size += len(block)
+                    buffer, buffered = [], 0
+                chunks += 1
+            block = b"".join(buffer)
+            f.write(block)
+            digest.update(block)
+            size += len(block)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, json_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    previous = read_version(json_path) or {}
+    sha256 = digest.hexdigest()
+    st = os.stat(json_path)
+    stamp = {
+        "version": int(previous.get("version", 0)) + (previous.get("sha256") != sha256),
+        "sha256": sha256,
+        "source": [st.st_mtime_ns, st.st_size],
+        "rows": chunks - 1,  # one chunk per row plus the closing bracket
+        "bytes": size,
+        "written": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    write_text(version_path(json_path), json.dumps(stamp, indent=4))
+    return stamp
@@ -0,0 +1,172 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+from Data_Queries import http_cache, telemetry
+
+# Shared fetch layer for the ESPN scoreboard scripts: one pooled keep-alive Session,
+# a bounded thread pool, a per-host concurrency cap, timeouts and retry with backoff.
+# fetch_rows()/fetch_all_rows() add conditional requests backed by http_cache.
+
+# Headers to prevent request blocks
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
+}
+
+DEFAULT_TIMEOUT = 10  # seconds
+MAX_WORKERS = 16
+PER_HOST_LIMIT = 10
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide Session, creating it with a connection pool on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(HEADERS)
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=PER_HOST_LIMIT)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def _host_slot(url):
+    host = urlsplit(url).netloc
+    with _host_slots_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return slot
+
+
+def _get(url, timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES, headers=None, info=None):
+    """
+    GET a URL and return the Response (2xx or 304), or None on failure.
+    Connection errors, timeouts and 429/5xx responses are retried with exponential backoff.
+    `info`, when given, receives the final "status", the number of "attempts" and any "error".
+    """
+    info = {} if info is None else info
+    session = get_session()
+    for attempt in range(retries + 1):
+        info["attempts"] = attempt + 1
+        try:
+            with _host_slot(url):
+                response = session.get(url, timeout=timeout, headers=headers)
+            info["status"] = response.status_code
+            if response.status_code in RETRY_STATUSES and attempt < retries:
+                raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+            response.raise_for_status()
+            return response
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            status = e.response.status_code if getattr(e, "response", None) is not None else None
+            retryable = status is None or status in RETRY_STATUSES
+            if not retryable or attempt >= retries:
+                print(f"❌ Error fetching {url}: {e}")
+                info["error"] = str(e)
+                return None
+            time.sleep(BACKOFF_SECONDS * (2 ** attempt))
+    return None
+
+
+def fetch_json(url, timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES):
+    """GET a URL and return its decoded JSON body, or None on failure."""
+    response = _get(url, timeout=timeout, retries=retries)
+    if response is None:
+        return None
+    try:
+        return response.json()
+    except ValueError as e:
+        print(f"❌ Invalid JSON from {url}: {e}")
+        return None
+
+
+def fetch_rows(url, parse_fn, date_str, timeout=DEFAULT_TIMEOUT, sample=None):
+    """
+    Fetch a scoreboard URL and return parse_fn(data, date_str), or None on failure.
+    With the HTTP cache enabled the request is conditional; a 304 or an identical body
+    returns the rows extracted last time without decoding the payload again.
+    `sample`, when given, is filled with the telemetry of the request (see telemetry.py).
+    """
+    sample = {} if sample is None else sample
+    use_cache = http_cache.enabled()
+    parser = f"{parse_fn.__module__}.{parse_fn.__qualname__}"
+    cached = http_cache.get(url, parser) if use_cache else None
+    start = time.perf_counter()
+    response = _get(url, timeout=timeout, headers=http_cache.conditional_headers(cached), info=sample)
+    sample["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    if response is None:
+        return None
+    sample["bytes"] = len(response.content)
+    digest = None
+    if not use_cache:
+        sample["cache"] = "off"
+    elif response.status_code == 304 and cached is not None:
+        metrics.cache_event("http_cache", True)
+        sample.update(cache="not_modified", rows=len(cached["rows"]))
+        return cached["rows"]
+    else:
+        digest = http_cache.body_hash(response.content)
+        hit = cached is not None and cached["body_hash"] == digest
+        metrics.cache_event("http_cache", hit)
+        if hit:
+            if response.headers.get("ETag") != cached.get("etag") or response.headers.get("Last-Modified") != cached.get("last_modified"):
+                http_cache.put(url, parser, response, digest, cached["rows"])
+            sample.update(cache="unchanged", rows=len(cached["rows"]))
+            return cached["rows"]
+        sample["cache"] = "miss"
+    parse_start = time.perf_counter()
+    try:
+        data = response.json()
+    except ValueError as e:
+        print(f"❌ Invalid JSON from {url}: {e}")
+        sample["error"] = f"Invalid JSON: {e}"
+        return None
+    rows = parse_fn(data, date_str)
+    sample["parse_ms"] = round((time.perf_counter() - parse_start) * 1000, 1)
+    sample["rows"] = len(rows)
+    if use_cache:
+        http_cache.put(url, parser, response, digest, rows)
+    return rows
+
+
+def fetch_all_rows(date_list, url_fn, parse_fn, max_workers=MAX_WORKERS, timeout=DEFAULT_TIMEOUT, sport=None):
+    """
+    Fetch and parse many dates concurrently; returns each date's rows (or None) in input order.
+    With `sport` set, the per-date timings are appended to the telemetry log as one run.
+    """
+    date_list = list(date_list)
+    if not date_list:
+        return []
+    samples = [{"date": date_str} for date_str in date_list]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(date_list))) as executor:
+        results = list(executor.map(
+            lambda sample: fetch_rows(url_fn(sample["date"]), parse_fn, sample["date"],
+                                      timeout=timeout, sample=sample),
+            samples))
+    if sport is not None:
+        for sample, rows in zip(samples, results):
+            sample["ok"] = rows is not None
+        telemetry.record_run(sport, samples, time.perf_counter() - start)
+    return results
+
+
+def fetch_result(rows, saved, failed_dates=(), error=None):
+    """Build the structured result a fetcher returns to update_data when run in-process."""
+    return {"rows": rows, "saved": saved, "failed_dates": list(failed_dates), "error": error}
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+# On-disk response cache for the scoreboard calls. For every URL it remembers the
+# ETag/Last-Modified validators, a hash of the last body and the rows the fetcher
+# extracted from it, so an unchanged date (304, or 200 with an identical body) costs
+# neither a JSON decode nor a re-parse. Set ROBBY_HTTP_CACHE=off to disable it.
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(os.environ.get("ROBBY_HTTP_CACHE_DIR", BASE_DIR / "Game_Dataframe" / "http_cache"))
+
+# Bump when the parse functions change shape so cached rows are re-extracted.
+CACHE_VERSION = 1
+
+_entries = {}
+_lock = threading.Lock()
+
+
+def enabled():
+    return os.environ.get("ROBBY_HTTP_CACHE", "on").lower() not in ("off", "0", "false")
+
+
+def _entry_path(url):
+    return CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+
+def body_hash(body):
+    return hashlib.sha256(body).hexdigest()
+
+
+def get(url, parser):
+    """Return the cached entry for a URL and parser, or None."""
+    with _lock:
+        entry = _entries.get(url)
+    if entry is None:
+        try:
+            with open(_entry_path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        with _lock:
+            _entries[url] = entry
+    if entry.get("version") != CACHE_VERSION or entry.get("parser") != parser or entry.get("url") != url:
+        return None
+    return entry
+
+
+def put(url, parser, response, digest, rows):
+    """Store the validators, body hash and extracted rows of a 200 response (atomically)."""
+    entry = {
+        "version": CACHE_VERSION,
+        "url": url,
+        "parser": parser,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "body_hash": digest,
+        "rows": rows,
+    }
+    path = _entry_path(url)
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ Could not write HTTP cache entry for {url}: {e}")
+    with _lock:
+        _entries[url] = entry
+
+
+def conditional_headers(entry):
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
@@ -0,0 +1,195 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pytz
+
+from Data_Queries import fetch_engine, shards
+import sqlite_store
+
+# Incremental refresh support: remembers, per sport and date, when the date was last
+# fetched, which events it returned and whether all of them were final. Only dates that
+# can still change are re-fetched, and their rows are merged into the existing month
+# shards; only the shards those dates touch are read (see Data_Queries/shards.py).
+#
+# fetch_and_store() is the fetch -> shards -> fetch state -> SQLite pipeline every
+# sport's fetcher runs, full or incremental; the fetchers only supply the URL and
+# parse functions.
+
+EASTERN = pytz.timezone("America/New_York")
+STATE_FIELDS = ("status.state", "comp.status.state")
+
+
+def state_path(output_path):
+    """The fetch state lives next to the sport's JSON file, e.g. nba_games_state.json."""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}_state.json")
+
+
+def load_state(output_path):
+    path = state_path(output_path)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Could not read fetch state {path}: {e}")
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_state(output_path, state):
+    path = state_path(output_path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=4, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def today_str():
+    return datetime.now(EASTERN).strftime("%Y%m%d")
+
+
+def row_state(row):
+    for field in STATE_FIELDS:
+        if field in row:
+            return row[field]
+    return None
+
+
+def dates_to_refresh(state, date_list, today=None, immutable_months=()):
+    """
+    Return the dates that were never fetched, are today or later, or still have unfinished
+    games. Dates in immutable month shards are never re-fetched.
+    """
+    today = today or today_str()
+    refresh = []
+    for date_str in date_list:
+        if f"{date_str[:4]}-{date_str[4:6]}" in immutable_months:
+            continue
+        entry = state.get(date_str)
+        if entry is None or date_str >= today or not entry.get("final"):
+            refresh.append(date_str)
+    return refresh
+
+
+def is_final(rows, date_str, today=None):
+    """A date is final once every row is in the "post" state; an empty past date is final too."""
+    today = today or today_str()
+    if not rows:
+        return date_str < today
+    return all(row_state(row) == "post" for row in rows)
+
+
+def _row_date(row):
+    return row.get("event.date") or row.get("comp.date") or ""
+
+
+def merge_rows(existing_rows, new_rows, replaced_event_ids):
+    """Drop the existing rows of re-fetched events and add the new ones, ordered by event date."""
+    replaced = set(replaced_event_ids)
+    replaced.update(row.get("event.id") for row in new_rows)
+    merged = [row for row in existing_rows if row.get("event.id") not in replaced]
+    merged.extend(new_rows)
+    merged.sort(key=_row_date)
+    return merged
+
+
+def read_rows(output_path, months=None):
+    """The existing rows of a sport (only those in `months` if given); [] if they cannot be read."""
+    rows = shards.read_rows(output_path, months)
+    return rows if rows is not None else []
+
+
+def fetch_incremental(label, date_list, url_fn, parse_fn, output_path, sport=None):
+    """
+    Re-fetch only the dates that can still change and merge them into the existing rows
+    of the months they touch. Returns (merged_rows, new_state, failed_dates); merged_rows
+    only covers those months, which is what shards.write_rows() replaces. The caller saves
+    new_state once the rows are written. `sport` labels the run in the telemetry log.
+    """
+    state = load_state(output_path)
+    today = today_str()
+    if not shards.has_data(output_path):
+        # Without any data there is nothing to merge into, so fetch everything.
+        state = {}
+    dates = dates_to_refresh(state, date_list, today, shards.immutable_months(output_path))
+    print(f"🔄 Incremental {label} refresh: {len(dates)} of {len(date_list)} dates need fetching")
+
+    results = fetch_engine.fetch_all_rows(dates, url_fn, parse_fn, sport=sport)
+    new_state = dict(state)
+    new_rows = []
+    replaced_event_ids = []
+    failed_dates = []
+    fetched_at = datetime.now(pytz.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    for date_str, rows in zip(dates, results):
+        if rows is None:
+            # Keep the previous rows and state for dates that failed to download.
+            failed_dates.append(date_str)
+            continue
+        replaced_event_ids.extend(state.get(date_str, {}).get("event_ids", []))
+        new_rows.extend(rows)
+        new_state[date_str] = {
+            "fetched_at": fetched_at,
+            "final": is_final(rows, date_str, today),
+            "event_ids": sorted({row.get("event.id") for row in rows if row.get("event.id")}),
+        }
+    # Read the existing rows of every month the new rows or the re-fetched dates fall in
+    # (a date's games can start in the next month in ET).
+    months = set(shards.months_of_dates(dates)) | set(shards.split_by_month(new_rows))
+    existing_rows = read_rows(output_path, months)
+    return merge_rows(existing_rows, new_rows, replaced_event_ids), new_state, failed_dates
+
+
+def fetch_and_store(sport, dates, url_fn, parse_fn, output_path, incremental_mode=False, transform=None,
+                    label=None):
+    """
+    Fetch a sport's dates (in incremental mode only those whose games can still change),
+    write the rows into its month shards, save the fetch state and mirror the rows into
+    SQLite when it is enabled. `transform(rows)` filters the rows before they are written;
+    `label` names the sport in the log (default: `sport`).
+    Returns fetch_engine.fetch_result() with the rows, whether they were saved and any
+    dates that failed to download.
+    """
+    label = label or sport
+    fetch_state = None
+    failed_dates = []
+    if incremental_mode:
+        rows, fetch_state, failed_dates = fetch_incremental(label, dates, url_fn, parse_fn, output_path,
+                                                            sport=sport)
+    else:
+        # Fetch every date concurrently over the shared connection pool (unchanged dates come from the HTTP cache)
+        print(f"🔄 Fetching {label} games for {len(dates)} dates...")
+        rows = []
+        results = fetch_engine.fetch_all_rows(dates, url_fn, parse_fn, sport=sport)
+        for date_str, date_rows in zip(dates, results):
+            if date_rows is None:
+                print(f"❌ Error fetching data for {date_str}")
+                failed_dates.append(date_str)
+            else:
+                rows.extend(date_rows)
+
+    # An incremental run with nothing left to re-fetch has no rows but nothing failed either.
+    if not rows and not incremental_mode:
+        print("❌ No games fetched. The JSON file will NOT be created.")
+        return fetch_engine.fetch_result([], False, failed_dates, "No games fetched")
+    if transform is not None:
+        rows = transform(rows)
+
+    try:
+        # Incremental rows replace the months they touched; a full fetch is merged by the
+        # dates it fetched, so days it did not cover (or failed to fetch) are kept.
+        fetched = None if incremental_mode else [d for d in dates if d not in failed_dates]
+        manifest, written = shards.write_rows(output_path, rows, fetched)
+        print(f"✅ {label} games data saved to {shards.shard_dir(output_path)} "
+              f"({written} of {len(manifest['shards'])} month shards changed)")
+    except Exception as e:
+        print(f"❌ Error writing JSON file: {e}")
+        return fetch_engine.fetch_result(rows, False, failed_dates, str(e))
+    if fetch_state is not None:
+        save_state(output_path, fetch_state)
+    if sqlite_store.enabled():
+        sqlite_store.upsert_rows(sport, rows)
+    return fetch_engine.fetch_result(rows, True, failed_dates)
@@ -1,113 +1,92 @@
-import requests
-import json
-import os
-from datetime import datetime, timedelta
+import argparse
+import sys
 from collections import defaultdict
 from pathlib import Path
 
+# Make the project root importable so the shared fetch layer resolves when run as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from Data_Queries import incremental, seasons
+
 # The script is in Data_Queries, so we go one level up to the project root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
 # Construct the relative path for the JSON output file located in Game_Dataframe
 OUTPUT_FILE = PROJECT_ROOT / "Game_Dataframe" / "march_madness_games.json"
 
-# Define the date range: from March 13, 2025 to June 30, 2025
-start_date = datetime(2025, 3, 13)
-end_date = datetime(2025, 6, 30)
-date_list = [(start_date + timedelta(days=i)).strftime("%Y%m%d") for i in range((end_date - start_date).days + 1)]
+# Dates in the configured March Madness seasons (see Data_Queries/seasons.py)
+date_list = seasons.date_list("MarchMadness")
 
-def fetch_simplified_march_madness():
-    all_simplified_rows = []
-    
-    # Loop over each date in the range and fetch data
-    for date in date_list:
-        url = (
-            "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard"
-            f"?dates={date}&groups=50&limit=500"
-        )
-        print(f"🔄 Fetching March Madness data for {date}...")
-        response = requests.get(url)
-        if response.status_code != 200:
-            print(f"❌ Error fetching data for {date}: HTTP {response.status_code}")
-            continue
-        
-        data = response.json()
-        events = data.get("events", [])
+def march_madness_url(date):
+    return (
+        "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard"
+        f"?dates={date}&groups=50&limit=500"
+    )
+
+def parse_march_madness_games(data, date=None):
+    """Flatten an ESPN men's college basketball scoreboard payload into simplified rows."""
+    rows = []
+    events = data.get("events", [])
+
+    # Process each event (game)
+    for event in events:
+        # Extract simplified event-level fields
+        event_id = event.get("id")
+        event_uid = event.get("uid")
+        event_date = event.get("date")
+        event_name = event.get("name")
+        event_shortName = event.get("shortName")
         
-        # Process each event (game)
-        for event in events:
-            # Extract simplified event-level fields
-            event_id = event.get("id")
-            event_uid = event.get("uid")
-            event_date = event.get("date")
-            event_name = event.get("name")
-            event_shortName = event.get("shortName")
+        # Process each competition in the event
+        competitions = event.get("competitions", [])
+        for competition in competitions:
+            comp_id = competition.get("id")
+            comp_uid = competition.get("uid")
+            comp_date = competition.get("date")
+            comp_state = competition.get("status", {}).get("type", {}).get("state")
             
-            # Process each competition in the event
-            competitions = event.get("competitions", [])
-            for competition in competitions:
-                comp_id = competition.get("id")
-                comp_uid = competition.get("uid")
-                comp_date = competition.get("date")
+            # Process each competitor (team) in the competition
+            competitors = competition.get("competitors", [])
+            for competitor in competitors:
+                competitor_homeAway = competitor.get("homeAway")
+                competitor_score = competitor.get("score")
                 
-                # Process each competitor (team) in the competition
-                competitors = competition.get("competitors", [])
-                for competitor in competitors:
-                    competitor_homeAway = competitor.get("homeAway")
-                    competitor_score = competitor.get("score")
-                    
-                    # Expand the team record for key details
-                    team = competitor.get("team", {})
-                    team_id = team.get("id")
-                    team_location = team.get("location")
-                    team_name = team.get("name")
-                    team_abbreviation = team.get("abbreviation")
-                    team_displayName = team.get("displayName")
-                    team_shortDisplayName = team.get("shortDisplayName")
-                    team_color = team.get("color")
-                    team_alternateColor = team.get("alternateColor")
-                    team_logo = team.get("logo")
-                    
-                    # Build a simplified row with only the desired fields
-                    row = {
-                        "event.id": event_id,
-                        "event.uid": event_uid,
-                        "event.date": event_date,
-                        "event.name": event_name,
-                        "event.shortName": event_shortName,
-                        "comp.id": comp_id,
-                        "comp.uid": comp_uid,
-                        "comp.date": comp_date,
-                        "comp.competitors.homeAway": competitor_homeAway,
-                        "comp.competitors.score": competitor_score,
-                        "team.id": team_id,
-                        "team.location": team_location,
-                        "team.name": team_name,
-                        "team.abbreviation": team_abbreviation,
-                        "team.displayName": team_displayName,
-                        "team.shortDisplayName": team_shortDisplayName,
-                        "team.color": team_color,
-                        "team.alternateColor": team_alternateColor,
-                        "team.logo": team_logo
-                    }
-                    all_simplified_rows.append(row)
-                    
-    print(f"✅ Expanded {len(all_simplified_rows)} simplified rows from March Madness data.")
-    return all_simplified_rows
-
-def save_data(data, output_path):
-    # Ensure the output directory exists
-    directory = os.path.dirname(output_path)
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-        print(f"✅ Created folder: {directory}")
-    
-    try:
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
-        print(f"✅ Simplified March Madness data saved to {output_path}")
-    except Exception as e:
-        print(f"❌ Error writing JSON file: {e}")
+                # Expand the team record for key details
+                team = competitor.get("team", {})
+                team_id = team.get("id")
+                team_location = team.get("location")
+                team_name = team.get("name")
+                team_abbreviation = team.get("abbreviation")
+                team_displayName = team.get("displayName")
+                team_shortDisplayName = team.get("shortDisplayName")
+                team_color = team.get("color")
+                team_alternateColor = team.get("alternateColor")
+                team_logo = team.get("logo")
+                
+                # Build a simplified row with only the desired fields
+                row = {
+                    "event.id": event_id,
+                    "event.uid": event_uid,
+                    "event.date": event_date,
+                    "event.name": event_name,
+                    "event.shortName": event_shortName,
+                    "comp.id": comp_id,
+                    "comp.uid": comp_uid,
+                    "comp.date": comp_date,
+                    "comp.status.state": comp_state,
+                    "comp.competitors.homeAway": competitor_homeAway,
+                    "comp.competitors.score": competitor_score,
+                    "team.id": team_id,
+                    "team.location": team_location,
+                    "team.name": team_name,
+                    "team.abbreviation": team_abbreviation,
+                    "team.displayName": team_displayName,
+                    "team.shortDisplayName": team_shortDisplayName,
+                    "team.color": team_color,
+                    "team.alternateColor": team_alternateColor,
+                    "team.logo": team_logo
+                }
+                rows.append(row)
+    return rows
 
 def filter_out_tbd_events(data):
     """
@@ -126,9 +105,21 @@ def filter_out_tbd_events(data):
         filtered_data.extend(rows)
     return filtered_data
 
+def fetch_and_store_march_madness_games(incremental_mode=False, dates=None):
+    """
+    Fetch March Madness games, drop all-TBD events and store them in the month shards.
+    In incremental mode only dates whose games can still change are re-fetched and merged.
+    `dates` (YYYYMMDD) replaces the configured seasons.
+    Returns the rows, whether they were saved and any dates that failed to download.
+    """
+    return incremental.fetch_and_store("MarchMadness", date_list if dates is None else dates, march_madness_url,
+                                       parse_march_madness_games, OUTPUT_FILE, incremental_mode,
+                                       transform=filter_out_tbd_events, label="March Madness")
+
 if __name__ == "__main__":
-    simplified_data = fetch_simplified_march_madness()
-    if simplified_data:
-        # Filter out events where every team.displayName is "TBD"
-        filtered_data = filter_out_tbd_events(simplified_data)
-        save_data(filtered_data, OUTPUT_FILE)
+    parser = argparse.ArgumentParser(description="Fetch March Madness games from ESPN into Game_Dataframe.")
+    parser.add_argument("--incremental", action="store_true", help="Only re-fetch dates whose games can still change.")
+    seasons.add_arguments(parser)
+    args = parser.parse_args()
+    fetch_and_store_march_madness_games(incremental_mode=args.incremental,
+                                        dates=seasons.dates_from_args("MarchMadness", args))
@@ -1,9 +1,11 @@
-import requests
-import json
-import os
-from datetime import datetime, timedelta
+import argparse
+import sys
 from pathlib import Path
 
+# Make the project root importable so the shared fetch layer resolves when run as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from Data_Queries import fetch_engine, incremental, seasons
+
 # Base ESPN MLB API URL (expects date in YYYYMMDD format)
 MLB_URL = "http://site.api.espn.com/apis/site/v2/sports/baseball/mlb/scoreboard?dates="
 
@@ -13,32 +15,27 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 # Construct the relative path for the JSON output file located in Game_Dataframe
 OUTPUT_FILE = PROJECT_ROOT / "Game_Dataframe" / "mlb_games.json"
 
-# 1) Generate a list of dates from March 13, 2025 to June 30, 2025 (YYYYMMDD format)
-start_date = datetime(2025, 3, 13)
-end_date = datetime(2025, 6, 30)
-date_list = [(start_date + timedelta(days=i)).strftime("%Y%m%d") for i in range((end_date - start_date).days + 1)]
+# Dates in the configured MLB seasons (see Data_Queries/seasons.py)
+date_list = seasons.date_list("MLB")
 
 def get_mlb_games_for_date(date_str):
     """
     Fetch MLB games for a specific date from the ESPN API and return a list of simplified rows.
     For each event, this function extracts:
       - Top-level event fields: id, date, shortName.
-      - From each competition: status (displayClock, period).
+      - From each competition: status (displayClock, period, state).
       - From each competitor: score and team info (id, displayName, abbreviation).
     """
     print(f"🔄 Fetching MLB games for {date_str}...")
-    url = MLB_URL + date_str
-    try:
-        response = requests.get(url)
-    except Exception as e:
-        print(f"❌ Exception fetching data for {date_str}: {e}")
-        return []
-    
-    if response.status_code != 200:
-        print(f"❌ Error fetching data for {date_str}: HTTP {response.status_code}")
+    data = fetch_engine.fetch_json(MLB_URL + date_str)
+    return parse_mlb_games(data, date_str)
+
+def parse_mlb_games(data, date_str):
+    """Flatten an ESPN MLB scoreboard payload into one simplified row per competitor."""
+    if data is None:
+        print(f"❌ Error fetching data for {date_str}")
         return []
-    
-    data = response.json()
+
     events = data.get("events", [])
     rows = []
     
@@ -55,6 +52,7 @@ def get_mlb_games_for_date(date_str):
             comp_status = competition.get("status", {})
             display_clock = comp_status.get("displayClock")
             period = comp_status.get("period")
+            state = comp_status.get("type", {}).get("state")
             
             # Expand the competitors (teams)
             competitors = competition.get("competitors", [])
@@ -72,6 +70,7 @@ def get_mlb_games_for_date(date_str):
                     "event.shortName": event_shortName,
                     "comp.status.displayClock": display_clock,
                     "comp.status.period": period,
+                    "comp.status.state": state,
                     "comp.competitors.score": competitor_score,
                     "team.id": team_id,
                     "team.displayName": team_displayName,
@@ -82,30 +81,22 @@ def get_mlb_games_for_date(date_str):
     print(f"✅ Extracted {len(rows)} rows for {date_str}.")
     return rows
 
-def fetch_and_store_mlb_games():
-    """ Fetch MLB games for the full date range and save the simplified data as JSON. """
-    all_rows = []
-    for date_str in date_list:
-        rows = get_mlb_games_for_date(date_str)
-        if rows:
-            all_rows.extend(rows)
-    
-    if not all_rows:
-        print("❌ No games fetched. JSON file will not be created.")
-        return
-    
-    # Ensure the output directory exists
-    output_dir = os.path.dirname(OUTPUT_FILE)
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        print(f"✅ Created folder: {output_dir}")
-    
-    try:
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(all_rows, f, indent=4)
-        print(f"✅ MLB games data saved to {OUTPUT_FILE}")
-    except Exception as e:
-        print(f"❌ Error writing JSON file: {e}")
+def mlb_url(date_str):
+    return MLB_URL + date_str
+
+def fetch_and_store_mlb_games(incremental_mode=False, dates=None):
+    """
+    Fetch MLB games for the full date range and store the simplified rows in the month shards.
+    In incremental mode only dates whose games can still change are re-fetched and merged.
+    `dates` (YYYYMMDD) replaces the configured seasons.
+    Returns the rows, whether they were saved and any dates that failed to download.
+    """
+    return incremental.fetch_and_store("MLB", date_list if dates is None else dates, mlb_url, parse_mlb_games,
+                                       OUTPUT_FILE, incremental_mode)
 
 if __name__ == "__main__":
-    fetch_and_store_mlb_games()
+    parser = argparse.ArgumentParser(description="Fetch MLB games from ESPN into Game_Dataframe.")
+    parser.add_argument("--incremental", action="store_true", help="Only re-fetch dates whose games can still change.")
+    seasons.add_arguments(parser)
+    args = parser.parse_args()
+    fetch_and_store_mlb_games(incremental_mode=args.incremental, dates=seasons.dates_from_args("MLB", args))
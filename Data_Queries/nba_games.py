@@ -1,10 +1,12 @@
-import requests
-import json
+import argparse
 import os
-import time
-from datetime import datetime, timedelta
+import sys
 from pathlib import Path
 
+# Make the project root importable so the shared fetch layer resolves when run as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from Data_Queries import fetch_engine, incremental, seasons
+
 # ESPN NBA API URL
 ESPN_URL = "http://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard"
 
@@ -18,28 +20,24 @@ if not os.path.exists(ROOT_FOLDER):
     os.makedirs(ROOT_FOLDER)
     print(f"✅ Created folder: {ROOT_FOLDER}")
 
-# Generate a list of dates from March 13, 2025, to June 30, 2025
-start_date = datetime(2025, 3, 13)
-end_date = datetime(2025, 6, 30)
-date_list = [(start_date + timedelta(days=i)).strftime("%Y%m%d") for i in range((end_date - start_date).days + 1)]
+# Dates in the configured NBA seasons (see Data_Queries/seasons.py)
+date_list = seasons.date_list("NBA")
 
-# Headers to prevent request blocks
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
-}
+def nba_url(date_str):
+    return f"{ESPN_URL}?dates={date_str}"
 
 def get_nba_games(date_str):
     """Fetch NBA games for a specific date from ESPN API, returning dot-notation keys."""
     print(f"🔄 Fetching NBA games for {date_str}...")
-    
-    try:
-        response = requests.get(f"{ESPN_URL}?dates={date_str}", headers=HEADERS, timeout=10)
-        response.raise_for_status()  # Raise an error for HTTP failures
-    except requests.RequestException as e:
-        print(f"❌ Error fetching data for {date_str}: {e}")
+    data = fetch_engine.fetch_json(nba_url(date_str))
+    return parse_nba_games(data, date_str)
+
+def parse_nba_games(data, date_str):
+    """Flatten an ESPN NBA scoreboard payload into one dot-notation row per competitor."""
+    if data is None:
+        print(f"❌ Error fetching data for {date_str}")
         return []
 
-    data = response.json()
     events = data.get("events", [])
 
     if not events:
@@ -57,6 +55,7 @@ def get_nba_games(date_str):
             comp_status = competition.get("status", {})
             display_clock = comp_status.get("displayClock", "N/A")
             period = comp_status.get("period", "N/A")
+            state = comp_status.get("type", {}).get("state", "N/A")
             competitors = competition.get("competitors", [])
 
             for competitor in competitors:
@@ -71,34 +70,25 @@ def get_nba_games(date_str):
                     "competitors.score": competitor.get("score", "0"),
                     "status.clock": display_clock,
                     "status.period": period,
+                    "status.state": state,
                 })
     
     print(f"✅ {len(games)} games found for {date_str}")
     return games
 
-def fetch_and_store_nba_games():
-    """Fetch NBA games for the full date range and store in JSON."""
-    all_games = []
-    
-    for i, date_str in enumerate(date_list):
-        games = get_nba_games(date_str)
-        if games:
-            all_games.extend(games)
-        
-        if i % 10 == 0:  # Small delay every 10 requests to prevent rate limiting
-            time.sleep(0)
-
-    if not all_games:
-        print("❌ No games fetched. The JSON file will NOT be created.")
-        return
-
-    # Save to JSON file
-    try:
-        with open(JSON_FILE_PATH, "w", encoding="utf-8") as f:
-            json.dump(all_games, f, indent=4)
-        print(f"✅ NBA Games data saved to {JSON_FILE_PATH}")
-    except Exception as e:
-        print(f"❌ Error writing JSON file: {e}")
+def fetch_and_store_nba_games(incremental_mode=False, dates=None):
+    """
+    Fetch NBA games for the full date range and store them in the month shards.
+    In incremental mode only dates whose games can still change are re-fetched and merged.
+    `dates` (YYYYMMDD) replaces the configured seasons.
+    Returns the rows, whether they were saved and any dates that failed to download.
+    """
+    return incremental.fetch_and_store("NBA", date_list if dates is None else dates, nba_url, parse_nba_games,
+                                       JSON_FILE_PATH, incremental_mode)
 
 if __name__ == "__main__":
-    fetch_and_store_nba_games()
+    parser = argparse.ArgumentParser(description="Fetch NBA games from ESPN into Game_Dataframe.")
+    parser.add_argument("--incremental", action="store_true", help="Only re-fetch dates whose games can still change.")
+    seasons.add_arguments(parser)
+    args = parser.parse_args()
+    fetch_and_store_nba_games(incremental_mode=args.incremental, dates=seasons.dates_from_args("NBA", args))
@@ -1,10 +1,11 @@
-import requests
-import json
-import os
-import time  # ✅ Import added here
-from datetime import datetime, timedelta
+import argparse
+import sys
 from pathlib import Path
 
+# Make the project root importable so the shared fetch layer resolves when run as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from Data_Queries import fetch_engine, incremental, seasons
+
 # ESPN NHL API URL
 NHL_URL = "http://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard"
 
@@ -12,15 +13,11 @@ NHL_URL = "http://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard"
 ROOT_FOLDER = Path(__file__).resolve().parent.parent
 JSON_DATA_PATH = ROOT_FOLDER / "Game_Dataframe" / "nhl_games.json"
 
-# Date range: from March 13, 2025 to June 30, 2025
-start_date = datetime(2025, 3, 13)
-end_date = datetime(2025, 6, 30)
-date_list = [(start_date + timedelta(days=i)).strftime("%Y%m%d") for i in range((end_date - start_date).days + 1)]
+# Dates in the configured NHL seasons (see Data_Queries/seasons.py)
+date_list = seasons.date_list("NHL")
 
-# Headers to prevent request blocks
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
-}
+def nhl_url(date_str):
+    return f"{NHL_URL}?dates={date_str}"
 
 def get_nhl_games(date_str):
     """
@@ -28,16 +25,15 @@ def get_nhl_games(date_str):
     Uses dot notation in the returned JSON fields.
     """
     print(f"🔄 Fetching NHL games for {date_str}...")
-    url = f"{NHL_URL}?dates={date_str}"
+    data = fetch_engine.fetch_json(nhl_url(date_str))
+    return parse_nhl_games(data, date_str)
 
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()  # Raise error for non-200 responses
-    except requests.RequestException as e:
-        print(f"❌ Error fetching data for {date_str}: {e}")
+def parse_nhl_games(data, date_str):
+    """Flatten an ESPN NHL scoreboard payload into one dot-notation row per competitor."""
+    if data is None:
+        print(f"❌ Error fetching data for {date_str}")
         return []
 
-    data = response.json()
     events = data.get("events", [])
 
     if not events:
@@ -55,6 +51,7 @@ def get_nhl_games(date_str):
             status = competition.get("status", {})
             display_clock = status.get("displayClock", "N/A")
             period = status.get("period", "N/A")
+            state = status.get("type", {}).get("state", "N/A")
             competitors = competition.get("competitors", [])
 
             for competitor in competitors:
@@ -68,36 +65,26 @@ def get_nhl_games(date_str):
                     "team.abbreviation": team.get("abbreviation", "N/A"),
                     "competitors.score": competitor.get("score", "0"),
                     "status.clock": display_clock,
-                    "status.period": period
+                    "status.period": period,
+                    "status.state": state
                 })
 
     print(f"✅ {len(games)} game entries found for {date_str}")
     return games
 
-def fetch_and_store_nhl_games():
+def fetch_and_store_nhl_games(incremental_mode=False, dates=None):
     """
-    Fetch NHL games for the entire date range and store the expanded data into a JSON file.
+    Fetch NHL games for the entire date range and store them in the month shards.
+    In incremental mode only dates whose games can still change are re-fetched and merged.
+    `dates` (YYYYMMDD) replaces the configured seasons.
+    Returns the rows, whether they were saved and any dates that failed to download.
     """
-    all_games = []
-
-    for i, date in enumerate(date_list):
-        games = get_nhl_games(date)
-        if games:
-            all_games.extend(games)
-
-        if i % 10 == 0:  # Small delay every 10 requests to prevent rate limits
-            time.sleep(0)
-
-    if not all_games:
-        print("❌ No games fetched. The JSON file will NOT be created.")
-        return
-
-    try:
-        with open(JSON_DATA_PATH, "w", encoding="utf-8") as f:
-            json.dump(all_games, f, indent=4)
-        print(f"✅ NHL Games data saved to {JSON_DATA_PATH}")
-    except Exception as e:
-        print(f"❌ Error writing JSON file: {e}")
+    return incremental.fetch_and_store("NHL", date_list if dates is None else dates, nhl_url, parse_nhl_games,
+                                       JSON_DATA_PATH, incremental_mode)
 
 if __name__ == "__main__":
-    fetch_and_store_nhl_games()
+    parser = argparse.ArgumentParser(description="Fetch NHL games from ESPN into Game_Dataframe.")
+    parser.add_argument("--incremental", action="store_true", help="Only re-fetch dates whose games can still change.")
+    seasons.add_arguments(parser)
+    args = parser.parse_args()
+    fetch_and_store_nhl_games(incremental_mode=args.incremental, dates=seasons.dates_from_args("NHL", args))
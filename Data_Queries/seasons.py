@@ -0,0 +1,86 @@
+import json
+import os
+from datetime import date, timedelta
+from pathlib import Path
+
+# The date windows ("seasons") each fetcher covers. The defaults are the window the
+# fetchers have always used; a JSON file (ROBBY_SEASONS, default seasons.json in the
+# project root) can replace a sport's list of seasons:
+#
+#   {"NBA": [{"name": "2024-25", "start": "2024-10-22", "end": "2025-06-30"}],
+#    "MLB": [{"name": "2025", "start": "2025-03-27", "end": "2025-10-31"}]}
+#
+# Data outside the configured windows is kept: shards of past months stay on disk
+# (Data_Queries/shards.py), so dropping an old season from the list only stops
+# re-fetching it.
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent
+CONFIG_PATH = Path(os.environ.get("ROBBY_SEASONS", str(ROOT_FOLDER / "seasons.json")))
+
+SPORTS = ("NBA", "NHL", "MLB", "MarchMadness")
+DEFAULT_SEASONS = {sport: [{"name": "2025", "start": "2025-03-13", "end": "2025-06-30"}] for sport in SPORTS}
+
+
+def _parse_season(season):
+    start = date.fromisoformat(season["start"])
+    end = date.fromisoformat(season["end"])
+    if end < start:
+        raise ValueError(f"season {season.get('name')!r} ends before it starts")
+    return {"name": str(season.get("name") or start.year), "start": start, "end": end}
+
+
+def load_config(path=None):
+    """Return {sport: [{"name", "start", "end"}, ...]} from the defaults and the config file."""
+    path = Path(path or CONFIG_PATH)
+    seasons = dict(DEFAULT_SEASONS)
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                configured = json.load(f)
+            for sport, entries in configured.items():
+                seasons[sport] = entries if isinstance(entries, list) else [entries]
+        except Exception as e:
+            print(f"⚠️ Could not read season config {path}: {e}; using the default seasons")
+            seasons = dict(DEFAULT_SEASONS)
+    parsed = {}
+    for sport, entries in seasons.items():
+        try:
+            parsed[sport] = [_parse_season(season) for season in entries]
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"⚠️ Invalid {sport} seasons in {path}: {e}; using the default seasons")
+            parsed[sport] = [_parse_season(season) for season in DEFAULT_SEASONS.get(sport, [])]
+    return parsed
+
+
+def date_list(sport, season=None, start=None, end=None):
+    """
+    Every date (YYYYMMDD, sorted) in a sport's configured seasons, or only in the season
+    named `season`. `start`/`end` (dates or YYYY-MM-DD) replace the configured windows.
+    """
+    if start is not None or end is not None:
+        windows = [_parse_season({"start": str(start or end), "end": str(end or start)})]
+    else:
+        windows = load_config().get(sport, [])
+        if season is not None:
+            windows = [window for window in windows if window["name"] == season]
+            if not windows:
+                print(f"⚠️ No {sport} season named {season!r} is configured")
+    dates = set()
+    for window in windows:
+        for i in range((window["end"] - window["start"]).days + 1):
+            dates.add((window["start"] + timedelta(days=i)).strftime("%Y%m%d"))
+    return sorted(dates)
+
+
+def add_arguments(parser):
+    """Add the --season/--start/--end options shared by the fetcher CLIs."""
+    parser.add_argument("--season", help="Only fetch this configured season (see Data_Queries/seasons.py).")
+    parser.add_argument("--start", help="First date to fetch (YYYY-MM-DD), instead of the configured seasons.")
+    parser.add_argument("--end", help="Last date to fetch (YYYY-MM-DD), instead of the configured seasons.")
+
+
+def dates_from_args(sport, args):
+    """The dates a fetcher CLI should cover, or None for the default (all configured seasons)."""
+    if args.season is None and args.start is None and args.end is None:
+        return None
+    return date_list(sport, season=args.season, start=args.start, end=args.end)
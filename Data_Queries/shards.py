@@ -0,0 +1,308 @@
+import argparse
+import json
+import os
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+import pytz
+
+# Make the project root importable when run as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from Data_Queries import atomic_json, snapshot
+import game_events
+
+# Month-sharded storage for the Game_Dataframe data. A sport's rows are split by the ET
+# month of their event into Game_Dataframe/<stem>/<YYYY-MM>.json (nba_games.json ->
+# nba_games/2025-03.json, ...), listed in a manifest that is written after the shards.
+# Each shard is streamed to disk by atomic_json (with its 2025-03.version.json stamp) and
+# gets a columnar snapshot (2025-03.columnar.json) that readers prefer, like the legacy file:
+#
+#   {"format": "robby-shards", "version": 1, "updated": "...Z",
+#    "shards": {"2025-03": {"file": "2025-03.json", "rows": N, "sha256": "...",
+#                           "first": "2025-03-13", "last": "2025-03-31",
+#                           "final": true, "immutable": true}, ...}}
+#
+# A write merges the fetched dates into the months they fall in (rows of other dates in
+# those months are kept) and leaves shards whose content did not change untouched, so
+# refreshing part of the current season never rewrites older ones. A month
+# is immutable once it is over (plus a day for late games) and all of its games are
+# final: incremental refreshes never re-fetch it and readers keep it cached for good.
+# Without a manifest a sport is still read from its legacy single file (nba_games.json
+# plus snapshot); `python Data_Queries/shards.py --migrate` splits those.
+
+FORMAT = "robby-shards"
+VERSION = 1
+MANIFEST_NAME = "manifest.json"
+# Rows whose event date does not parse.
+UNDATED = "undated"
+
+EASTERN = pytz.timezone("America/New_York")
+
+
+def shard_dir(json_path):
+    return Path(json_path).with_suffix("")
+
+
+def manifest_path(json_path):
+    return shard_dir(json_path) / MANIFEST_NAME
+
+
+def read_manifest(json_path):
+    """Return a sport's shard manifest, or None if the sport is not sharded (yet)."""
+    path = manifest_path(json_path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except OSError:
+        return None
+    except ValueError as e:
+        print(f"⚠️ Could not read shard manifest {path}: {e}")
+        return None
+    if not isinstance(manifest, dict) or manifest.get("format") != FORMAT:
+        return None
+    return manifest
+
+
+def month_key(day):
+    return f"{day.year:04d}-{day.month:02d}" if day is not None else UNDATED
+
+
+def months_of_dates(dates):
+    """The months (YYYY-MM) covered by a list of YYYYMMDD fetch dates."""
+    return sorted({f"{date_str[:4]}-{date_str[4:6]}" for date_str in dates})
+
+
+def split_by_month(rows):
+    """Group rows into {month: [row, ...]} by the ET date of their event, keeping their order."""
+    months = {}
+    days = {}  # rows of one event share a date string; parse each once
+    for row in rows:
+        date_str = row.get("event.date") or row.get("comp.date")
+        if date_str not in days:
+            days[date_str] = game_events.row_et_date(row)
+        months.setdefault(month_key(days[date_str]), []).append(row)
+    return months
+
+
+def _row_state(row):
+    for field in game_events.STATE_FIELDS:
+        if field in row:
+            return row[field]
+    return None
+
+
+def _is_immutable(month, final, today):
+    if month == UNDATED or not final:
+        return False
+    year, mon = (int(part) for part in month.split("-"))
+    next_month = date(year + mon // 12, mon % 12 + 1, 1)
+    return today > next_month
+
+
+def _shard_meta(month, rows, sha256, today):
+    days = sorted(d for d in (game_events.row_et_date(row) for row in rows) if d is not None)
+    final = all(_row_state(row) == "post" for row in rows)
+    return {
+        "file": f"{month}.json",
+        "rows": len(rows),
+        "sha256": sha256,
+        "first": days[0].isoformat() if days else None,
+        "last": days[-1].isoformat() if days else None,
+        "final": final,
+        "immutable": _is_immutable(month, final, today),
+    }
+
+
+def _row_date(row):
+    return row.get("event.date") or row.get("comp.date") or ""
+
+
+def _merge_month(existing_rows, new_rows, dates):
+    """
+    Merge a month's freshly fetched rows into its existing ones: existing rows dated on a
+    fetched date (the scoreboard's dates are ET days) or of a re-fetched event are
+    dropped, the rest are kept, ordered by date.
+    """
+    new_ids = {row.get("event.id") for row in new_rows}
+    kept = []
+    for row in existing_rows:
+        day = game_events.row_et_date(row)
+        if row.get("event.id") in new_ids or (day is not None and day.strftime("%Y%m%d") in dates):
+            continue
+        kept.append(row)
+    merged = kept + list(new_rows)
+    merged.sort(key=_row_date)
+    return merged
+
+
+def write_rows(json_path, rows, dates=None, today=None):
+    """
+    Write a sport's rows into its month shards and publish the new manifest.
+    With `dates` (the YYYYMMDD dates the rows were fetched for) the rows are merged into
+    the months they touch: existing rows dated on one of those dates are replaced, rows
+    of other dates are kept and a month left without rows is removed. Without `dates`
+    every month that has rows is replaced by them. Shards whose content did not change
+    are not rewritten; months not touched are left as they are (on the first write they
+    are carried over from the legacy single file).
+    Returns (manifest, number of shard files written); raises OSError if a read or write fails.
+    """
+    directory = shard_dir(json_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    today = today or datetime.now(EASTERN).date()
+    manifest = read_manifest(json_path)
+    grouped = split_by_month(rows)
+    legacy = split_by_month(_read_legacy(json_path) or []) if manifest is None else {}
+    if dates is not None:
+        dates = set(dates)
+        for month in set(grouped) | set(months_of_dates(dates)):
+            if manifest is None:
+                existing_rows = legacy.get(month, [])
+            else:
+                existing_rows = read_shard(json_path, month, manifest)
+                if existing_rows is None:
+                    raise OSError(f"could not read the existing {month} shard of {json_path}")
+            grouped[month] = _merge_month(existing_rows, grouped.get(month, []), dates)
+    for month, month_rows in legacy.items():
+        # First sharded write: carry over the legacy file's other months.
+        grouped.setdefault(month, month_rows)
+    shards = dict((manifest or {}).get("shards", {}))
+    removed = []
+    written = 0
+    for month in sorted(grouped):
+        month_rows = grouped[month]
+        if not month_rows:
+            if month in shards:
+                removed.append(shards.pop(month)["file"])
+            continue
+        sha256 = atomic_json.hash_json_rows(month_rows)
+        meta = _shard_meta(month, month_rows, sha256, today)
+        previous = shards.get(month)
+        path = directory / meta["file"]
+        if previous is None or previous.get("sha256") != sha256 or not path.exists():
+            atomic_json.write_json_rows(path, month_rows)
+            snapshot.write_snapshot(path, month_rows)
+            written += 1
+        shards[month] = meta
+    for month, meta in shards.items():
+        # Months this write did not cover still become immutable once they are over.
+        if not meta.get("immutable") and _is_immutable(month, meta.get("final"), today):
+            shards[month] = dict(meta, immutable=True)
+    manifest = {
+        "format": FORMAT,
+        "version": VERSION,
+        "updated": datetime.now(pytz.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "shards": dict(sorted(shards.items())),
+    }
+    atomic_json.write_text(manifest_path(json_path), json.dumps(manifest, indent=4))
+    for file_name in removed:
+        path = directory / file_name
+        for stale in (path, atomic_json.version_path(path), snapshot.snapshot_path(path)):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return manifest, written
+
+
+def read_shard(json_path, month, manifest=None):
+    """Return the rows of one month shard ([] if the month has none), or None on a read error."""
+    manifest = manifest or read_manifest(json_path) or {}
+    meta = manifest.get("shards", {}).get(month)
+    if meta is None:
+        return []
+    path = shard_dir(json_path) / meta["file"]
+    rows = snapshot.read_snapshot(path)
+    if rows is not None:
+        return rows
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Could not read shard {path}: {e}")
+        return None
+    return rows if isinstance(rows, list) else []
+
+
+def _read_legacy(json_path):
+    rows = snapshot.read_snapshot(json_path)
+    if rows is not None:
+        return rows
+    if not os.path.exists(json_path):
+        return []
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Could not read existing data {json_path}: {e}")
+        return None
+    return rows if isinstance(rows, list) else []
+
+
+def read_rows(json_path, months=None):
+    """
+    Return a sport's rows, from its shards or its legacy file, optionally only those in
+    `months`. Returns None if something that exists could not be read.
+    """
+    manifest = read_manifest(json_path)
+    if manifest is None:
+        rows = _read_legacy(json_path)
+        if rows is None or months is None:
+            return rows
+        wanted = set(months)
+        grouped = split_by_month(rows)
+        return [row for month in sorted(grouped) if month in wanted for row in grouped[month]]
+    rows = []
+    for month in manifest["shards"]:
+        if months is not None and month not in months:
+            continue
+        shard_rows = read_shard(json_path, month, manifest)
+        if shard_rows is None:
+            return None
+        rows.extend(shard_rows)
+    return rows
+
+
+def has_data(json_path):
+    return manifest_path(json_path).exists() or os.path.exists(json_path)
+
+
+def immutable_months(json_path):
+    manifest = read_manifest(json_path) or {}
+    return {month for month, meta in manifest.get("shards", {}).items() if meta.get("immutable")}
+
+
+def migrate(json_path):
+    """Split a legacy single-file sport into month shards. Returns the number of shards written."""
+    rows = _read_legacy(json_path)
+    if not rows:
+        print(f"⚠️ Nothing to migrate in {json_path}")
+        return 0
+    manifest, written = write_rows(json_path, rows)
+    print(f"✅ {json_path.name}: {len(rows)} rows in {len(manifest['shards'])} month shards "
+          f"({written} written) under {shard_dir(json_path)}")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the month-sharded Game_Dataframe storage.")
+    parser.add_argument("files", nargs="*", help="Sport JSON files (default: every file in Game_Dataframe).")
+    parser.add_argument("--migrate", action="store_true", help="Split legacy single-file data into month shards.")
+    args = parser.parse_args()
+    folder = Path(__file__).resolve().parent.parent / "Game_Dataframe"
+    files = [Path(p) for p in args.files] or sorted(
+        p for p in folder.glob("*.json")
+        if not p.name.endswith((".columnar.json", ".version.json", "_state.json"))
+    )
+    for file_path in files:
+        if args.migrate:
+            migrate(file_path)
+            continue
+        manifest = read_manifest(file_path)
+        if manifest is None:
+            print(f"{file_path.name}: not sharded (run with --migrate)")
+            continue
+        print(f"{file_path.name}: {len(manifest['shards'])} shards, updated {manifest['updated']}")
+        for month, meta in manifest["shards"].items():
+            flag = "immutable" if meta["immutable"] else ("final" if meta["final"] else "open")
+            print(f"   {month}: {meta['rows']:>6} rows  {meta['first']} .. {meta['last']}  {flag}")
@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+from pathlib import Path
+
+# Compact columnar snapshot written next to each Game_Dataframe JSON file
+# (nba_games.json -> nba_games.columnar.json). Instead of a list of dicts that repeats
+# every key, each key is stored once with a column of values; string columns are
+# interned into a shared string table and stored as integer indexes. The snapshot
+# records the size/mtime of the JSON file it was written with, so a JSON file that was
+# rewritten without a snapshot (e.g. by hand) is never shadowed by stale data.
+#
+# Layout (version 1):
+#   {"format": "robby-columnar", "version": 1, "source": [mtime_ns, size], "count": N,
+#    "strings": [...], "columns": [[key, kind, values, missing_rows], ...]}
+# kind "s": values are indexes into "strings" (-1 for null);
+# kind "v": values are stored as-is. missing_rows lists rows that lack the key.
+
+FORMAT = "robby-columnar"
+VERSION = 1
+
+_MISSING = object()
+
+
+def snapshot_path(json_path):
+    json_path = Path(json_path)
+    return json_path.with_name(f"{json_path.stem}.columnar.json")
+
+
+def _source_stamp(json_path):
+    try:
+        st = os.stat(json_path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def encode(rows, source=None):
+    """Convert a list of flat row dicts into the columnar layout."""
+    keys = {}
+    for row in rows:
+        for key in row:
+            keys.setdefault(key, None)
+    strings = []
+    string_ids = {}
+    columns = []
+    for key in keys:
+        values = [row.get(key, _MISSING) for row in rows]
+        missing = [i for i, value in enumerate(values) if value is _MISSING]
+        present = [value for value in values if value is not _MISSING and value is not None]
+        if present and all(isinstance(value, str) for value in present):
+            data = []
+            for value in values:
+                if value is None or value is _MISSING:
+                    data.append(-1)
+                    continue
+                index = string_ids.get(value)
+                if index is None:
+                    index = string_ids[value] = len(strings)
+                    strings.append(value)
+                data.append(index)
+            columns.append([key, "s", data, missing])
+        else:
+            data = [None if value is _MISSING else value for value in values]
+            columns.append([key, "v", data, missing])
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        "source": source,
+        "count": len(rows),
+        "strings": strings,
+        "columns": columns,
+    }
+
+
+def decode(payload):
+    """Rebuild the list of row dicts from a columnar payload (None if the layout is unknown)."""
+    if not isinstance(payload, dict) or payload.get("format") != FORMAT or payload.get("version") != VERSION:
+        return None
+    # Index -1 (null) resolves to the None appended at the end of the table.
+    lookup = payload["strings"] + [None]
+    keys = []
+    columns = []
+    missing = []
+    for key, kind, data, missing_rows in payload["columns"]:
+        if kind == "s":
+            data = list(map(lookup.__getitem__, data))
+        keys.append(key)
+        columns.append(data)
+        missing.extend((row, key) for row in missing_rows)
+    if not columns:
+        return [{} for _ in range(payload["count"])]
+    rows = [dict(zip(keys, values)) for values in zip(*columns)]
+    for row, key in missing:
+        del rows[row][key]
+    return rows
+
+
+def write_snapshot(json_path, rows):
+    """Atomically write the columnar snapshot for rows that were just saved to json_path."""
+    path = snapshot_path(json_path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(encode(rows, _source_stamp(json_path)), f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"⚠️ Could not write snapshot {path}: {e}")
+        return False
+    return True
+
+
+def read_snapshot(json_path):
+    """
+    Return the rows of json_path's snapshot, or None when there is no usable snapshot
+    (missing, unknown version, unreadable, or older than the JSON file).
+    """
+    path = snapshot_path(json_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Could not read snapshot {path}: {e}")
+        return None
+    source = _source_stamp(json_path)
+    if source is not None and payload.get("source") != source:
+        return None
+    return decode(payload)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write columnar snapshots for existing Game_Dataframe JSON files.")
+    parser.add_argument("files", nargs="*", help="JSON files to convert (default: every file in Game_Dataframe).")
+    args = parser.parse_args()
+    folder = Path(__file__).resolve().parent.parent / "Game_Dataframe"
+    files = args.files or sorted(
+        p for p in folder.glob("*.json") if not p.name.endswith((".columnar.json", ".version.json", "_state.json"))
+    )
+    for file_path in files:
+        with open(file_path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        if write_snapshot(file_path, rows):
+            print(f"✅ Snapshot written for {file_path} ({len(rows)} rows)")
@@ -0,0 +1,168 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Scraper telemetry. Every full fetch of a sport appends one "run" record (per-date HTTP
+# latency, bytes, status, rows, parse time and cache outcome) and every update cycle one
+# "cycle" record to a rolling JSON-lines log. The fetcher subprocesses and update_data
+# share the file: each record is appended with a single write under an exclusive lock on
+# <name>.lock, and the size check and rotation to <name>.1 (once the log grows past
+# MAX_LOG_BYTES) happen under the same lock, so no two writers rotate at once.
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LOG_PATH = Path(os.environ.get("ROBBY_TELEMETRY_LOG", BASE_DIR / "Game_Dataframe" / "fetch_telemetry.jsonl"))
+MAX_LOG_BYTES = 5 * 1024 * 1024
+SLOWEST_DATES = 5
+
+_lock = threading.Lock()
+# The last summary() and the (inode, mtime, size) of both log files it was built from.
+_summary_cache = {"key": None, "summary": None}
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _rotated_path():
+    return LOG_PATH.with_name(LOG_PATH.name + ".1")
+
+
+@contextmanager
+def _file_lock():
+    """Serialize appends and rotation across threads and processes."""
+    with _lock:
+        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(LOG_PATH.with_name(LOG_PATH.name + ".lock"), "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def append(record):
+    line = json.dumps(record, separators=(",", ":")) + "\n"
+    try:
+        with _file_lock():
+            if LOG_PATH.exists() and LOG_PATH.stat().st_size > MAX_LOG_BYTES:
+                os.replace(LOG_PATH, _rotated_path())
+            with open(LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(line)
+    except OSError as e:
+        print(f"⚠️ Could not write telemetry to {LOG_PATH}: {e}")
+
+
+def record_run(sport, samples, elapsed):
+    """Append the telemetry of one sport's fetch (samples as filled in by fetch_engine.fetch_rows)."""
+    ok = [s for s in samples if s.get("ok")]
+    record = {
+        "type": "run",
+        "sport": sport,
+        "finished": _now(),
+        "elapsed": round(elapsed, 3),
+        "requests": len(samples),
+        "failed": len(samples) - len(ok),
+        "bytes": sum(s.get("bytes", 0) for s in samples),
+        "rows": sum(s.get("rows", 0) for s in ok),
+        "parse_ms": round(sum(s.get("parse_ms", 0) for s in samples), 1),
+        "not_modified": sum(1 for s in samples if s.get("cache") in ("not_modified", "unchanged")),
+        "dates": samples,
+    }
+    append(record)
+    return record
+
+
+def record_cycle(mode, elapsed, sports):
+    """Append the totals of one update cycle; `sports` maps sport -> {"saved", "rows", ...}."""
+    record = {"type": "cycle", "finished": _now(), "mode": mode,
+              "elapsed": round(elapsed, 3), "sports": sports}
+    append(record)
+    return record
+
+
+def read_records():
+    records = []
+    for path in (_rotated_path(), LOG_PATH):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue  # torn last line of a concurrent append
+        except OSError:
+            continue
+    return records
+
+
+def summary(cycles=20):
+    """
+    Recent cycle totals plus, per sport, the latest run's totals, its slowest dates and
+    the dates that failed in consecutive runs (failure streaks). The result is cached
+    until either log file changes.
+    """
+    key = (cycles, _file_key(_rotated_path()), _file_key(LOG_PATH))
+    with _lock:
+        if _summary_cache["key"] == key:
+            return _summary_cache["summary"]
+    result = _summarize(read_records(), cycles)
+    with _lock:
+        _summary_cache.update(key=key, summary=result)
+    return result
+
+
+def _file_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _summarize(records, cycles):
+    runs = {}
+    for record in records:
+        if record.get("type") == "run":
+            runs.setdefault(record["sport"], []).append(record)
+    sports = {}
+    for sport, sport_runs in runs.items():
+        latest = sport_runs[-1]
+        streaks = {}
+        broken = set()
+        for run in reversed(sport_runs):
+            for sample in run["dates"]:
+                date_str = sample["date"]
+                if date_str in broken:
+                    continue
+                if sample.get("ok"):
+                    broken.add(date_str)
+                else:
+                    streaks[date_str] = streaks.get(date_str, 0) + 1
+        slowest = sorted(latest["dates"], key=lambda s: s.get("latency_ms", 0), reverse=True)
+        sports[sport] = {
+            "latest": {k: v for k, v in latest.items() if k != "dates"},
+            "runs": len(sport_runs),
+            "slowest_dates": slowest[:SLOWEST_DATES],
+            "failure_streaks": dict(sorted(streaks.items(), key=lambda item: -item[1])),
+        }
+    return {
+        "cycles": [r for r in records if r.get("type") == "cycle"][-cycles:],
+        "sports": sports,
+    }
@@ -1,10 +1,14 @@
 import pytz
-import os
-import json
 import platform
-from flask import Flask, render_template, request
-from dateutil.parser import isoparse
+from datetime import datetime
+from flask import Flask, Response, jsonify, render_template, request
 import dashboard  # Import the modified dashboard.py with the blueprint
+import event_registry
+import game_store
+import live_stream
+import metrics
+import page_cache
+import pick_store
 from pathlib import Path
 
 # Initialize Flask app with specified template and static folders.
@@ -16,156 +20,188 @@ app = Flask(__name__,
 # Register the dashboard blueprint so its routes (like /dashboard) are added.
 app.register_blueprint(dashboard.dashboard_bp)
 
+# Per-route latency/phase metrics and cache counters, served at /metrics.
+metrics.init_app(app)
+
+def refresh_data(sports=None):
+    """Swap in freshly scraped data, update the event registry and drop the pages rendered from the old data."""
+    refreshed = game_store.refresh_data(sports)
+    event_registry.sync()
+    page_cache.clear()
+    return refreshed
+
+# Hook used by update_data.publish_data() to swap in freshly scraped data.
+app.refresh_data = refresh_data
+
 # Use the current script directory as the base directory
 BASE_DIR = Path(__file__).resolve().parent
 
 # Define local file paths relative to BASE_DIR
 GAME_DATAFRAME_FOLDER = BASE_DIR / "Game_Dataframe"
-PICKS_FILE_PATH = BASE_DIR / "Robs_Picks" / "Robs_Picks.json"
-NBA_GAMES_FILE = GAME_DATAFRAME_FOLDER / "nba_games.json"
-NHL_GAMES_FILE = GAME_DATAFRAME_FOLDER / "nhl_games.json"
-MLB_GAMES_FILE = GAME_DATAFRAME_FOLDER / "mlb_games.json"
-MARCH_MADNESS_GAMES_FILE = GAME_DATAFRAME_FOLDER / "march_madness_games.json"
-
-def load_json_file(file_path):
-    if not os.path.exists(file_path):
-        print(f"⚠️ JSON file not found: {file_path}")
-        return []
-    with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def load_picks():
-    picks = load_json_file(PICKS_FILE_PATH)
-    if not isinstance(picks, dict):
-        picks = {}
-    return picks
+PICKS_FILE_PATH = pick_store.SNAPSHOT_PATH
+NBA_GAMES_FILE = game_store.SPORT_FILES["NBA"]
+NHL_GAMES_FILE = game_store.SPORT_FILES["NHL"]
+MLB_GAMES_FILE = game_store.SPORT_FILES["MLB"]
+MARCH_MADNESS_GAMES_FILE = game_store.SPORT_FILES["MarchMadness"]
 
-def load_nba_games():
-    return load_json_file(NBA_GAMES_FILE)
+# Most picks accepted by one /api/picks request.
+MAX_BATCH_PICKS = 1000
 
-def load_nhl_games():
-    return load_json_file(NHL_GAMES_FILE)
-
-def load_mlb_games():
-    return load_json_file(MLB_GAMES_FILE)
+def load_picks():
+    # Served from the pick journal's in-memory view (snapshot + appended picks).
+    return pick_store.load_picks()
 
-def load_march_madness_games():
-    games = load_json_file(MARCH_MADNESS_GAMES_FILE)
-    print(f"Loaded {len(games)} March Madness games")
-    if games:
-        print(f"Sample game: {games[0]}")
-    return games
+def build_pick(event_id, winner, sport, game_date, game):
+    """The pick record for `winner` of an event on `game_date` (game is its Event, or None if unknown)."""
+    pick = {
+        "EventID": event_id,
+        "Value.winner": winner,
+        "Value.address": request.remote_addr or "",
+        "Value.device_name": platform.node(),
+        "Value.user_agent": request.headers.get("User-Agent", ""),
+        "Value.timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "Value.game_date": game_date.strftime("%A, %B %d, %Y"),
+        "Value.game_start_time": game.et_time if game is not None else "N/A"
+    }
+    # Machine-readable copies of the date/start for sorting and lock checks.
+    pick.update(pick_store.structured_fields(game_date, game.start if game is not None else None, sport))
+    return pick
 
 @app.route("/", methods=["GET", "POST"])
 def index():
     saved = False
     sport = request.form.get("sport_selector") or request.args.get("sport") or "NBA"
-    from datetime import datetime
     now = datetime.now(pytz.timezone("America/New_York"))
     date_str = request.form.get("game_date") or request.args.get("game_date") or now.strftime("%Y-%m-%d")
     selected_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-    grouped_games = {}
-
-    # Load games based on selected sport
-    if sport == "NBA":
-        all_games = load_nba_games()
-    elif sport == "NHL":
-        all_games = load_nhl_games()
-    elif sport == "MLB":
-        all_games = load_mlb_games()
-    elif sport == "MarchMadness":
-        all_games = load_march_madness_games()
-    else:
-        all_games = []
-    
-    # Process and group games by event id for the selected date.
-    for g in all_games:
-        try:
-            date_field = "event.date" if ("event.date" in g) else "comp.date"
-            game_time_parsed = isoparse(g[date_field])
-            if game_time_parsed.tzinfo is None:
-                from pytz import utc
-                game_time_parsed = game_time_parsed.replace(tzinfo=utc)
-            game_time_et = game_time_parsed.astimezone(pytz.timezone("America/New_York"))
-            if game_time_et.date() != selected_date:
-                continue
-            disable_game = (now - game_time_et).total_seconds() > 1200
-            event_id = g["event.id"]
-            if sport == "MLB":
-                team_name = g.get("team.displayName", "N/A")
-                team_abbreviation = g.get("team.abbreviation", "N/A")
-            elif sport == "MarchMadness":
-                team_name = g.get("team.displayName", g.get("team.name", "N/A"))
-                team_abbreviation = g.get("team.abbreviation", "N/A")
-            else:
-                team_name = g.get("team.name", g.get("team.displayName", "N/A"))
-                team_abbreviation = g.get("team.abbreviation", "N/A")
-            if sport == "MarchMadness":
-                score = g.get("comp.competitors.score", "0")
-                status_clock = g.get("comp.status.displayClock", "N/A")
-                status_period = g.get("comp.status.period", "N/A")
-            else:
-                score = g.get("competitors.score", g.get("comp.competitors.score", "0"))
-                status_clock = g.get("status.clock", g.get("comp.status.displayClock", "N/A"))
-                status_period = g.get("status.period", g.get("comp.status.period", "N/A"))
-            if event_id not in grouped_games:
-                grouped_games[event_id] = {
-                    "event_id": event_id,
-                    "event_date": game_time_et.strftime("%I:%M %p ET"),
-                    "event_name": g.get("event.name", g.get("event.shortName", "N/A")),
-                    "team_1_name": team_name,
-                    "team_1_abbreviation": team_abbreviation,
-                    "team_2_name": "",
-                    "team_2_abbreviation": "",
-                    "score": score,
-                    "status_clock": status_clock,
-                    "status_period": status_period,
-                    "disable_game": disable_game,
-                }
-            else:
-                grouped_games[event_id]["team_2_name"] = team_name
-                grouped_games[event_id]["team_2_abbreviation"] = team_abbreviation
-        except Exception as e:
-            print(f"Error processing game: {e}")
-
-    games = [game for game in grouped_games.values() if game["team_2_name"]]
-    
-    try:
-        games = sorted(games, key=lambda x: datetime.strptime(x["event_date"], "%I:%M %p ET"))
-    except Exception as e:
-        print("Error sorting games:", e)
-        
+
+    # Versions are read before the data so a page is never cached under a newer version.
+    data_version = game_store.data_version(sport)
+    picks_version = pick_store.version()
+    # Look up the pre-grouped events for the selected date; only the lock cutoff depends on "now".
+    games = game_store.get_games_for_date(sport, selected_date)
+    locked_ids = {game.event_id for game in games if (now - game.start).total_seconds() > pick_store.LOCK_SECONDS}
+    grouped_games = {game.event_id: game for game in games}
+
+    # Rendered GETs are cached; the set of locked games is the time bucket, so a cached
+    # page stops matching the moment another game passes its cutoff. Live score updates
+    # bump data_version, so they make the cached page stale too.
+    cache_key = None
+    if request.method == "GET" and page_cache.enabled():
+        cache_key = ("index", sport, date_str, data_version, picks_version, frozenset(locked_ids))
+        body = page_cache.get(cache_key)
+        if body is not None:
+            return body
+
     if request.method == "POST" and "lock_picks" in request.form:
-        existing_picks = load_picks()
+        new_picks = []
         for key, value in request.form.items():
             if key.startswith("winner_"):
                 event_id = key.split("_", 1)[1]
-                ip_address = request.remote_addr or ""
-                user_agent = request.headers.get("User-Agent", "")
-                device_name = platform.node()
-                nice_date_str = selected_date.strftime("%A, %B %d, %Y")
-                event_start_time = grouped_games.get(event_id, {}).get("event_date", "N/A")
-                existing_picks[event_id] = {
-                    "EventID": event_id,
-                    "Value.winner": value,
-                    "Value.address": ip_address,
-                    "Value.device_name": device_name,
-                    "Value.user_agent": user_agent,
-                    "Value.timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "Value.game_date": nice_date_str,
-                    "Value.game_start_time": event_start_time
-                }
-        with open(PICKS_FILE_PATH, "w", encoding="utf-8") as f:
-            json.dump(existing_picks, f, indent=4)
+                new_picks.append(build_pick(event_id, value, sport, selected_date, grouped_games.get(event_id)))
+        # One fsync'd journal append per submission; concurrent submissions don't clobber each other.
+        with metrics.phase("picks"):
+            pick_store.save_picks(new_picks)
+        page_cache.clear()
         saved = True
 
-    selected_games = load_picks()
-    return render_template("index.html",
-                           saved=saved,
-                           games=games,
-                           selected_games=selected_games,
-                           today_str=date_str,
-                           sport=sport)
+    with metrics.phase("picks"):
+        selected_games = load_picks()
+    with metrics.phase("render"):
+        html = render_template("index.html",
+                               saved=saved,
+                               games=games,
+                               locked_ids=locked_ids,
+                               selected_games=selected_games,
+                               today_str=date_str,
+                               sport=sport)
+    if cache_key is None:
+        return html
+    body = html.encode("utf-8")
+    page_cache.put(cache_key, body)
+    return body
+
+def _check_pick(item, now, days):
+    """Validate one /api/picks entry against the loaded games; returns its Event or raises ValueError."""
+    if not isinstance(item, dict):
+        raise ValueError("pick must be an object")
+    event_id = item.get("event_id")
+    sport = item.get("sport")
+    winner = item.get("winner")
+    for field, value in (("event_id", event_id), ("sport", sport), ("winner", winner), ("game_date", item.get("game_date"))):
+        if not isinstance(value, str) or not value:
+            raise ValueError(f"{field} must be a non-empty string")
+    if sport not in game_store.SPORT_FILES:
+        raise ValueError(f"unknown sport: {sport}")
+    try:
+        game_date = datetime.strptime(item["game_date"], "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError("game_date must be YYYY-MM-DD") from None
+    if (sport, game_date) not in days:
+        days[(sport, game_date)] = {game.event_id: game for game in game_store.get_games_for_date(sport, game_date)}
+    game = days[(sport, game_date)].get(event_id)
+    if game is None:
+        raise ValueError(f"no {sport} event {event_id} on {game_date}")
+    teams = [competitor.name for competitor in game.competitors]
+    if winner not in teams:
+        raise ValueError(f"winner must be one of {teams}")
+    if (now - game.start).total_seconds() > pick_store.LOCK_SECONDS:
+        raise ValueError("pick is locked (the game started more than 20 minutes ago)")
+    return game
+
+@app.route("/api/picks", methods=["POST"])
+def api_picks():
+    """
+    Lock a batch of picks across sports and dates in one request:
+        {"picks": [{"sport": "NBA", "game_date": "2025-03-15", "event_id": "401...",
+                    "winner": "Boston Celtics"}, ...]}
+    Every pick is checked against the loaded games (the event is on that date, the winner
+    is one of its teams and the pick is not locked yet) and the valid ones are saved with
+    a single durable write. Responds with a status per pick, in request order.
+    """
+    payload = request.get_json(silent=True)
+    items = payload.get("picks") if isinstance(payload, dict) else None
+    if not isinstance(items, list):
+        return jsonify({"error": 'Expected a JSON body like {"picks": [...]}'}), 400
+    if len(items) > MAX_BATCH_PICKS:
+        return jsonify({"error": f"At most {MAX_BATCH_PICKS} picks per request"}), 413
+
+    now = datetime.now(pytz.timezone("America/New_York"))
+    days = {}  # (sport, date) -> {event_id: Event}, so each date is looked up once
+    seen = set()
+    results = []
+    new_picks = []
+    for position, item in enumerate(items):
+        try:
+            game = _check_pick(item, now, days)
+            if game.event_id in seen:
+                raise ValueError("duplicate event in this batch")
+        except ValueError as e:
+            event_id = item.get("event_id") if isinstance(item, dict) else None
+            results.append({"index": position, "event_id": event_id, "status": "rejected", "error": str(e)})
+            continue
+        seen.add(game.event_id)
+        new_picks.append(build_pick(game.event_id, item["winner"], game.sport, game.et_date, game))
+        results.append({"index": position, "event_id": game.event_id, "status": "saved"})
+    if new_picks:
+        # One fsync'd journal append for the whole batch.
+        with metrics.phase("picks"):
+            pick_store.save_picks(new_picks)
+        page_cache.clear()
+    return jsonify({"saved": len(new_picks), "rejected": len(items) - len(new_picks), "results": results})
+
+@app.route("/stream")
+def stream():
+    """
+    Server-Sent Events with live score/pick-result changes.
+    Optional filters: ?sport=NBA,NHL and ?game_date=YYYY-MM-DD (ET).
+    A reconnecting client (Last-Event-ID) first gets the current state of its events.
+    """
+    sports = [s for s in request.args.get("sport", "").split(",") if s] or None
+    game_date = request.args.get("game_date") or None
+    replay = request.headers.get("Last-Event-ID") is not None
+    return Response(live_stream.subscribe(sports, game_date, replay), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 if __name__ == "__main__":
     # Run on host 0.0.0.0 so it’s accessible externally on port 12345.
@@ -0,0 +1,392 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Reproducible benchmarks against synthetic data.
+#
+#   python benchmarks/run_benchmarks.py --scale season
+#   python benchmarks/run_benchmarks.py --scale 100k-picks --repeat 10
+#   python benchmarks/run_benchmarks.py --compare benchmarks/results/a.json benchmarks/results/b.json
+#
+# The data (see synthetic.py) is written to a temporary directory and the app is pointed
+# at it, so the real Game_Dataframe and Robs_Picks are never touched. Fetcher parsing is
+# timed against scoreboard payloads served from a local HTTP server: the synthetic ones,
+# or real ESPN payloads recorded with --record-payloads and replayed with --payloads.
+# Each run is saved as JSON in benchmarks/results/, named after the commit it ran on.
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_FOLDER))
+RESULTS_FOLDER = ROOT_FOLDER / "benchmarks" / "results"
+RESULTS_VERSION = 1
+
+SPORTS = ("NBA", "NHL", "MLB", "MarchMadness")
+
+
+def configure_environment(work_dir):
+    """Must run before the app modules are imported: some of them read these at import time."""
+    os.environ["ROBBY_HTTP_CACHE"] = "off"
+    os.environ["ROBBY_HTTP_CACHE_DIR"] = str(work_dir / "http_cache")
+    os.environ["ROBBY_TELEMETRY_LOG"] = str(work_dir / "fetch_telemetry.jsonl")
+    os.environ["ROBBY_PROFILE_EVERY"] = "0"
+    os.environ.pop("ROBBY_STORAGE", None)
+
+
+def point_app_at(work_dir):
+    """Redirect the game store and the pick store to the synthetic data under work_dir."""
+    import game_store
+    import pick_store
+    from benchmarks import synthetic
+
+    for sport, (_, file_name) in synthetic.PARSERS.items():
+        game_store.SPORT_FILES[sport] = work_dir / "Game_Dataframe" / file_name
+    pick_store.PICKS_FOLDER = work_dir / "Robs_Picks"
+    pick_store.SNAPSHOT_PATH = pick_store.PICKS_FOLDER / "Robs_Picks.json"
+    pick_store.JOURNAL_PATH = pick_store.PICKS_FOLDER / "Robs_Picks.journal.jsonl"
+    pick_store.LOCK_PATH = pick_store.PICKS_FOLDER / "Robs_Picks.lock"
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_FOLDER,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT_FOLDER,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, bool(dirty)
+
+
+def measure(fn, repeat, setup=None):
+    """Time fn() `repeat` times after one warm-up call; setup() runs untimed before each call."""
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(repeat + 1):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            fn()
+            if i:
+                times.append((time.perf_counter() - start) * 1000)
+    return {
+        "runs": repeat,
+        "min_ms": round(min(times), 3),
+        "median_ms": round(statistics.median(times), 3),
+        "mean_ms": round(statistics.fmean(times), 3),
+        "max_ms": round(max(times), 3),
+    }
+
+
+class PayloadServer:
+    """Serve {(sport, YYYYMMDD): body} at http://127.0.0.1:<port>/<sport>/<date> with ETags."""
+
+    def __init__(self, bodies):
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                _, sport, date_str = (self.path.split("/") + ["", ""])[:3]
+                body = bodies.get((sport, date_str))
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def url_fn(self, sport):
+        port = self.server.server_address[1]
+        return lambda date_str: f"http://127.0.0.1:{port}/{sport}/{date_str}"
+
+
+def load_payload_bodies(payload_dir):
+    """Read recorded payloads laid out as <dir>/<sport>/<YYYYMMDD>.json."""
+    bodies = {}
+    for sport in SPORTS:
+        for path in sorted((Path(payload_dir) / sport).glob("*.json")):
+            bodies[(sport, path.stem)] = path.read_bytes()
+    return bodies
+
+
+def record_payloads(payload_dir):
+    """Download the real ESPN scoreboards for each fetcher's date range into payload_dir."""
+    from Data_Queries import fetch_engine, march_madness_games, mlb_games, nba_games, nhl_games
+
+    sources = {
+        "NBA": (nba_games.nba_url, nba_games.date_list),
+        "NHL": (nhl_games.nhl_url, nhl_games.date_list),
+        "MLB": (mlb_games.mlb_url, mlb_games.date_list),
+        "MarchMadness": (march_madness_games.march_madness_url, march_madness_games.date_list),
+    }
+    for sport, (url_fn, date_list) in sources.items():
+        folder = Path(payload_dir) / sport
+        folder.mkdir(parents=True, exist_ok=True)
+        saved = 0
+        with ThreadPoolExecutor(max_workers=fetch_engine.MAX_WORKERS) as executor:
+            payloads = list(executor.map(lambda d: fetch_engine.fetch_json(url_fn(d)), date_list))
+        for date_str, data in zip(date_list, payloads):
+            if data is None:
+                print(f"❌ Could not record {sport} {date_str}")
+                continue
+            with open(folder / f"{date_str}.json", "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            saved += 1
+        print(f"✅ Recorded {saved} {sport} payloads to {folder}")
+
+
+def busiest_dates(sport_games):
+    """The ET date with the most games per sport, so index() renders a full slate."""
+    dates = {}
+    for sport, events in sport_games.items():
+        counts = {}
+        for event in events:
+            if event.et_date is not None:
+                counts[event.et_date] = counts.get(event.et_date, 0) + 1
+        if counts:
+            dates[sport] = max(counts, key=lambda day: (counts[day], day))
+    return dates
+
+
+def run_benchmarks(payloads, bodies, repeat, only=None):
+    import app as app_module
+    import dashboard
+    import event_registry
+    import game_store
+    import page_cache
+    import pick_store
+    from Data_Queries import fetch_engine
+    from benchmarks import synthetic
+
+    results = {}
+
+    def bench(name, fn, setup=None):
+        if only and not any(name.startswith(prefix) for prefix in only):
+            return
+        print(f"⏱️ {name}")
+        results[name] = measure(fn, repeat, setup)
+
+    def forget(sport):
+        game_store._entries.pop(sport, None)
+        game_store._manifests.pop(sport, None)
+        for key in [key for key in game_store._shards if key[0] == sport]:
+            del game_store._shards[key]
+
+    def cold_dashboard():
+        for sport in SPORTS:
+            forget(sport)
+        event_registry.clear()
+        dashboard._grade_cache.clear()
+        dashboard._tables_cache.clear()
+
+    # Loading: JSON/snapshot/shard reads + normalization into Events, per sport.
+    for sport in SPORTS:
+        bench(f"game_store.load.{sport}", lambda s=sport: game_store.get_games(s),
+              setup=lambda s=sport: forget(s))
+
+    sport_games = {sport: game_store.get_games(sport) for sport in SPORTS}
+    picks = pick_store.load_picks()
+    event_registry.sync(sport_games)
+
+    # Registering every sport from scratch, and a sync when nothing changed.
+    bench("event_registry.build", lambda: event_registry.sync(sport_games), setup=event_registry.clear)
+    bench("event_registry.sync", lambda: event_registry.sync(sport_games))
+    bench("determine_pick_result",
+          lambda: [dashboard.determine_pick_result(pick, event_registry.event(event_id))
+                   for event_id, pick in picks.items()])
+
+    client = app_module.app.test_client()
+
+    def get(url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}")
+
+    index_dates = busiest_dates(sport_games)
+    # Cold load of a single date (a fresh process serving one index page).
+    for sport, day in index_dates.items():
+        bench(f"game_store.load_date.{sport}", lambda s=sport, d=day: game_store.get_games_for_date(s, d),
+              setup=lambda s=sport: forget(s))
+    # Rendering the index page (the page cache is emptied before each run, so the numbers
+    # stay comparable with runs from before it existed), then serving it from the cache.
+    for sport in SPORTS:
+        if sport in index_dates:
+            url = f"/?sport={sport}&game_date={index_dates[sport]:%Y-%m-%d}"
+            bench(f"index.{sport}", lambda u=url: get(u), setup=page_cache.clear)
+            bench(f"index.{sport}.cached", lambda u=url: get(u))
+    bench("dashboard", lambda: get("/dashboard"))
+    bench("dashboard.cold", lambda: get("/dashboard"), setup=cold_dashboard)
+
+    # Parsing: the fetcher parse functions on already decoded payloads, then the whole
+    # fetch path (HTTP + decode + parse) against the local server, without and with the
+    # HTTP cache (the second pass revalidates every date and gets 304s).
+    for sport in SPORTS:
+        sport_payloads = payloads.get(sport, {})
+        if sport_payloads:
+            bench(f"parse.{sport}", lambda s=sport, p=sport_payloads: synthetic.parse_payloads(s, p))
+    with PayloadServer(bodies) as server:
+        for sport in SPORTS:
+            date_list = sorted(date_str for body_sport, date_str in bodies if body_sport == sport)
+            if not date_list:
+                continue
+            parse_fn = synthetic.PARSERS[sport][0]
+            url_fn = server.url_fn(sport)
+            bench(f"fetch.{sport}", lambda d=date_list, u=url_fn, p=parse_fn: fetch_engine.fetch_all_rows(d, u, p))
+            os.environ["ROBBY_HTTP_CACHE"] = "on"
+            try:
+                bench(f"fetch.{sport}.revalidate",
+                      lambda d=date_list, u=url_fn, p=parse_fn: fetch_engine.fetch_all_rows(d, u, p))
+            finally:
+                os.environ["ROBBY_HTTP_CACHE"] = "off"
+    return results, {sport: f"{day:%Y-%m-%d}" for sport, day in index_dates.items()}
+
+
+def run(args):
+    with tempfile.TemporaryDirectory(prefix="robby-bench-") as tmp:
+        work_dir = Path(tmp)
+        configure_environment(work_dir)
+        from benchmarks import synthetic
+
+        scale = dict(synthetic.SCALES[args.scale])
+        if args.seasons is not None:
+            scale["seasons"] = args.seasons
+        if args.picks is not None:
+            scale["picks"] = args.picks
+        print(f"🔄 Generating {args.scale} data ({scale['seasons']} season(s), {scale['picks']} picks)...")
+        start = time.perf_counter()
+        payloads, dataset = synthetic.write_dataset(work_dir, scale["seasons"], scale["picks"], args.seed,
+                                                    args.layout)
+        print(f"✅ Generated {sum(dataset['events'].values())} events in {time.perf_counter() - start:.1f}s")
+        point_app_at(work_dir)
+
+        if args.payloads:
+            bodies = load_payload_bodies(args.payloads)
+            payloads = {}
+            for (sport, date_str), body in bodies.items():
+                payloads.setdefault(sport, {})[date_str] = json.loads(body)
+            dataset["payloads"] = str(args.payloads)
+        else:
+            bodies = {(sport, date_str): json.dumps(payload).encode("utf-8")
+                      for sport, by_date in payloads.items() for date_str, payload in by_date.items()}
+            dataset["payloads"] = "synthetic"
+
+        results, index_dates = run_benchmarks(payloads, bodies, args.repeat, args.only)
+    dataset.update(scale=args.scale, index_dates=index_dates)
+
+    commit, dirty = git_commit()
+    report = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "dataset": dataset,
+        "results": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_FOLDER / (
+        f"{datetime.now():%Y%m%d-%H%M%S}_{commit or 'unknown'}{'-dirty' if dirty else ''}_{args.scale}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    print_results(results)
+    print(f"✅ Results saved to {output}")
+    return report
+
+
+def print_results(results):
+    width = max((len(name) for name in results), default=10)
+    print(f"{'benchmark':<{width}}  {'median ms':>10}  {'min ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<{width}}  {stats['median_ms']:>10.2f}  {stats['min_ms']:>10.2f}")
+
+
+def compare(old_path, new_path):
+    """Print the median of every benchmark in two result files and the relative change."""
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    if any(old["dataset"].get(key) != new["dataset"].get(key) for key in ("scale", "seed", "layout")):
+        print("⚠️ The two runs used different datasets; timings are not directly comparable.")
+    names = list(old["results"]) + [name for name in new["results"] if name not in old["results"]]
+    width = max((len(name) for name in names), default=10)
+    print(f"{'benchmark':<{width}}  {old.get('commit') or 'old':>10}  {new.get('commit') or 'new':>10}  {'change':>8}")
+    for name in names:
+        before = old["results"].get(name, {}).get("median_ms")
+        after = new["results"].get(name, {}).get("median_ms")
+        if before is None or after is None:
+            change = "n/a"
+        else:
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"{name:<{width}}  {before if before is not None else '-':>10}  {after if after is not None else '-':>10}  {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the app against synthetic data.")
+    parser.add_argument("--scale", default="season", choices=("season", "five-seasons", "100k-picks"),
+                        help="Dataset size preset (default: season).")
+    parser.add_argument("--seasons", type=int, help="Override the number of seasons per sport.")
+    parser.add_argument("--picks", type=int, help="Override the number of picks.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the synthetic data.")
+    parser.add_argument("--layout", default="shards", choices=("shards", "single"),
+                        help="Game data layout: month shards (default) or legacy single files.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (after one warm-up).")
+    parser.add_argument("--only", nargs="+", help="Only run benchmarks whose name starts with one of these.")
+    parser.add_argument("--payloads", help="Serve recorded ESPN payloads from <dir>/<sport>/<YYYYMMDD>.json.")
+    parser.add_argument("--record-payloads", metavar="DIR", help="Download the real ESPN payloads into DIR and exit.")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<time>_<commit>_<scale>.json).")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two results files and exit.")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    elif args.record_payloads:
+        record_payloads(args.record_payloads)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
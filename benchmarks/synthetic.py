@@ -0,0 +1,183 @@
+import contextlib
+import io
+import json
+import random
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from Data_Queries import march_madness_games, mlb_games, nba_games, nhl_games, shards, snapshot
+import game_events
+
+# Synthetic data for the benchmarks. Games are generated as ESPN-shaped scoreboard
+# payloads (one per sport and date) and turned into Game_Dataframe rows by the real
+# fetcher parse functions, so the rows have exactly the shape the fetchers write.
+# Everything is derived from a seeded Random, so a scale + seed is reproducible.
+
+SCALES = {
+    "season": {"seasons": 1, "picks": 2000},
+    "five-seasons": {"seasons": 5, "picks": 10000},
+    "100k-picks": {"seasons": 5, "picks": 100000},
+}
+
+# sport -> (season start (month, day), days in season, games per day, teams)
+SEASONS = {
+    "NBA": ((10, 22), 240, 7, 30),
+    "NHL": ((10, 8), 250, 7, 32),
+    "MLB": ((3, 27), 215, 14, 30),
+    "MarchMadness": ((3, 18), 21, 6, 68),
+}
+
+# sport -> (parse function, Game_Dataframe file name)
+PARSERS = {
+    "NBA": (nba_games.parse_nba_games, "nba_games.json"),
+    "NHL": (nhl_games.parse_nhl_games, "nhl_games.json"),
+    "MLB": (mlb_games.parse_mlb_games, "mlb_games.json"),
+    "MarchMadness": (march_madness_games.parse_march_madness_games, "march_madness_games.json"),
+}
+
+# The newest generated season starts in this year; older seasons go back one year each.
+LATEST_SEASON = 2024
+FIRST_EVENT_ID = 401000000
+ORPHAN_EVENT_ID = 901000000
+
+
+def _team(sport, index):
+    return {
+        "id": str(index + 1),
+        "location": f"{sport} City {index + 1:02d}",
+        "name": f"Team {index + 1:02d}",
+        "abbreviation": f"T{index + 1:02d}",
+        "displayName": f"{sport} City {index + 1:02d} Team {index + 1:02d}",
+        "shortDisplayName": f"City {index + 1:02d}",
+        "color": "013088",
+        "alternateColor": "ffffff",
+        "logo": f"https://example.invalid/{sport.lower()}/{index + 1}.png",
+    }
+
+
+def _event(sport, event_id, start, teams, rng, today):
+    home, away = rng.sample(teams, 2)
+    if start.date() < today:
+        state, clock, period = "post", "0:00", 4
+        home_score, away_score = rng.sample(range(60, 130) if sport in ("NBA", "MarchMadness") else range(0, 12), 2)
+    else:
+        state, clock, period = "pre", "0:00", 0
+        home_score = away_score = 0
+    stamp = start.strftime("%Y-%m-%dT%H:%MZ")
+    competitors = [
+        {"homeAway": "home", "score": str(home_score), "team": home},
+        {"homeAway": "away", "score": str(away_score), "team": away},
+    ]
+    return {
+        "id": str(event_id),
+        "uid": f"s:0~l:0~e:{event_id}",
+        "date": stamp,
+        "name": f"{away['displayName']} at {home['displayName']}",
+        "shortName": f"{away['abbreviation']} @ {home['abbreviation']}",
+        "competitions": [{
+            "id": str(event_id),
+            "uid": f"s:0~l:0~e:{event_id}~c:{event_id}",
+            "date": stamp,
+            "status": {"displayClock": clock, "period": period, "type": {"state": state}},
+            "competitors": competitors,
+        }],
+    }
+
+
+def generate_payloads(seasons, seed=0, today=None):
+    """Return {sport: {YYYYMMDD: scoreboard payload}} for the given number of seasons."""
+    rng = random.Random(seed)
+    today = today or date.today()
+    event_id = FIRST_EVENT_ID
+    payloads = {}
+    for sport, ((month, day), days, per_day, team_count) in SEASONS.items():
+        teams = [_team(sport, i) for i in range(team_count)]
+        by_date = {}
+        for season in range(seasons):
+            first_day = datetime(LATEST_SEASON - season, month, day, tzinfo=timezone.utc)
+            for offset in range(days):
+                game_day = first_day + timedelta(days=offset)
+                events = []
+                for _ in range(max(1, round(rng.gauss(per_day, per_day / 4)))):
+                    start = game_day + timedelta(hours=rng.randint(16, 26), minutes=rng.choice((0, 30)))
+                    events.append(_event(sport, event_id, start, teams, rng, today))
+                    event_id += 1
+                by_date[game_day.strftime("%Y%m%d")] = {"events": events}
+        payloads[sport] = by_date
+    return payloads
+
+
+def parse_payloads(sport, payloads):
+    """Run a sport's fetcher parse function over its payloads (quietly) and return all rows."""
+    parse_fn = PARSERS[sport][0]
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for date_str, payload in payloads.items():
+            rows.extend(parse_fn(payload, date_str))
+    return rows
+
+
+def make_picks(events, count, seed=0):
+    """
+    Build `count` picks in the Robs_Picks.json format. Picks go on random generated events
+    first; past the number of events they reference events no longer in the data (older
+    seasons), which is what a long-lived picks file looks like.
+    """
+    rng = random.Random(seed)
+    chosen = rng.sample(events, min(count, len(events)))
+    picks = {}
+    for event in chosen:
+        picks[event.event_id] = _pick(event.event_id, rng.choice(event.competitors).name,
+                                      event.et_date, event.et_time)
+    base = date(LATEST_SEASON - 10, 1, 1)
+    for i in range(count - len(chosen)):
+        event_id = str(ORPHAN_EVENT_ID + i)
+        picks[event_id] = _pick(event_id, f"Retired Team {i % 30:02d}",
+                                base + timedelta(days=rng.randrange(3650)), "07:00 PM ET")
+    return picks
+
+
+def _pick(event_id, winner, game_date, start_time):
+    return {
+        "EventID": event_id,
+        "Value.winner": winner,
+        "Value.address": "127.0.0.1",
+        "Value.device_name": "benchmark",
+        "Value.user_agent": "benchmark",
+        "Value.timestamp": f"{game_date:%Y-%m-%d} 12:00:00",
+        "Value.game_date": game_date.strftime("%A, %B %d, %Y"),
+        "Value.game_start_time": start_time,
+    }
+
+
+def write_dataset(root, seasons, picks, seed=0, layout="shards"):
+    """
+    Write the games under `root`/Game_Dataframe, as month shards like the fetchers do
+    (layout "shards") or as legacy single files plus columnar snapshots ("single"), and
+    Robs_Picks/Robs_Picks.json. Returns the payloads and a summary of the data.
+    """
+    root = Path(root)
+    (root / "Game_Dataframe").mkdir(parents=True, exist_ok=True)
+    (root / "Robs_Picks").mkdir(parents=True, exist_ok=True)
+    payloads = generate_payloads(seasons, seed)
+    all_events = []
+    info = {"seasons": seasons, "seed": seed, "layout": layout, "rows": {}, "events": {}, "dates": {}}
+    for sport, (_, file_name) in PARSERS.items():
+        rows = parse_payloads(sport, payloads[sport])
+        path = root / "Game_Dataframe" / file_name
+        if layout == "shards":
+            shards.write_rows(path, rows)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(rows, f, indent=4)
+            snapshot.write_snapshot(path, rows)
+        events = game_events.from_rows(sport, rows)
+        all_events.extend(events)
+        info["rows"][sport] = len(rows)
+        info["events"][sport] = len(events)
+        info["dates"][sport] = len(payloads[sport])
+    pick_data = make_picks(all_events, picks, seed)
+    with open(root / "Robs_Picks" / "Robs_Picks.json", "w", encoding="utf-8") as f:
+        json.dump(pick_data, f, indent=4)
+    info["picks"] = len(pick_data)
+    return payloads, info
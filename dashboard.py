@@ -1,64 +1,116 @@
-import json
-import os
-from datetime import datetime
-from flask import Blueprint, render_template, jsonify, current_app
+import hashlib
+import math
+from datetime import datetime, timezone
+from flask import Blueprint, render_template, jsonify, current_app, request
+import event_registry
+import game_store
+import metrics
+import pick_stats
+import pick_store
+from Data_Queries import telemetry
 
 # Create a blueprint instead of a separate Flask app.
 dashboard_bp = Blueprint('dashboard', __name__, template_folder="templates_dashboard")
 
-def load_json(filepath):
-    # Build the full path relative to the application's root folder.
-    full_path = os.path.join(current_app.root_path, filepath)
-    if not os.path.exists(full_path):
-        print(f"File not found: {full_path}")
-        return []
-    try:
-        with open(full_path, "r") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading {full_path}: {e}")
-        return []
-
-def gather_all_games(march_madness, mlb_games, nba_games, nhl_games):
-    games_dict = {}
-
-    def process_list(games):
-        if isinstance(games, dict):
-            games = [games]
-        for record in games:
-            event_id = record.get("event.id")
-            if not event_id:
-                continue
-            if event_id not in games_dict:
-                games_dict[event_id] = {
-                    "event.id": event_id,
-                    "event.name": record.get("event.name", record.get("event.shortName", "N/A")),
-                    "event.date": record.get("event.date", ""),
-                    "competitors": []
-                }
-            score_str = record.get("comp.competitors.score") or record.get("competitors.score", "0")
+# Sports in the order the event registry resolves ids listed by more than one sport.
+SPORTS = event_registry.SPORTS
+
+# Pick grading cache: event_id -> {"pick_key", "key", "result", "game_date", "frozen"}
+_grade_cache = {}
+# Raw games tables (one row per competitor): sport -> {"source", "rows", "by_date", "sorted"},
+# rebuilt per data load.
+_tables_cache = {}
+
+TABLE_SORT_KEYS = ("event_date", "event_name", "team_name", "score")
+TABLE_PAGE_SIZE = 50
+TABLE_MAX_PAGE_SIZE = 200
+
+def today():
+    """The current ET date; grades of unfinished games (pending vs tie) depend on it."""
+    return datetime.now(pick_store.EASTERN).date()
+
+def grade_pick(event_id, pick, game, final):
+    """
+    Return (result, pick_date) for a pick, reusing the cached grade unless the pick, the
+    game's score/teams or (for unfinished games) the current date changed. Results of
+    final games are frozen.
+    """
+    pick_key = (pick.get("Value.winner"), pick.get("Value.game_date"))
+    cached = _grade_cache.get(event_id)
+    if cached is not None and cached["frozen"] and cached["pick_key"] == pick_key:
+        metrics.cache_event("pick_grades", True)
+        return cached["result"], cached["game_date"]
+    key = (pick_key, game.competitors if game is not None else None,
+           None if final else today())
+    if cached is not None and cached["key"] == key:
+        metrics.cache_event("pick_grades", True)
+        return cached["result"], cached["game_date"]
+    metrics.cache_event("pick_grades", False)
+    result = determine_pick_result(pick, game)
+    game_date = get_pick_date(pick)
+    _grade_cache[event_id] = {"pick_key": pick_key, "key": key, "result": result,
+                              "game_date": game_date, "frozen": final and result != "pending"}
+    return result, game_date
+
+def grade_all_picks(games_by_sport=None):
+    """
+    Grade every pick against the current game data and keep the pick_stats rollups in sync.
+    `games_by_sport` are event lists in SPORTS order the caller already holds.
+    Returns a list of (event_id, pick, event or None, result, pick_date).
+    """
+    event_registry.sync(dict(zip(SPORTS, games_by_sport)) if games_by_sport is not None else None)
+    robs_picks = pick_store.load_picks()
+    graded = []
+    if isinstance(robs_picks, dict):
+        for event_id, pick_data in robs_picks.items():
+            entry = event_registry.get(event_id)
+            game = entry.event if entry is not None else None
+            result, game_date = grade_pick(event_id, pick_data, game, entry is not None and entry.final)
+            pick_stats.record(event_id, result, game_date, entry.sport if entry is not None else None)
+            graded.append((event_id, pick_data, game, result, game_date))
+        pick_stats.retain(robs_picks)
+    return graded
+
+def get_games_table(sport):
+    """Return the cached table for a sport, rebuilding it when the store swapped in new events."""
+    source = game_store.get_games(sport)
+    table = _tables_cache.get(sport)
+    metrics.cache_event("games_table", table is not None and table["source"] is source)
+    if table is not None and table["source"] is source:
+        return table
+    rows = []
+    by_date = {}
+    for event in source:
+        event_rows = [{
+            "event_id": event.event_id,
+            "event_name": event.name,
+            "event_date": event.date,
+            "score": competitor.score,
+            "team_name": competitor.name,
+        } for competitor in event.competitors]
+        rows.extend(event_rows)
+        if event.et_date is not None:
+            by_date.setdefault(event.et_date, []).extend(event_rows)
+    table = {"source": source, "rows": rows, "by_date": by_date, "sorted": {}}
+    _tables_cache[sport] = table
+    return table
+
+def _table_sort_key(sort):
+    if sort == "score":
+        def key(row):
             try:
-                score = int(score_str)
-            except:
-                score = 0
-            team_name = record.get("team.displayName") or record.get("team.name", "Unknown Team")
-            games_dict[event_id]["competitors"].append({
-                "score": score,
-                "team_name": team_name
-            })
-    process_list(march_madness)
-    process_list(mlb_games)
-    process_list(nba_games)
-    process_list(nhl_games)
-
-    for eid, game in games_dict.items():
-        comps = game["competitors"]
-        if len(comps) == 2:
-            game["combined_score"] = f"{comps[0]['score']}-{comps[1]['score']}"
-            game["combined_teams"] = [comps[0]["team_name"], comps[1]["team_name"]]
-    return games_dict
+                return int(row["score"])
+            except (TypeError, ValueError):
+                return -1
+        return key
+    return lambda row: row[sort] or ""
 
 def get_game_start_datetime(pick):
+    """The game's start as a naive ET datetime, or None when the pick has no start time."""
+    start_utc = pick.get(pick_store.START_FIELD)
+    if start_utc:
+        start = datetime.strptime(start_utc, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        return start.astimezone(pick_store.EASTERN).replace(tzinfo=None)
     time_str = pick.get("Value.game_start_time", "").strip()
     date_str = pick.get("Value.game_date", "").strip()
     if not time_str or time_str.lower() == "n/a":
@@ -74,27 +126,21 @@ def get_game_start_datetime(pick):
         return None
 
 def get_pick_date(pick):
-    game_date = pick.get("Value.game_date", "")
-    try:
-        return datetime.strptime(game_date, "%A, %B %d, %Y").date()
-    except Exception as e:
-        print("Error parsing pick date:", e)
-        return None
+    # Structured picks carry an ISO date; only unmigrated ones fall back to the display string.
+    game_date = pick_store.pick_game_date(pick)
+    if game_date is None:
+        print(f"Error parsing pick date: {pick.get('Value.game_date', '')!r}")
+    return game_date
 
 def determine_pick_result(pick, game):
-    if not game or "combined_score" not in game:
+    if game is None or len(game.competitors) != 2:
         return "pending"
     picked_winner = pick.get("Value.winner", "").lower()
-    scores_str = game["combined_score"].split("-")
-    if len(scores_str) != 2:
-        return "pending"
-    try:
-        score1 = int(scores_str[0].strip())
-        score2 = int(scores_str[1].strip())
-    except:
-        return "pending"
+    competitor1, competitor2 = game.competitors
+    score1 = competitor1.points
+    score2 = competitor2.points
     pick_date = get_pick_date(pick)
-    current_date = datetime.now().date()
+    current_date = today()
     if pick_date == current_date and score1 == 0 and score2 == 0:
         return "pending"
     if score1 == score2:
@@ -102,100 +148,169 @@ def determine_pick_result(pick, game):
             return "tie"
         else:
             return "pending"
-    if "combined_teams" not in game or len(game["combined_teams"]) != 2:
-        return "pending"
-    team1, team2 = game["combined_teams"]
+    team1, team2 = competitor1.name, competitor2.name
     actual_winner = team1.lower() if score1 > score2 else team2.lower()
     return "win" if picked_winner in actual_winner else "loss"
 
 @dashboard_bp.route("/dashboard")
 def dashboard():
-    # Load JSON files (paths are relative to the app's root folder)
-    march_madness = load_json(os.path.join("Game_Dataframe", "march_madness_games.json"))
-    mlb_games = load_json(os.path.join("Game_Dataframe", "mlb_games.json"))
-    nba_games = load_json(os.path.join("Game_Dataframe", "nba_games.json"))
-    nhl_games = load_json(os.path.join("Game_Dataframe", "nhl_games.json"))
-    robs_picks = load_json(os.path.join("Robs_Picks", "Robs_Picks.json"))
-
-    all_games = gather_all_games(march_madness, mlb_games, nba_games, nhl_games)
+    # Events come from the shared in-memory store (JSON files or SQLite backend)
+    march_madness = game_store.get_games("MarchMadness")
+    mlb_games = game_store.get_games("MLB")
+    nba_games = game_store.get_games("NBA")
+    nhl_games = game_store.get_games("NHL")
+    with metrics.phase("picks"):
+        robs_picks = pick_store.load_picks()
+
+    with metrics.phase("grading"):
+        graded = grade_all_picks([march_madness, mlb_games, nba_games, nhl_games])
     correlated_picks = []
     win_count = 0
     loss_count = 0
     tie_count = 0
     pending_count = 0
-    daily_stats = {}
 
-    if isinstance(robs_picks, dict):
-        for event_id, pick_data in robs_picks.items():
-            game = all_games.get(event_id, {})
-            result = determine_pick_result(pick_data, game)
-            if result == "win":
-                win_count += 1
-            elif result == "loss":
-                loss_count += 1
-            elif result == "tie":
-                tie_count += 1
-            else:
-                pending_count += 1
-
-            game_date = get_pick_date(pick_data)
-            if game_date and result in ["win", "loss", "tie"]:
-                day_key = game_date.strftime("%Y-%m-%d")
-                if day_key not in daily_stats:
-                    daily_stats[day_key] = {"wins": 0, "losses": 0, "ties": 0, "total": 0}
-                daily_stats[day_key]["total"] += 1
-                if result == "win":
-                    daily_stats[day_key]["wins"] += 1
-                elif result == "loss":
-                    daily_stats[day_key]["losses"] += 1
-                elif result == "tie":
-                    daily_stats[day_key]["ties"] += 1
-
-            display_date = pick_data.get("Value.game_date", "N/A")
-            correlated_picks.append({
-                "event_id": event_id,
-                "event_name": game.get("event.name", game.get("event.shortName", "N/A")),
-                "event_date": display_date,
-                "pick_winner": pick_data.get("Value.winner", "N/A"),
-                "result": result,
-                "game_date": game_date,
-                "matching_game_data": game
-            })
-
-    correlated_picks.sort(key=lambda x: x["game_date"] if x["game_date"] else datetime.min.date(), reverse=True)
+    for event_id, pick_data, game, result, game_date in graded:
+        if result == "win":
+            win_count += 1
+        elif result == "loss":
+            loss_count += 1
+        elif result == "tie":
+            tie_count += 1
+        else:
+            pending_count += 1
+
+        display_date = pick_data.get("Value.game_date", "N/A")
+        correlated_picks.append({
+            "event_id": event_id,
+            "event_name": game.name if game is not None else "N/A",
+            "event_date": display_date,
+            "pick_winner": pick_data.get("Value.winner", "N/A"),
+            "result": result,
+            "game_date": game_date,
+        })
+
+    correlated_picks.sort(key=lambda x: x["game_date"].toordinal() if x["game_date"] else 0, reverse=True)
     total_decided = win_count + loss_count
     win_percentage = (win_count / total_decided * 100) if total_decided > 0 else 0
 
-    daily_data = []
-    for day, stats in sorted(daily_stats.items()):
-        decided = stats["wins"] + stats["losses"]
-        win_pct = (stats["wins"] / decided * 100) if decided > 0 else 0
-        daily_data.append({
-            "day": day,
-            "win_percentage": round(win_pct, 1),
-            "wins": stats["wins"],
-            "losses": stats["losses"],
-            "ties": stats["ties"],
-            "total": stats["total"]
-        })
-    return render_template("dashboard.html",
-                           march_madness=march_madness,
-                           mlb_games=mlb_games,
-                           nba_games=nba_games,
-                           nhl_games=nhl_games,
-                           robs_picks=robs_picks,
-                           correlated_picks=correlated_picks,
-                           win_count=win_count,
-                           loss_count=loss_count,
-                           tie_count=tie_count,
-                           pending_count=pending_count,
-                           win_percentage=round(win_percentage, 1),
-                           daily_data=daily_data,
-                           current_time=datetime.now().strftime("%Y-%m-%d %H:%M"))
+    # The per-sport raw games tables are loaded lazily from /api/games.
+    with metrics.phase("render"):
+        return render_template("dashboard.html",
+                               robs_picks=robs_picks,
+                               correlated_picks=correlated_picks,
+                               win_count=win_count,
+                               loss_count=loss_count,
+                               tie_count=tie_count,
+                               pending_count=pending_count,
+                               win_percentage=round(win_percentage, 1),
+                               current_time=datetime.now().strftime("%Y-%m-%d %H:%M"))
+
+@dashboard_bp.route("/api/games")
+def games_api():
+    """
+    Paginated raw games for one sport.
+    Query args: sport, date (YYYY-MM-DD, ET), sort (event_date|event_name|team_name|score),
+    order (asc|desc), page, per_page.
+    """
+    sport = request.args.get("sport", "NBA")
+    if sport not in SPORTS:
+        return jsonify({"error": f"Unknown sport: {sport}"}), 400
+    sort = request.args.get("sort", "event_date")
+    if sort not in TABLE_SORT_KEYS:
+        return jsonify({"error": f"Unknown sort column: {sort}"}), 400
+    descending = request.args.get("order", "asc") == "desc"
+    try:
+        page = max(1, int(request.args.get("page", 1)))
+        per_page = min(TABLE_MAX_PAGE_SIZE, max(1, int(request.args.get("per_page", TABLE_PAGE_SIZE))))
+    except ValueError:
+        return jsonify({"error": "page and per_page must be integers"}), 400
+    date_str = request.args.get("date")
+
+    table = get_games_table(sport)
+    if date_str:
+        try:
+            game_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        except ValueError:
+            return jsonify({"error": "date must be YYYY-MM-DD"}), 400
+        rows = sorted(table["by_date"].get(game_date, []), key=_table_sort_key(sort), reverse=descending)
+    else:
+        rows = table["sorted"].get((sort, descending))
+        if rows is None:
+            rows = sorted(table["rows"], key=_table_sort_key(sort), reverse=descending)
+            table["sorted"][(sort, descending)] = rows
+
+    total = len(rows)
+    start = (page - 1) * per_page
+    return jsonify({
+        "sport": sport,
+        "date": date_str,
+        "sort": sort,
+        "order": "desc" if descending else "asc",
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": max(1, math.ceil(total / per_page)),
+        "rows": rows[start:start + per_page],
+    })
+
+@dashboard_bp.route("/api/games/<event_id>")
+def game_detail_api(event_id):
+    """The game record a pick is graded against (shown under "Show Details")."""
+    event_registry.sync()
+    game = event_registry.event(event_id)
+    if game is None:
+        return jsonify({"error": f"Unknown event: {event_id}"}), 404
+    return jsonify(game.to_dict())
+
+@dashboard_bp.route("/api/fetch_telemetry")
+def fetch_telemetry_api():
+    """Recent refresh cycles and per-sport fetch timings, slowest dates and failure streaks."""
+    try:
+        cycles = max(1, int(request.args.get("cycles", 20)))
+    except ValueError:
+        return jsonify({"error": "cycles must be an integer"}), 400
+    return jsonify(telemetry.summary(cycles))
+
+def stats_etag(period):
+    """An ETag from the picks and game data versions and the date: it changes whenever a rollup could."""
+    versions = (period, pick_store.version(), tuple(game_store.data_version(sport) for sport in SPORTS),
+                today())
+    return hashlib.sha1(repr(versions).encode("utf-8")).hexdigest()
+
+def stats_response(period):
+    """
+    Serve a pick_stats rollup as JSON with ETag/Last-Modified revalidation. The ETag is
+    checked before grading, so an unchanged rollup costs two version lookups.
+    """
+    etag = stats_etag(period)
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response
+    grade_all_picks()
+    response = jsonify(pick_stats.rollup(period))
+    response.last_modified = pick_stats.last_modified()
+    response.cache_control.no_cache = True
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+@dashboard_bp.route("/api/daily_stats")
+def daily_stats_api():
+    return stats_response("daily")
+
+@dashboard_bp.route("/api/weekly_stats")
+def weekly_stats_api():
+    return stats_response("weekly")
 
 @dashboard_bp.route("/api/monthly_stats")
 def monthly_stats_api():
-    return jsonify([])
+    return stats_response("monthly")
+
+@dashboard_bp.route("/api/sport_stats")
+def sport_stats_api():
+    return stats_response("sport")
 
 # Allow running dashboard.py by itself for testing:
 if __name__ == "__main__":
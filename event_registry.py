@@ -0,0 +1,87 @@
+import threading
+from collections import namedtuple
+
+import game_store
+import metrics
+
+# Cross-sport registry of the loaded events, keyed by event id. Each entry records the
+# event, its sport and whether it is final, so grading, the dashboard and the per-sport
+# pick breakdowns look events up directly instead of merging every sport's events on
+# each request.
+#
+# The registry follows the game store: sync() compares each sport's event list with the
+# one it registered and re-registers only the sports whose list was swapped out (a
+# refresh, a changed file, a live update), leaving the other sports' entries in place.
+# Lookups are dict hits; the dicts are updated in place under _lock, so callers
+# should look entries up rather than iterate over them.
+
+# Registration order: when two sports list the same event id, the first one wins.
+SPORTS = ("MarchMadness", "MLB", "NBA", "NHL")
+
+
+class Entry(namedtuple("Entry", "event sport final")):
+    __slots__ = ()
+
+
+_lock = threading.Lock()
+# "sources": sport -> the event list registered for it; "by_sport": sport -> {event_id: Entry}
+_state = {"sources": {}, "by_sport": {}}
+_entries = {}  # event_id -> Entry (the owning sport's)
+
+
+def _entry(event):
+    return Entry(event, event.sport, event.final)
+
+
+def _register(sport, events):
+    """Replace one sport's entries; only the ids it had or has now are re-resolved."""
+    sport_entries = {}
+    for event in events:
+        sport_entries.setdefault(event.event_id, _entry(event))
+    touched = set(_state["by_sport"].get(sport, ())) | set(sport_entries)
+    _state["by_sport"][sport] = sport_entries
+    _state["sources"][sport] = events
+    for event_id in touched:
+        entry = None
+        for owner in SPORTS:
+            entry = _state["by_sport"].get(owner, {}).get(event_id)
+            if entry is not None:
+                break
+        if entry is None:
+            _entries.pop(event_id, None)
+        else:
+            _entries[event_id] = entry
+
+
+def sync(sources=None):
+    """
+    Bring the registry up to date with the game store. `sources` ({sport: [Event, ...]})
+    can pass event lists the caller already holds. Returns the sports re-registered.
+    """
+    sources = sources or {}
+    current = {sport: sources[sport] if sport in sources else game_store.get_games(sport) for sport in SPORTS}
+    stale = [sport for sport in SPORTS if _state["sources"].get(sport) is not current[sport]]
+    metrics.cache_event("event_registry", not stale)
+    if stale:
+        with _lock:
+            for sport in stale:
+                if _state["sources"].get(sport) is not current[sport]:
+                    _register(sport, current[sport])
+    return stale
+
+
+def get(event_id):
+    """The registry entry of an event id, or None."""
+    return _entries.get(event_id)
+
+
+def event(event_id):
+    entry = _entries.get(event_id)
+    return entry.event if entry is not None else None
+
+
+def clear():
+    with _lock:
+        _state["sources"].clear()
+        _state["by_sport"].clear()
+        _entries.clear()
@@ -0,0 +1,137 @@
+from collections import namedtuple
+
+import pytz
+from dateutil.parser import isoparse
+
+# Normalized event records. The fetchers write one flat row per competitor and each
+# sport names its fields differently (NBA/NHL "team.name", "competitors.score",
+# "status.clock"; MLB/March Madness "team.displayName", "comp.competitors.score",
+# "comp.status.displayClock"). from_rows() resolves those names once per data load and
+# returns one Event per game with both competitors embedded, so the request path reads
+# plain attributes instead of probing dicts.
+
+EASTERN = pytz.timezone("America/New_York")
+
+# Field names in lookup order; every sport's rows only carry one of each pair.
+DATE_FIELDS = ("event.date", "comp.date")
+NAME_FIELDS = ("event.name", "event.shortName")
+TEAM_FIELDS = ("team.displayName", "team.name")
+SCORE_FIELDS = ("competitors.score", "comp.competitors.score")
+CLOCK_FIELDS = ("status.clock", "comp.status.displayClock")
+PERIOD_FIELDS = ("status.period", "comp.status.period")
+STATE_FIELDS = ("status.state", "comp.status.state")
+
+
+class Competitor(namedtuple("Competitor", "team_id name abbreviation score")):
+    __slots__ = ()
+
+    @property
+    def points(self):
+        """The score as an int (0 when missing or not numeric)."""
+        try:
+            return int(self.score)
+        except (TypeError, ValueError):
+            return 0
+
+
+class Event:
+    """One game of a sport, with its competitors in the order the feed listed them."""
+
+    __slots__ = ("sport", "event_id", "name", "date", "start", "et_date", "et_time",
+                 "clock", "period", "state", "competitors")
+
+    def __init__(self, sport, event_id, name, date, start, clock, period, state, competitors=()):
+        self.sport = sport
+        self.event_id = event_id
+        self.name = name
+        self.date = date
+        # Start instant in ET, plus the ET calendar date and "07:30 PM ET" label used by the views.
+        self.start = start
+        self.et_date = start.date() if start is not None else None
+        self.et_time = start.strftime("%I:%M %p ET") if start is not None else "N/A"
+        self.clock = clock
+        self.period = period
+        self.state = state
+        self.competitors = tuple(competitors)
+
+    @property
+    def final(self):
+        return self.state == "post"
+
+    def to_dict(self):
+        """JSON-friendly view of the event (used by the dashboard's game details)."""
+        data = {
+            "event.id": self.event_id,
+            "event.name": self.name,
+            "event.date": self.date,
+            "sport": self.sport,
+            "status.clock": self.clock,
+            "status.period": self.period,
+            "status.state": self.state,
+            "competitors": [{"score": c.points, "team_name": c.name} for c in self.competitors],
+        }
+        if len(self.competitors) == 2:
+            data["combined_score"] = f"{self.competitors[0].points}-{self.competitors[1].points}"
+            data["combined_teams"] = [c.name for c in self.competitors]
+        return data
+
+    def __repr__(self):
+        return f"Event({self.sport!r}, {self.event_id!r}, {self.name!r})"
+
+
+def _first(row, fields, default):
+    for field in fields:
+        if field in row:
+            return row[field]
+    return default
+
+
+def _start_et(date_str):
+    start = isoparse(date_str)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=pytz.utc)
+    return start.astimezone(EASTERN)
+
+
+def row_et_date(row):
+    """The ET calendar date of a row's event, or None if its date does not parse."""
+    try:
+        return _start_et(_first(row, DATE_FIELDS, "")).date()
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def from_rows(sport, rows):
+    """Group a sport's flat competitor rows into Events, in first-seen order."""
+    events = {}
+    competitors = {}
+    for row in rows:
+        event_id = row.get("event.id")
+        if not event_id:
+            continue
+        event = events.get(event_id)
+        if event is None:
+            date = _first(row, DATE_FIELDS, "")
+            try:
+                start = _start_et(date)
+            except (TypeError, ValueError, OverflowError) as e:
+                print(f"Error parsing date for event {event_id}: {e}")
+                start = None
+            event = events[event_id] = Event(
+                sport, event_id,
+                _first(row, NAME_FIELDS, "N/A"),
+                date, start,
+                _first(row, CLOCK_FIELDS, "N/A"),
+                _first(row, PERIOD_FIELDS, "N/A"),
+                _first(row, STATE_FIELDS, None),
+            )
+            competitors[event_id] = []
+        competitors[event_id].append(Competitor(
+            row.get("team.id"),
+            _first(row, TEAM_FIELDS, "N/A"),
+            row.get("team.abbreviation", "N/A"),
+            _first(row, SCORE_FIELDS, "0"),
+        ))
+    for event_id, event in events.items():
+        event.competitors = tuple(competitors[event_id])
+    return list(events.values())
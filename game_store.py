@@ -0,0 +1,327 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytz
+
+import game_events
+import metrics
+import sqlite_store
+from Data_Queries import atomic_json, shards, snapshot
+
+# Process-wide cache of the Game_Dataframe files. Each sport is parsed once and
+# only re-parsed when its file's mtime/size changes (or refresh_data() is called).
+# With ROBBY_STORAGE=sqlite the rows come from sqlite_store instead and the cache is
+# keyed on the sport's version counter in the database. A sport's compact columnar
+# snapshot (see Data_Queries/snapshot.py) is read instead of the JSON when it is current.
+# Each entry carries a data version, (content hash of the file, in-memory update count),
+# that changes whenever the sport's events do; caches can key on data_version().
+#
+# Sports written as month shards (Data_Queries/shards.py) are checked with one stat of
+# their manifest; each shard is parsed once and only re-parsed when its hash in the
+# manifest changes, and get_games_for_date() only loads the shard of the requested month.
+BASE_DIR = Path(__file__).resolve().parent
+GAME_DATAFRAME_FOLDER = BASE_DIR / "Game_Dataframe"
+
+SPORT_FILES = {
+    "NBA": GAME_DATAFRAME_FOLDER / "nba_games.json",
+    "NHL": GAME_DATAFRAME_FOLDER / "nhl_games.json",
+    "MLB": GAME_DATAFRAME_FOLDER / "mlb_games.json",
+    "MarchMadness": GAME_DATAFRAME_FOLDER / "march_madness_games.json",
+}
+
+EASTERN = pytz.timezone("America/New_York")
+
+_lock = threading.RLock()
+# sport -> {"stamp": (mtime_ns, size) or None, "version": (file hash, live updates),
+#           "games": [Event, ...], "by_date": {date: [Event, ...]}}
+_entries = {}
+# Sharded sports only: sport -> {"stamp": manifest (mtime_ns, size), "manifest": {...},
+# "version": hash of the shard hashes}; (sport, month) -> {"sha256", "games", "by_date"};
+# sport -> number of live updates applied to its shards.
+_manifests = {}
+_shards = {}
+_live_updates = {}
+
+
+def _file_stamp(file_path):
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _manifest_entry(sport):
+    """The cached shard manifest of a sport (re-read when the file changed), or None if it is not sharded."""
+    cached = _manifests.get(sport)
+    file_path = SPORT_FILES[sport]
+    stamp = _file_stamp(shards.manifest_path(file_path))
+    if stamp is None:
+        return None
+    if cached is not None and cached["stamp"] == stamp:
+        return cached
+    manifest = shards.read_manifest(file_path)
+    if manifest is None:
+        return cached
+    digest = hashlib.sha256()
+    for month, meta in manifest["shards"].items():
+        digest.update(f"{month}:{meta['sha256']};".encode())
+    cached = {"stamp": stamp, "manifest": manifest, "version": digest.hexdigest()}
+    _manifests[sport] = cached
+    return cached
+
+
+def _current_stamp(sport):
+    if sqlite_store.enabled():
+        return ("sqlite", sqlite_store.get_version(f"games:{sport}"))
+    sharded = _manifest_entry(sport)
+    if sharded is not None:
+        return ("shards", sharded["stamp"])
+    file_path = SPORT_FILES[sport]
+    return (_file_stamp(file_path), _file_stamp(snapshot.snapshot_path(file_path)))
+
+
+def _file_version(sport, stamp):
+    """
+    The content hash the writer published with the file (Data_Queries/atomic_json.py) if
+    it describes the file as stamped before reading it; otherwise (a file written by hand,
+    or a write that landed mid-read and triggers a reload next time) the stamp itself.
+    """
+    if sqlite_store.enabled():
+        return stamp
+    published = atomic_json.read_version(SPORT_FILES[sport])
+    if published is not None and stamp[0] is not None and published.get("source") == list(stamp[0]):
+        return published.get("sha256")
+    return stamp
+
+
+def _read_games(file_path):
+    games = snapshot.read_snapshot(file_path)
+    if games is not None:
+        return games
+    if not os.path.exists(file_path):
+        print(f"⚠️ JSON file not found: {file_path}")
+        return []
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            games = json.load(f)
+    except Exception as e:
+        print(f"Error loading {file_path}: {e}")
+        return None
+    return games if isinstance(games, list) else []
+
+
+def build_date_index(sport, events):
+    """Group a sport's events into {ET date: [event, ...]} sorted by start time."""
+    by_date = {}
+    for event in events:
+        if event.et_date is not None and len(event.competitors) == 2:
+            by_date.setdefault(event.et_date, []).append(event)
+    for day_events in by_date.values():
+        day_events.sort(key=lambda x: (x.start.hour, x.start.minute))
+    return by_date
+
+
+def _shard_entry(sport, month, manifest):
+    """A month shard's events, parsed once per content hash (None if the shard could not be read)."""
+    meta = manifest["shards"][month]
+    cached = _shards.get((sport, month))
+    if cached is not None and cached["sha256"] == meta["sha256"]:
+        return cached
+    with _lock:
+        cached = _shards.get((sport, month))
+        if cached is not None and cached["sha256"] == meta["sha256"]:
+            return cached
+        with metrics.phase("json_load"):
+            rows = shards.read_shard(SPORT_FILES[sport], month, manifest)
+        if rows is None:
+            return cached
+        with metrics.phase("grouping"):
+            games = game_events.from_rows(sport, rows)
+            entry = {"sha256": meta["sha256"], "games": games, "by_date": build_date_index(sport, games)}
+        _shards[(sport, month)] = entry
+        return entry
+
+
+def _aggregate(sport, sharded):
+    """Combine a sharded sport's month shards into one cache entry."""
+    games = []
+    by_date = {}
+    for month in sharded["manifest"]["shards"]:
+        shard = _shard_entry(sport, month, sharded["manifest"])
+        if shard is None:
+            return None
+        games.extend(shard["games"])
+        by_date.update(shard["by_date"])
+    for key in [key for key in _shards if key[0] == sport and key[1] not in sharded["manifest"]["shards"]]:
+        del _shards[key]
+    return {"stamp": ("shards", sharded["stamp"]), "version": (sharded["version"], _live_updates.get(sport, 0)),
+            "games": games, "by_date": by_date}
+
+
+def _load_entry(sport):
+    """Parse a sport's JSON file (or shards) and return a fresh cache entry (or None on a torn read)."""
+    if not sqlite_store.enabled():
+        sharded = _manifest_entry(sport)
+        if sharded is not None:
+            return _aggregate(sport, sharded)
+    stamp = _current_stamp(sport)
+    with metrics.phase("json_load"):
+        if sqlite_store.enabled():
+            rows = sqlite_store.rows_for_sport(sport)
+        else:
+            rows = _read_games(SPORT_FILES[sport])
+    if rows is None:
+        return None
+    with metrics.phase("grouping"):
+        games = game_events.from_rows(sport, rows)
+        by_date = build_date_index(sport, games)
+    return {"stamp": stamp, "version": (_file_version(sport, stamp), 0), "games": games, "by_date": by_date}
+
+
+def _get_entry(sport):
+    if sport not in SPORT_FILES:
+        return None
+    entry = _entries.get(sport)
+    if entry is not None and entry["stamp"] == _current_stamp(sport):
+        metrics.cache_event("game_store", True)
+        return entry
+    metrics.cache_event("game_store", False)
+    with _lock:
+        entry = _entries.get(sport)
+        if entry is not None and entry["stamp"] == _current_stamp(sport):
+            return entry
+        new_entry = _load_entry(sport)
+        if new_entry is None:
+            # Keep serving the previous data if the file could not be parsed.
+            return entry
+        _entries[sport] = new_entry
+        return new_entry
+
+
+def get_games(sport):
+    """Return the cached events for a sport, re-parsing only if the file changed on disk."""
+    entry = _get_entry(sport)
+    return entry["games"] if entry is not None else []
+
+
+def data_version(sport):
+    """A hashable version of a sport's current events; it changes whenever they do."""
+    if sport in SPORT_FILES and not sqlite_store.enabled():
+        sharded = _manifest_entry(sport)
+        if sharded is not None:
+            return (sharded["version"], _live_updates.get(sport, 0))
+    entry = _get_entry(sport)
+    return entry["version"] if entry is not None else None
+
+
+def get_games_for_date(sport, game_date):
+    """Return a sport's two-team events on an ET calendar date, sorted by start time.
+
+    The returned events are shared with the cache and must not be mutated.
+    """
+    if sqlite_store.enabled():
+        # Indexed query for just this day's events instead of loading the whole sport.
+        if sport not in SPORT_FILES:
+            return []
+        with metrics.phase("json_load"):
+            rows = sqlite_store.rows_for_date(sport, game_date)
+        with metrics.phase("grouping"):
+            events = game_events.from_rows(sport, rows)
+            return build_date_index(sport, events).get(game_date, [])
+    if sport in SPORT_FILES:
+        sharded = _manifest_entry(sport)
+        if sharded is not None:
+            # Only the shard of the requested month is loaded.
+            month = shards.month_key(game_date)
+            if month not in sharded["manifest"]["shards"]:
+                return []
+            shard = _shard_entry(sport, month, sharded["manifest"])
+            return shard["by_date"].get(game_date, []) if shard is not None else []
+    entry = _get_entry(sport)
+    if entry is None:
+        return []
+    return entry["by_date"].get(game_date, [])
+
+
+def refresh_data(sports=None):
+    """
+    Re-load the given sports (default: all) and swap them in atomically. A sharded sport
+    only re-parses the month shards whose hash in the manifest changed; the others stay
+    cached.
+    """
+    sports = list(sports or SPORT_FILES)
+    fresh = {}
+    for sport in sports:
+        with _lock:
+            entry = _load_entry(sport)
+        if entry is not None:
+            fresh[sport] = entry
+    with _lock:
+        _entries.update(fresh)
+    return sorted(fresh)
+
+
+def _event_key(event):
+    return (event.state, event.clock, event.period, event.competitors)
+
+
+def apply_events(sport, events):
+    """
+    Swap updated versions of already-known events into a sport's cached data (e.g. from the
+    live polling lane) without touching the file on disk. Returns the events that changed.
+    """
+    if sport not in SPORT_FILES:
+        return []
+    if sport in _manifests and not sqlite_store.enabled():
+        return _apply_to_shards(sport, events)
+    with _lock:
+        entry = _entries.get(sport)
+        if entry is None:
+            return []
+        updates = {event.event_id: event for event in events}
+        changed = []
+        games = []
+        for game in entry["games"]:
+            update = updates.get(game.event_id)
+            if update is not None and _event_key(update) != _event_key(game):
+                changed.append(update)
+                game = update
+            games.append(game)
+        if changed:
+            # Keep the file stamp so the next on-disk write still triggers a reload.
+            file_version, live_updates = entry["version"]
+            _entries[sport] = {"stamp": entry["stamp"], "version": (file_version, live_updates + 1),
+                               "games": games, "by_date": build_date_index(sport, games)}
+    return changed
+
+
+
+def _apply_to_shards(sport, events):
+    updates = {event.event_id: event for event in events}
+    changed = []
+    with _lock:
+        for key in sorted(key for key in _shards if key[0] == sport):
+            shard = _shards[key]
+            games = []
+            shard_changed = False
+            for game in shard["games"]:
+                update = updates.get(game.event_id)
+                if update is not None and _event_key(update) != _event_key(game):
+                    changed.append(update)
+                    game = update
+                    shard_changed = True
+                games.append(game)
+            if shard_changed:
+                # Keep the shard hash so the next write of this month still triggers a reload.
+                _shards[key] = {"sha256": shard["sha256"], "games": games, "by_date": build_date_index(sport, games)}
+        if changed:
+            _live_updates[sport] = _live_updates.get(sport, 0) + 1
+            if sport in _entries:
+                entry = _aggregate(sport, _manifests[sport])
+                if entry is not None:
+                    _entries[sport] = entry
+    return changed
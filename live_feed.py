@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# Cross-process feed of data changes, from the process that refreshes the data (the
+# update_data.py scheduler) to the processes that serve /stream (serve.py's workers).
+# The writer appends one JSON record per line:
+#
+#   {"type": "refresh"}                                  the Game_Dataframe files changed
+#   {"type": "live", "rows": {"NBA": [row, ...], ...}}   rows of events the live lane updated
+#
+# and every worker tails the file (follow()), applies each record to its own game store
+# and pushes the changed events to its /stream subscribers. Records are appended with a
+# single write; past MAX_FEED_BYTES the file is rotated to <name>.1 and followers move
+# on to the new file once they have read the old one to the end.
+
+BASE_DIR = Path(__file__).resolve().parent
+FEED_PATH = Path(os.environ.get("ROBBY_LIVE_FEED", BASE_DIR / "Game_Dataframe" / "live_feed.jsonl"))
+MAX_FEED_BYTES = 1024 * 1024
+POLL_SECONDS = 0.5
+
+_lock = threading.Lock()
+
+
+def append(record):
+    """Append one record to the feed (rotating it first if it grew past MAX_FEED_BYTES)."""
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+    with _lock:
+        try:
+            FEED_PATH.parent.mkdir(parents=True, exist_ok=True)
+            if FEED_PATH.exists() and FEED_PATH.stat().st_size > MAX_FEED_BYTES:
+                os.replace(FEED_PATH, FEED_PATH.with_name(FEED_PATH.name + ".1"))
+            with open(FEED_PATH, "ab") as f:
+                f.write(line)
+        except OSError as e:
+            print(f"⚠️ Could not write to the live feed {FEED_PATH}: {e}")
+
+
+def follow(handler, poll_seconds=POLL_SECONDS):
+    """
+    Call handler(record) for every record appended to the feed from now on, in a daemon
+    thread. Returns the thread.
+    """
+    thread = threading.Thread(target=_follow, args=(handler, poll_seconds), name="live-feed", daemon=True)
+    thread.start()
+    return thread
+
+
+def _open(from_start):
+    try:
+        f = open(FEED_PATH, "rb")
+    except OSError:
+        return None
+    if not from_start:
+        f.seek(0, os.SEEK_END)
+    return f
+
+
+def _rotated(f):
+    try:
+        return os.stat(FEED_PATH).st_ino != os.fstat(f.fileno()).st_ino
+    except OSError:
+        return True
+
+
+def _follow(handler, poll_seconds):
+    # Records written before we started are history; a file created (or rotated in)
+    # after that only holds new records.
+    f = _open(from_start=False)
+    pending = b""
+    while True:
+        if f is None:
+            f = _open(from_start=True)
+            if f is None:
+                time.sleep(poll_seconds)
+                continue
+        # Checked before reading: once the file was rotated away nothing more is written
+        # to it, so this read sees the rest of it.
+        rotated = _rotated(f)
+        data = f.read()
+        if data:
+            pending += data
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                try:
+                    handler(record)
+                except Exception as e:
+                    print(f"⚠️ Could not apply live feed record {record.get('type')}: {e}")
+        elif rotated:
+            f.close()
+            f, pending = None, b""
+        else:
+            time.sleep(poll_seconds)
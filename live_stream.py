@@ -0,0 +1,174 @@
+import itertools
+import json
+import queue
+import threading
+from datetime import date
+
+import dashboard
+import game_store
+import metrics
+import pick_store
+
+# Server-Sent Events fan-out for live score and pick-result updates. The refresh
+# pipeline (update_data.publish_data / publish_live, or in serve.py's workers the live
+# feed records they apply) hands every refreshed event to publish_events(); only events
+# whose score, clock, period, state or pick result changed are queued. One broadcaster
+# thread serializes each change once and copies it to the queues of the subscribers
+# whose sport/date filter matches, so an idle /stream connection is just a blocked
+# queue read.
+#
+# Every message carries an id, so a browser that reconnects (e.g. to another worker after
+# a dropped connection) sends Last-Event-ID; such a subscriber is first replayed the
+# current state of the events its filter covers, so it misses nothing in between.
+
+HEARTBEAT_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 500
+
+_lock = threading.Lock()
+_subscribers = set()
+_outbox = queue.Queue()
+_last_seen = {}  # event_id -> (state, clock, period, scores, pick result)
+_state = {"broadcaster": None}
+_message_ids = itertools.count(1)
+
+
+class Subscriber:
+    __slots__ = ("sports", "game_date", "queue", "dropped")
+
+    def __init__(self, sports=None, game_date=None):
+        self.sports = frozenset(sports) if sports else None
+        self.game_date = game_date
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = False
+
+    def wants(self, payload):
+        if self.sports is not None and payload["sport"] not in self.sports:
+            return False
+        return self.game_date is None or payload["date"] == self.game_date
+
+
+def event_payload(event, pick=None):
+    """The JSON sent for one changed event (plus the pick on it, if there is one)."""
+    payload = {
+        "event_id": event.event_id,
+        "sport": event.sport,
+        "date": event.et_date.isoformat() if event.et_date is not None else None,
+        "state": event.state,
+        "clock": event.clock,
+        "period": event.period,
+        "competitors": [{"name": c.name, "score": c.points} for c in event.competitors],
+        "pick": None,
+    }
+    if pick is not None:
+        payload["pick"] = {"winner": pick.get("Value.winner"),
+                           "result": dashboard.determine_pick_result(pick, event)}
+    return payload
+
+
+def _change_key(payload):
+    pick_result = payload["pick"]["result"] if payload["pick"] else None
+    scores = tuple(c["score"] for c in payload["competitors"])
+    return (payload["state"], payload["clock"], payload["period"], scores, pick_result)
+
+
+def _message(payload):
+    return f"id: {next(_message_ids)}\nevent: game\ndata: {json.dumps(payload)}\n\n"
+
+
+def current_payloads(sports=None, game_date=None):
+    """
+    Payloads for the events a filter covers: every event on `game_date`, or without a
+    date the events in progress.
+    """
+    try:
+        day = date.fromisoformat(game_date) if game_date else None
+    except ValueError:
+        return []
+    picks = pick_store.load_picks()
+    payloads = []
+    for sport in sports or game_store.SPORT_FILES:
+        if sport not in game_store.SPORT_FILES:
+            continue
+        if day is not None:
+            events = game_store.get_games_for_date(sport, day)
+        else:
+            events = [event for event in game_store.get_games(sport) if event.state == "in"]
+        payloads.extend(event_payload(event, picks.get(event.event_id)) for event in events)
+    return payloads
+
+
+def publish_events(events):
+    """Queue the events that changed since they were last published; returns how many did."""
+    picks = pick_store.load_picks()
+    changed = []
+    with _lock:
+        first_run = not _last_seen
+        for event in events:
+            payload = event_payload(event, picks.get(event.event_id))
+            key = _change_key(payload)
+            if _last_seen.get(event.event_id) != key:
+                _last_seen[event.event_id] = key
+                changed.append(payload)
+    # The first call only records the baseline instead of replaying every event.
+    if changed and not first_run:
+        _ensure_broadcaster()
+        _outbox.put(changed)
+        return len(changed)
+    return 0
+
+
+def _broadcast():
+    while True:
+        payloads = _outbox.get()
+        with _lock:
+            subscribers = list(_subscribers)
+        for payload in payloads:
+            message = _message(payload)
+            for subscriber in subscribers:
+                if subscriber.dropped or not subscriber.wants(payload):
+                    continue
+                try:
+                    subscriber.queue.put_nowait(message)
+                except queue.Full:
+                    # A client that stopped reading is cut off instead of growing its queue.
+                    subscriber.dropped = True
+
+
+def _ensure_broadcaster():
+    if _state["broadcaster"] is None:
+        with _lock:
+            if _state["broadcaster"] is None:
+                thread = threading.Thread(target=_broadcast, name="sse-broadcaster", daemon=True)
+                thread.start()
+                _state["broadcaster"] = thread
+
+
+def subscribe(sports=None, game_date=None, replay=False):
+    """
+    Generator of SSE messages for one client; unsubscribes when the client goes away.
+    With replay=True (a reconnect) the current state of the filtered events is sent first.
+    """
+    subscriber = Subscriber(sports, game_date)
+    with _lock:
+        _subscribers.add(subscriber)
+    try:
+        # The id makes the browser send Last-Event-ID if it has to reconnect.
+        yield "id: 0\nretry: 5000\n\n"
+        if replay:
+            for payload in current_payloads(sports, game_date):
+                yield _message(payload)
+        while not subscriber.dropped:
+            try:
+                yield subscriber.queue.get(timeout=HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+    finally:
+        with _lock:
+            _subscribers.discard(subscriber)
+
+
+def subscriber_count():
+    return len(_subscribers)
+
+
+metrics.gauge("robby_sse_subscribers", "Open /stream connections in this process.", subscriber_count)
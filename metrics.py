@@ -0,0 +1,209 @@
+import cProfile
+import itertools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+
+from flask import Response, g, has_request_context, request
+
+# Request instrumentation: per-route latency histograms, per-request phase timings
+# (JSON load, grouping, grading, picks, render), cache hit/miss counters, gauges other
+# modules register (gauge()) and an opt-in sampling profiler. Everything is exposed at
+# /metrics in the Prometheus text format.
+#
+# Sampling profiler: set ROBBY_PROFILE_EVERY=N to run cProfile on every Nth request and
+# write the stats to ROBBY_PROFILE_DIR (default: profiles/), one .prof file per request.
+# Only one profiler can be active at a time, so a sample that comes up while another
+# request is still being profiled is skipped.
+
+BASE_DIR = Path(__file__).resolve().parent
+PROFILE_EVERY = int(os.environ.get("ROBBY_PROFILE_EVERY", "0") or 0)
+PROFILE_DIR = Path(os.environ.get("ROBBY_PROFILE_DIR", BASE_DIR / "profiles"))
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_latency = {}   # route -> Histogram
+_phases = {}    # (route, phase) -> Histogram
+_requests = {}  # (route, method, status) -> count
+_cache = {}     # (cache, "hit" | "miss") -> count
+_gauges = {}    # name -> (help text, function returning the current value)
+_profiles = {"written": 0}
+_profile_lock = threading.Lock()  # held while a request is being profiled
+_request_counter = itertools.count(1)
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        index = bisect_left(LATENCY_BUCKETS, seconds)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.total += seconds
+        self.count += 1
+
+
+def _observe(histograms, key, seconds):
+    histogram = histograms.get(key)
+    if histogram is None:
+        histogram = histograms[key] = Histogram()
+    histogram.observe(seconds)
+
+
+def cache_event(cache, hit):
+    """Count a hit or miss of one of the app's caches."""
+    key = (cache, "hit" if hit else "miss")
+    with _lock:
+        _cache[key] = _cache.get(key, 0) + 1
+
+
+def gauge(name, help_text, fn):
+    """Expose fn() (read on every scrape) as a gauge at /metrics."""
+    with _lock:
+        _gauges[name] = (help_text, fn)
+
+
+@contextmanager
+def phase(name):
+    """Time a phase of the current request (a no-op outside a request)."""
+    if not has_request_context():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases = g.setdefault("_metrics_phases", {})
+        phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+
+def _route():
+    rule = request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+def _before_request():
+    g._metrics_start = time.perf_counter()
+    if PROFILE_EVERY > 0 and next(_request_counter) % PROFILE_EVERY == 0 and _profile_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active (Python 3.12+ refuses a second one): skip this sample.
+            _profile_lock.release()
+            return
+        g._metrics_profiler = profiler
+
+
+def _stop_profiler():
+    profiler = g.pop("_metrics_profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        _profile_lock.release()
+    return profiler
+
+
+def _after_request(response):
+    start = g.pop("_metrics_start", None)
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    route = _route()
+    profiler = _stop_profiler()
+    if profiler is not None:
+        _write_profile(profiler, route, elapsed)
+    phases = g.pop("_metrics_phases", {})
+    with _lock:
+        _observe(_latency, route, elapsed)
+        for name, seconds in phases.items():
+            _observe(_phases, (route, name), seconds)
+        key = (route, request.method, str(response.status_code))
+        _requests[key] = _requests.get(key, 0) + 1
+    return response
+
+
+def _write_profile(profiler, route, elapsed):
+    slug = route.strip("/").replace("/", "_").replace("<", "").replace(">", "") or "index"
+    path = PROFILE_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}_{slug}_{int(elapsed * 1000)}ms.prof"
+    try:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+    except OSError as e:
+        print(f"⚠️ Could not write profile {path}: {e}")
+        return
+    with _lock:
+        _profiles["written"] += 1
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _histogram_lines(name, histograms, label_names):
+    lines = []
+    for key, histogram in sorted(histograms.items()):
+        labels = dict(zip(label_names, key if isinstance(key, tuple) else (key,)))
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+        lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram.count}")
+        lines.append(f"{name}_sum{_labels(**labels)} {histogram.total:.6f}")
+        lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+    return lines
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        lines = [
+            "# HELP robby_request_duration_seconds Request latency by route.",
+            "# TYPE robby_request_duration_seconds histogram",
+            *_histogram_lines("robby_request_duration_seconds", _latency, ("route",)),
+            "# HELP robby_request_phase_seconds Time spent per request phase by route.",
+            "# TYPE robby_request_phase_seconds histogram",
+            *_histogram_lines("robby_request_phase_seconds", _phases, ("route", "phase")),
+            "# HELP robby_requests_total Requests by route, method and status.",
+            "# TYPE robby_requests_total counter",
+        ]
+        for (route, method, status), count in sorted(_requests.items()):
+            lines.append(f"robby_requests_total{_labels(route=route, method=method, status=status)} {count}")
+        lines += [
+            "# HELP robby_cache_requests_total Cache lookups by cache and result.",
+            "# TYPE robby_cache_requests_total counter",
+        ]
+        for (cache, result), count in sorted(_cache.items()):
+            lines.append(f"robby_cache_requests_total{_labels(cache=cache, result=result)} {count}")
+        lines += [
+            "# HELP robby_profiles_written_total Sampled request profiles written to disk.",
+            "# TYPE robby_profiles_written_total counter",
+            f"robby_profiles_written_total {_profiles['written']}",
+        ]
+        gauges = sorted(_gauges.items())
+    for name, (help_text, fn) in gauges:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {fn()}"]
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view():
+    return Response(render(), mimetype="text/plain; version=0.0.4")
+
+
+def init_app(app):
+    """Install the request hooks and the /metrics endpoint on a Flask app."""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    # A request that never reached _after_request must not keep the profiler running.
+    app.teardown_request(lambda exc: _stop_profiler())
+    app.add_url_rule("/metrics", "metrics", metrics_view)
@@ -0,0 +1,67 @@
+import os
+import threading
+from collections import OrderedDict
+
+import metrics
+
+# LRU cache of rendered pages (the index page per sport and date). Keys are
+# (page, sport, date, game data version, picks version, lock bucket), so a page is only
+# reused while the events, the picks and the set of locked games are all unchanged;
+# stale entries are never hit again and are dropped as soon as their sport's data
+# version or the picks version moves on (refreshes and pick locks also clear the cache
+# outright in the process that made them). The cache holds at most
+# ROBBY_PAGE_CACHE_BYTES of rendered HTML (default 32 MB, 0 disables it), evicting the
+# least recently used pages first.
+
+MAX_BYTES = int(os.environ.get("ROBBY_PAGE_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # key -> rendered body (bytes)
+_state = {"bytes": 0}
+
+
+def enabled():
+    return MAX_BYTES > 0
+
+
+def get(key):
+    """Return the cached body for a key (and mark it recently used), or None."""
+    with _lock:
+        body = _entries.get(key)
+        if body is not None:
+            _entries.move_to_end(key)
+    metrics.cache_event("page_cache", body is not None)
+    return body
+
+
+def _drop(key):
+    _state["bytes"] -= len(_entries.pop(key))
+
+
+def put(key, body):
+    """Store a rendered body under a key (page, sport, date, data version, picks version, ...)."""
+    if len(body) > MAX_BYTES:
+        return
+    page, sport, _, data_version, picks_version = key[:5]
+    with _lock:
+        stale = [k for k in _entries
+                 if k[4] != picks_version or (k[:2] == (page, sport) and k[3] != data_version)]
+        for old_key in stale:
+            _drop(old_key)
+        if key in _entries:
+            _drop(key)
+        _entries[key] = body
+        _state["bytes"] += len(body)
+        while _state["bytes"] > MAX_BYTES:
+            _drop(next(iter(_entries)))
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _state["bytes"] = 0
+
+
+def stats():
+    with _lock:
+        return {"entries": len(_entries), "bytes": _state["bytes"], "max_bytes": MAX_BYTES}
@@ -0,0 +1,95 @@
+import threading
+from datetime import datetime, timezone
+
+# Rolling win/loss/tie aggregates over graded picks. Each graded pick contributes to one
+# daily, weekly, monthly and per-sport bucket; when a pick's grade changes only its old
+# contribution is removed and the new one added, so rollups never need a full rescan.
+
+PERIODS = {
+    "daily": "day",
+    "weekly": "week",
+    "monthly": "month",
+    "sport": "sport",
+}
+DECIDED_RESULTS = ("win", "loss", "tie")
+
+_lock = threading.Lock()
+_contributions = {}  # event_id -> (result, game_date, sport)
+_buckets = {period: {} for period in PERIODS}
+_state = {"version": 0, "last_modified": datetime.now(timezone.utc).replace(microsecond=0)}
+
+
+def _bucket_keys(game_date, sport):
+    iso_year, iso_week, _ = game_date.isocalendar()
+    return {
+        "daily": game_date.strftime("%Y-%m-%d"),
+        "weekly": f"{iso_year}-W{iso_week:02d}",
+        "monthly": game_date.strftime("%Y-%m"),
+        "sport": sport or "Unknown",
+    }
+
+
+def _apply(contribution, delta):
+    result, game_date, sport = contribution
+    field = {"win": "wins", "loss": "losses", "tie": "ties"}[result]
+    for period, key in _bucket_keys(game_date, sport).items():
+        counts = _buckets[period].setdefault(key, {"wins": 0, "losses": 0, "ties": 0, "total": 0})
+        counts[field] += delta
+        counts["total"] += delta
+        if counts["total"] == 0:
+            del _buckets[period][key]
+
+
+def record(event_id, result, game_date, sport):
+    """Record a pick's current grade; only decided picks with a game date are counted."""
+    new = (result, game_date, sport) if result in DECIDED_RESULTS and game_date else None
+    if _contributions.get(event_id) == new:
+        return
+    with _lock:
+        old = _contributions.get(event_id)
+        if old == new:
+            return
+        if old is not None:
+            _apply(old, -1)
+        if new is not None:
+            _apply(new, 1)
+            _contributions[event_id] = new
+        else:
+            _contributions.pop(event_id, None)
+        _state["version"] += 1
+        _state["last_modified"] = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def retain(event_ids):
+    """Drop the contributions of picks that no longer exist."""
+    stale = [event_id for event_id in _contributions if event_id not in event_ids]
+    for event_id in stale:
+        record(event_id, None, None, None)
+
+
+def version():
+    return _state["version"]
+
+
+def last_modified():
+    return _state["last_modified"]
+
+
+def rollup(period):
+    """Return the buckets of a period sorted by key, with a win percentage over decided picks."""
+    label = PERIODS[period]
+    with _lock:
+        items = sorted((key, dict(counts)) for key, counts in _buckets[period].items())
+    rows = []
+    for key, counts in items:
+        decided = counts["wins"] + counts["losses"]
+        win_pct = (counts["wins"] / decided * 100) if decided > 0 else 0
+        rows.append({
+            label: key,
+            "win_percentage": round(win_pct, 1),
+            "wins": counts["wins"],
+            "losses": counts["losses"],
+            "ties": counts["ties"],
+            "total": counts["total"],
+        })
+    return rows
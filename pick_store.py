@@ -0,0 +1,337 @@
+import argparse
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+import pytz
+
+import sqlite_store
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Pick storage: Robs_Picks.json is a compacted snapshot and every lock-in is appended
+# to a journal (one fsync'd JSON record per pick). load_picks() serves an in-memory
+# view of snapshot + journal that only reads the journal bytes added since last time.
+BASE_DIR = Path(__file__).resolve().parent
+PICKS_FOLDER = BASE_DIR / "Robs_Picks"
+SNAPSHOT_PATH = PICKS_FOLDER / "Robs_Picks.json"
+JOURNAL_PATH = PICKS_FOLDER / "Robs_Picks.journal.jsonl"
+LOCK_PATH = PICKS_FOLDER / "Robs_Picks.lock"
+
+# Fold the journal into the snapshot once it holds this many records.
+COMPACT_AFTER = 500
+
+# Picks lock this long after the game starts.
+LOCK_SECONDS = 20 * 60
+EASTERN = pytz.timezone("America/New_York")
+
+# Machine-readable fields stored with every pick next to the display strings
+# ("Value.game_date" = "Saturday, March 15, 2025", "Value.game_start_time" = "07:30 PM ET").
+# Picks locked before these existed are converted by `python pick_store.py --migrate`.
+GAME_DATE_FIELD = "Value.game_date_iso"    # "2025-03-15" (ET calendar date)
+START_FIELD = "Value.start_utc"            # "2025-03-15T23:30:00Z", or None if unknown
+LOCK_FIELD = "Value.lock_epoch"            # start + LOCK_SECONDS as Unix seconds, or None
+SPORT_FIELD = "Value.sport"
+
+_lock = threading.RLock()
+_lock_depth = 0
+_view = {"picks": {}, "snapshot_stamp": None, "journal_offset": 0, "journal_records": 0}
+_compacting = threading.Event()
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@contextmanager
+def _file_lock():
+    """Serialize writers across threads and processes (re-entrant within a thread)."""
+    global _lock_depth
+    with _lock:
+        if _lock_depth:
+            _lock_depth += 1
+            try:
+                yield
+            finally:
+                _lock_depth -= 1
+            return
+        PICKS_FOLDER.mkdir(parents=True, exist_ok=True)
+        with open(LOCK_PATH, "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            _lock_depth = 1
+            try:
+                yield
+            finally:
+                _lock_depth = 0
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def structured_fields(game_date, start=None, sport=None):
+    """The machine-readable fields of a pick on `game_date` (ET) for a game starting at `start`."""
+    fields = {GAME_DATE_FIELD: game_date.isoformat(), START_FIELD: None, LOCK_FIELD: None, SPORT_FIELD: sport}
+    if start is not None:
+        start_utc = start.astimezone(pytz.utc)
+        fields[START_FIELD] = start_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
+        fields[LOCK_FIELD] = int(start_utc.timestamp()) + LOCK_SECONDS
+    return fields
+
+
+def _parse_display_date(pick):
+    try:
+        return datetime.strptime(pick.get("Value.game_date", "").strip(), "%A, %B %d, %Y").date()
+    except ValueError:
+        return None
+
+
+def pick_game_date(pick):
+    """The ET game date of a pick, from the ISO field (or the display string of unmigrated picks)."""
+    iso = pick.get(GAME_DATE_FIELD)
+    if iso:
+        try:
+            return date.fromisoformat(iso)
+        except ValueError:
+            pass
+    return _parse_display_date(pick)
+
+
+def _display_start(pick, game_date):
+    """The start instant from a "07:30 PM ET" display time, or None (e.g. "N/A")."""
+    parts = pick.get("Value.game_start_time", "").split()
+    if game_date is None or len(parts) < 2:
+        return None
+    try:
+        clock = datetime.strptime(f"{parts[0]} {parts[1]}", "%I:%M %p").time()
+    except ValueError:
+        return None
+    return EASTERN.localize(datetime.combine(game_date, clock))
+
+
+def migrated_pick(pick, events):
+    """
+    Return a copy of a pick with the structured fields filled in, or None if it already has
+    them. `events` maps event id -> game_events.Event; the event's start and sport are
+    preferred over the pick's display strings.
+    """
+    if pick.get(GAME_DATE_FIELD):
+        return None
+    event = events.get(pick.get("EventID"))
+    game_date = _parse_display_date(pick)
+    if game_date is None and event is not None:
+        game_date = event.et_date
+    if game_date is None:
+        return None
+    start = event.start if event is not None and event.start is not None else _display_start(pick, game_date)
+    sport = pick.get(SPORT_FIELD) or (event.sport if event is not None else None)
+    migrated = dict(pick)
+    migrated.update(structured_fields(game_date, start, sport))
+    return migrated
+
+
+def _read_snapshot():
+    if not os.path.exists(SNAPSHOT_PATH):
+        return {}
+    try:
+        with open(SNAPSHOT_PATH, "r", encoding="utf-8") as f:
+            picks = json.load(f)
+    except Exception as e:
+        print(f"Error loading {SNAPSHOT_PATH}: {e}")
+        return {}
+    return picks if isinstance(picks, dict) else {}
+
+
+def _read_journal(offset):
+    """Return (new_offset, records) for the complete journal records after `offset`."""
+    try:
+        with open(JOURNAL_PATH, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return 0, []
+    records = []
+    # Only consume whole lines; a torn trailing record is picked up once it is complete.
+    end = data.rfind(b"\n") + 1
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            record["EventID"]
+        except Exception as e:
+            print(f"Skipping bad pick journal record: {e}")
+            continue
+        records.append(record)
+    return offset + end, records
+
+
+def _full_reload():
+    picks = _read_snapshot()
+    offset, records = _read_journal(0)
+    for record in records:
+        picks[record["EventID"]] = record
+    _view.update(picks=picks, snapshot_stamp=_stamp(SNAPSHOT_PATH),
+                 journal_offset=offset, journal_records=len(records))
+
+
+def _tail_journal():
+    offset, records = _read_journal(_view["journal_offset"])
+    _view["journal_offset"] = offset
+    if records:
+        # Copy-on-write so callers iterating an earlier view are never disturbed.
+        picks = dict(_view["picks"])
+        for record in records:
+            picks[record["EventID"]] = record
+        _view["picks"] = picks
+        _view["journal_records"] += len(records)
+
+
+def _sync_view():
+    """Bring the view up to date with changes made by this or another process."""
+    journal_stamp = _stamp(JOURNAL_PATH)
+    journal_size = journal_stamp[1] if journal_stamp else 0
+    if _stamp(SNAPSHOT_PATH) != _view["snapshot_stamp"] or journal_size < _view["journal_offset"]:
+        # A compaction happened (here or elsewhere); rebuild from the new snapshot.
+        with _file_lock():
+            _full_reload()
+    elif journal_size > _view["journal_offset"]:
+        _tail_journal()
+
+
+def load_picks():
+    """Return {event_id: pick} for every locked pick. The dict is shared and must not be mutated."""
+    if sqlite_store.enabled():
+        return sqlite_store.load_picks()
+    return load_journal_picks()
+
+
+def load_journal_picks():
+    """The journal-backed view of the picks, regardless of the configured backend."""
+    with _lock:
+        _sync_view()
+        return _view["picks"]
+
+
+def version():
+    """A hashable version of the picks; it changes whenever a pick is saved (by any process)."""
+    if sqlite_store.enabled():
+        return ("sqlite", sqlite_store.get_version("picks"))
+    with _lock:
+        _sync_view()
+        return (_view["snapshot_stamp"], _view["journal_offset"])
+
+
+def save_picks(records):
+    """Durably append pick records (dicts with an "EventID") to the journal in one write."""
+    records = list(records)
+    if not records:
+        return
+    if sqlite_store.enabled():
+        sqlite_store.save_picks(records)
+        return
+    payload = b"".join(
+        json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n" for record in records
+    )
+    with _file_lock():
+        _sync_view()
+        with open(JOURNAL_PATH, "ab") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        _tail_journal()
+        needs_compaction = _view["journal_records"] >= COMPACT_AFTER
+    if needs_compaction and not _compacting.is_set():
+        _compacting.set()
+        threading.Thread(target=_background_compact, daemon=True).start()
+
+
+def compact(updates=None):
+    """
+    Fold the journal into a new Robs_Picks.json snapshot and truncate the journal.
+    `updates` ({event_id: pick}) replace picks in the new snapshot.
+    """
+    with _file_lock():
+        _sync_view()
+        picks = dict(_view["picks"])
+        picks.update(updates or {})
+        tmp_path = SNAPSHOT_PATH.with_name(SNAPSHOT_PATH.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(picks, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, SNAPSHOT_PATH)
+        with open(JOURNAL_PATH, "wb") as f:
+            f.flush()
+            os.fsync(f.fileno())
+        _view.update(picks=picks, snapshot_stamp=_stamp(SNAPSHOT_PATH),
+                     journal_offset=0, journal_records=0)
+
+
+def _background_compact():
+    try:
+        compact()
+    except Exception as e:
+        print(f"Error compacting picks journal: {e}")
+    finally:
+        _compacting.clear()
+
+
+def migrate_picks(dry_run=False):
+    """
+    One-time conversion of existing picks to the structured fields. Journal-backed picks
+    are rewritten in a single compaction (SQLite picks in one transaction).
+    Returns the number of picks that were converted.
+    """
+    import game_store
+
+    events = {}
+    for sport in game_store.SPORT_FILES:
+        for event in game_store.get_games(sport):
+            events.setdefault(event.event_id, event)
+    picks = load_picks()
+    updates = {}
+    for event_id, pick in picks.items():
+        migrated = migrated_pick(pick, events)
+        if migrated is not None:
+            updates[event_id] = migrated
+    skipped = sum(1 for pick in picks.values() if pick_game_date(pick) is None)
+    if updates and not dry_run:
+        if sqlite_store.enabled():
+            sqlite_store.save_picks(updates.values())
+        else:
+            compact(updates)
+    print(f"✅ {'Would convert' if dry_run else 'Converted'} {len(updates)} of {len(picks)} picks"
+          + (f" ({skipped} without a readable game date left as they are)" if skipped else ""))
+    return len(updates)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the picks store.")
+    parser.add_argument("--migrate", action="store_true",
+                        help="Add the ISO date, UTC start, lock time and sport fields to existing picks.")
+    parser.add_argument("--dry-run", action="store_true", help="With --migrate: only report what would change.")
+    parser.add_argument("--compact", action="store_true", help="Fold the journal into Robs_Picks.json.")
+    args = parser.parse_args()
+    if args.migrate:
+        migrate_picks(dry_run=args.dry_run)
+    elif args.compact:
+        compact()
+    else:
+        parser.print_help()
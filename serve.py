@@ -0,0 +1,202 @@
+if __name__ == "__main__":
+    # Patch before anything else is imported: the app is preloaded in the master, so its
+    # locks, queues and threads must already be the cooperative gevent versions when the
+    # workers fork.
+    try:
+        from gevent import monkey
+        monkey.patch_all()
+    except ImportError:
+        pass
+
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # optional: only needed for the production server
+    BaseApplication = None
+
+try:
+    import gevent
+except ImportError:  # optional: only needed for the production server
+    gevent = None
+
+import dashboard
+import game_store
+import live_feed
+import live_stream
+import pick_store
+import update_data
+from update_data import app
+
+# Production server: the app under gunicorn with preforked gevent workers.
+#
+# The master loads and groups all game data, grades the picks and compiles the
+# templates once, then forks the workers, which share that memory copy-on-write
+# (gc.freeze() keeps the garbage collector from touching the shared pages). Each worker
+# serves up to ROBBY_WORKER_CONNECTIONS connections on greenlets, so an open /stream
+# connection costs a greenlet blocked on its queue, not a worker thread.
+#
+# The refresh scheduler and the live lane run in a separate updater process
+# (update_data.py, started and restarted by the master), never in the master itself.
+# The updater writes the data files and appends each change to the live feed
+# (live_feed.py); every worker follows the feed, applies live score updates to its own
+# store, re-reads the files that changed after a refresh and pushes the changed events
+# to its /stream subscribers.
+#
+#   python serve.py [--bind 0.0.0.0:5000] [--workers N] [--worker-connections N] [--incremental]
+#
+# Requires gunicorn and gevent (pip install gunicorn gevent) and a platform with fork();
+# on Windows use app.py or update_data.py --server.
+
+BASE_DIR = Path(__file__).resolve().parent
+BIND = os.environ.get("ROBBY_BIND", "0.0.0.0:5000")
+WORKERS = int(os.environ.get("ROBBY_WORKERS", "0") or 0) or (os.cpu_count() or 1)
+WORKER_CONNECTIONS = int(os.environ.get("ROBBY_WORKER_CONNECTIONS", "1000"))
+# Long-lived /stream responses would otherwise hold up a shutdown.
+GRACEFUL_TIMEOUT = 10
+# Wait this long before restarting an updater that exited.
+UPDATER_RESTART_SECONDS = 10
+
+_updater = {"command": None, "process": None, "pid": None, "stopping": False}
+
+
+def preload():
+    """Load everything the workers should share; runs in the master before forking."""
+    game_store.refresh_data()
+    pick_store.load_picks()
+    dashboard.grade_all_picks()
+    # Record the /stream baseline, so the first feed record only pushes real changes.
+    live_stream.publish_events([event for sport in game_store.SPORT_FILES for event in game_store.get_games(sport)])
+    for template in ("index.html", "dashboard.html"):
+        app.jinja_env.get_template(template)
+    gc.freeze()
+
+
+def updater_command(incremental=False, in_process=False, live=True):
+    command = [sys.executable, "-X", "utf8", str(BASE_DIR / "update_data.py")]
+    if incremental:
+        command.append("--incremental")
+    if in_process:
+        command.append("--in-process")
+    if not live:
+        command.append("--no-live")
+    return command
+
+
+def _supervising():
+    # Greenlets survive fork(), so the workers inherit this loop; only the master runs it.
+    return not _updater["stopping"] and os.getpid() == _updater["pid"]
+
+
+def _spawn_updater():
+    # Its own session, so a Ctrl+C meant for the server does not kill it mid-write;
+    # the master stops it on exit.
+    process = subprocess.Popen(_updater["command"], cwd=BASE_DIR, start_new_session=True)
+    _updater["process"] = process
+    print(f"🔄 Updater started with PID {process.pid}", flush=True)
+
+
+def _watch_updater():
+    """Restart the updater whenever it exits."""
+    while True:
+        code = _updater["process"].wait()
+        if not _supervising():
+            return
+        print(f"⚠️ Updater exited with code {code}; restarting in {UPDATER_RESTART_SECONDS}s")
+        time.sleep(UPDATER_RESTART_SECONDS)
+        if not _supervising():
+            return
+        _spawn_updater()
+
+
+def start_updater(command):
+    """Run the refresh jobs in their own process (gunicorn's when_ready hook)."""
+    _updater["command"] = command
+    _updater["pid"] = os.getpid()
+    _spawn_updater()
+    threading.Thread(target=_watch_updater, name="updater-watch", daemon=True).start()
+
+
+def stop_updater():
+    """Stop the updater process (gunicorn's on_exit hook)."""
+    _updater["stopping"] = True
+    process = _updater["process"]
+    if os.getpid() != _updater["pid"] or process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=GRACEFUL_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def _post_worker_init(worker):
+    # Each worker applies the updater's changes to its own store and /stream subscribers.
+    live_feed.follow(update_data.apply_published)
+
+
+if BaseApplication is not None:
+    class RobbyServer(BaseApplication):
+        def __init__(self, options, updater=None):
+            self.options = options
+            self.updater = updater
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+            self.cfg.set("post_worker_init", _post_worker_init)
+            if self.updater is not None:
+                self.cfg.set("when_ready", lambda server: start_updater(self.updater))
+                self.cfg.set("on_exit", lambda server: stop_updater())
+
+        def load(self):
+            return app
+
+
+def main(bind=BIND, workers=WORKERS, worker_connections=WORKER_CONNECTIONS, scheduler=True,
+         incremental=False, in_process=False, live=True):
+    if BaseApplication is None or gevent is None or not hasattr(os, "fork"):
+        print("❌ The production server needs gunicorn and gevent (pip install gunicorn gevent) "
+              "and fork(); use app.py or update_data.py --server instead.")
+        return 1
+    print("🔄 Loading game data before forking the workers...")
+    preload()
+    options = {
+        "bind": bind,
+        "workers": workers,
+        "worker_class": "gevent",
+        "worker_connections": worker_connections,
+        "preload_app": True,
+        "graceful_timeout": GRACEFUL_TIMEOUT,
+    }
+    updater = updater_command(incremental, in_process, live) if scheduler else None
+    RobbyServer(options, updater).run()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the app with preforked gunicorn workers.")
+    parser.add_argument("--bind", default=BIND, help=f"Address to listen on (default: {BIND}).")
+    parser.add_argument("--workers", type=int, default=WORKERS, help=f"Worker processes (default: {WORKERS}).")
+    parser.add_argument("--worker-connections", type=int, default=WORKER_CONNECTIONS,
+                        help=f"Concurrent connections per worker (default: {WORKER_CONNECTIONS}).")
+    parser.add_argument("--no-scheduler", action="store_true",
+                        help="Only serve; data is refreshed by a separate update_data.py process.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-fetch today, upcoming dates and dates with unfinished games.")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run the fetchers as imported modules instead of one subprocess per sport.")
+    parser.add_argument("--no-live", action="store_true",
+                        help="Disable the fast polling lane for games in progress.")
+    args = parser.parse_args()
+    raise SystemExit(main(bind=args.bind, workers=args.workers, worker_connections=args.worker_connections,
+                          scheduler=not args.no_scheduler, incremental=args.incremental,
+                          in_process=args.in_process, live=not args.no_live))
@@ -0,0 +1,233 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytz
+from dateutil.parser import isoparse
+
+# Optional SQLite storage backend (enable with ROBBY_STORAGE=sqlite). Events are indexed
+# by sport + ET date and by event id, picks by event id, so views can query one day or one
+# set of events instead of parsing whole JSON files.
+BASE_DIR = Path(__file__).resolve().parent
+DB_PATH = Path(os.environ.get("ROBBY_SQLITE_PATH", BASE_DIR / "robby_locks.db"))
+
+EASTERN = pytz.timezone("America/New_York")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    sport TEXT NOT NULL,
+    start_utc TEXT,
+    et_date TEXT,
+    name TEXT,
+    status_clock TEXT,
+    status_period TEXT,
+    status_state TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_sport_date ON events (sport, et_date);
+
+CREATE TABLE IF NOT EXISTS competitors (
+    event_id TEXT NOT NULL REFERENCES events (event_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    team_id TEXT,
+    team_name TEXT,
+    abbreviation TEXT,
+    score TEXT,
+    row_json TEXT NOT NULL,
+    PRIMARY KEY (event_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS picks (
+    event_id TEXT PRIMARY KEY,
+    winner TEXT,
+    game_date TEXT,
+    record_json TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_local = threading.local()
+_picks_cache = {"version": None, "picks": {}}
+
+
+def enabled():
+    return os.environ.get("ROBBY_STORAGE", "json").lower() == "sqlite"
+
+
+def connect():
+    """Return this thread's connection, creating the schema (in WAL mode) on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def get_version(key):
+    row = connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else 0
+
+
+def _bump_version(conn, key):
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, 1) "
+        "ON CONFLICT (key) DO UPDATE SET value = value + 1",
+        (key,),
+    )
+
+
+def _first(row, *fields, default=None):
+    for field in fields:
+        if field in row:
+            return row[field]
+    return default
+
+
+def _event_start(row):
+    start = isoparse(_first(row, "event.date", "comp.date"))
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=pytz.utc)
+    return start
+
+
+def upsert_rows(sport, rows):
+    """Insert or replace the events (and their competitor rows) of one sport's scrape."""
+    grouped = {}
+    for row in rows:
+        event_id = row.get("event.id")
+        if event_id:
+            grouped.setdefault(event_id, []).append(row)
+    conn = connect()
+    with conn:
+        for event_id, event_rows in grouped.items():
+            first = event_rows[0]
+            try:
+                start = _event_start(first)
+                start_utc = start.astimezone(pytz.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+                et_date = start.astimezone(EASTERN).date().isoformat()
+            except Exception as e:
+                print(f"Error parsing date for event {event_id}: {e}")
+                start_utc, et_date = None, None
+            period = _first(first, "status.period", "comp.status.period")
+            conn.execute(
+                "INSERT OR REPLACE INTO events (event_id, sport, start_utc, et_date, name, "
+                "status_clock, status_period, status_state) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    event_id, sport, start_utc, et_date,
+                    _first(first, "event.name", "event.shortName"),
+                    _first(first, "status.clock", "comp.status.displayClock"),
+                    None if period is None else str(period),
+                    _first(first, "status.state", "comp.status.state"),
+                ),
+            )
+            conn.execute("DELETE FROM competitors WHERE event_id = ?", (event_id,))
+            conn.executemany(
+                "INSERT INTO competitors (event_id, position, team_id, team_name, abbreviation, "
+                "score, row_json) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        event_id, position, row.get("team.id"),
+                        _first(row, "team.displayName", "team.name"),
+                        row.get("team.abbreviation"),
+                        _first(row, "comp.competitors.score", "competitors.score"),
+                        json.dumps(row),
+                    )
+                    for position, row in enumerate(event_rows)
+                ],
+            )
+        _bump_version(conn, f"games:{sport}")
+
+
+def _rows(query, params):
+    return [json.loads(row_json) for (row_json,) in connect().execute(query, params)]
+
+
+def rows_for_sport(sport):
+    """All flat rows of a sport, in the same shape as the Game_Dataframe JSON files."""
+    return _rows(
+        "SELECT c.row_json FROM competitors c JOIN events e ON e.event_id = c.event_id "
+        "WHERE e.sport = ? ORDER BY e.start_utc, e.event_id, c.position",
+        (sport,),
+    )
+
+
+def rows_for_date(sport, et_date):
+    """Flat rows of the events of a sport that start on an ET calendar date."""
+    return _rows(
+        "SELECT c.row_json FROM competitors c JOIN events e ON e.event_id = c.event_id "
+        "WHERE e.sport = ? AND e.et_date = ? ORDER BY e.start_utc, e.event_id, c.position",
+        (sport, et_date.isoformat()),
+    )
+
+
+def _pick_game_date(record):
+    if record.get("Value.game_date_iso"):
+        return record["Value.game_date_iso"]
+    try:
+        return datetime.strptime(record.get("Value.game_date", ""), "%A, %B %d, %Y").date().isoformat()
+    except ValueError:
+        return None
+
+
+def save_picks(records):
+    """Insert or replace pick records (dicts with an "EventID") in one transaction."""
+    conn = connect()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO picks (event_id, winner, game_date, record_json) VALUES (?, ?, ?, ?)",
+            [
+                (record["EventID"], record.get("Value.winner"), _pick_game_date(record), json.dumps(record))
+                for record in records
+            ],
+        )
+        _bump_version(conn, "picks")
+
+
+def load_picks():
+    """Return {event_id: pick}, re-querying only when the picks version changed."""
+    version = get_version("picks")
+    if _picks_cache["version"] != version:
+        picks = {}
+        for (record_json,) in connect().execute("SELECT record_json FROM picks"):
+            record = json.loads(record_json)
+            picks[record["EventID"]] = record
+        _picks_cache.update(version=version, picks=picks)
+    return _picks_cache["picks"]
+
+
+def import_json():
+    """Load the existing Game_Dataframe files and picks into the database."""
+    import game_store
+    import pick_store
+    from Data_Queries import shards
+
+    for sport, file_path in game_store.SPORT_FILES.items():
+        rows = shards.read_rows(file_path) or []
+        upsert_rows(sport, rows)
+        print(f"✅ Imported {len(rows)} {sport} rows")
+    picks = pick_store.load_journal_picks()
+    save_picks(picks.values())
+    print(f"✅ Imported {len(picks)} picks into {DB_PATH}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the optional SQLite storage backend.")
+    parser.add_argument("--import-json", action="store_true",
+                        help="Import the Game_Dataframe JSON files and Robs_Picks into the database.")
+    args = parser.parse_args()
+    if args.import_json:
+        import_json()
+    else:
+        parser.print_help()
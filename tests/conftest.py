@@ -0,0 +1,109 @@
+import json
+import shutil
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Make the project modules importable from the tests.
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+class StubServer:
+    """
+    A local HTTP server standing in for the ESPN scoreboard. `responses` maps a path to
+    a list of (status, body, headers) answers served in turn (the last one repeats).
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.requests = []  # (path, request headers)
+        self.delay = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests.append((self.path, dict(self.headers)))
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                    answers = stub.responses.get(self.path) or [(404, {}, {})]
+                    status, body, headers = answers.pop(0) if len(answers) > 1 else answers[0]
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    payload = json.dumps(body).encode("utf-8") if status != 304 else b""
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def paths(self):
+        return [path for path, _ in self.requests]
+
+
+@pytest.fixture
+def stub_server():
+    stub = StubServer()
+    thread = threading.Thread(target=stub.server.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+@pytest.fixture
+def picks_dir(monkeypatch, tmp_path):
+    """Point pick_store at a scratch copy of Robs_Picks."""
+    import pick_store
+    folder = tmp_path / "Robs_Picks"
+    folder.mkdir()
+    shutil.copy(ROOT / "Robs_Picks" / "Robs_Picks.json", folder)
+    monkeypatch.setenv("ROBBY_STORAGE", "json")
+    monkeypatch.setattr(pick_store, "PICKS_FOLDER", folder)
+    monkeypatch.setattr(pick_store, "SNAPSHOT_PATH", folder / "Robs_Picks.json")
+    monkeypatch.setattr(pick_store, "JOURNAL_PATH", folder / "Robs_Picks.journal.jsonl")
+    monkeypatch.setattr(pick_store, "LOCK_PATH", folder / "Robs_Picks.lock")
+    monkeypatch.setattr(pick_store, "_view", {"picks": {}, "snapshot_stamp": None,
+                                              "journal_offset": 0, "journal_records": 0})
+    return folder
+
+
+@pytest.fixture
+def client(picks_dir):
+    import app
+    app.app.config["TESTING"] = True
+    return app.app.test_client()
+
+
+@pytest.fixture
+def fresh_store(monkeypatch):
+    """Give game_store empty caches for the test; the module's caches are restored afterwards."""
+    import game_store
+    import page_cache
+    for name in ("_entries", "_manifests", "_shards", "_live_updates"):
+        monkeypatch.setattr(game_store, name, {})
+    monkeypatch.setattr(game_store, "SPORT_FILES", dict(game_store.SPORT_FILES))
+    page_cache.clear()
+    yield game_store
+    page_cache.clear()
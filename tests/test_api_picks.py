@@ -0,0 +1,79 @@
+from datetime import date, datetime
+
+import pytest
+
+import app
+import game_store
+import pick_store
+
+GAME_DATE = date(2025, 3, 15)
+
+
+class MiddayDatetime(datetime):
+    """datetime whose now() is noon on GAME_DATE, before any of that day's games lock."""
+
+    @classmethod
+    def now(cls, tz=None):
+        noon = datetime(2025, 3, 15, 12, 0)
+        return tz.localize(noon) if tz is not None else noon
+
+
+@pytest.fixture
+def games(monkeypatch):
+    monkeypatch.setattr(app, "datetime", MiddayDatetime)
+    return game_store.get_games_for_date("NBA", GAME_DATE)
+
+
+def pick(game, team=0, **overrides):
+    item = {"sport": "NBA", "game_date": GAME_DATE.isoformat(), "event_id": game.event_id,
+            "winner": game.competitors[team].name}
+    item.update(overrides)
+    return item
+
+
+def test_batch_saves_valid_picks_with_one_write(client, games, picks_dir):
+    response = client.post("/api/picks", json={"picks": [pick(games[0]), pick(games[1], team=1)]})
+    assert response.status_code == 200
+    assert response.get_json()["saved"] == 2
+    journal = (picks_dir / "Robs_Picks.journal.jsonl").read_text()
+    assert journal.count("\n") == 2
+    assert pick_store.load_picks()[games[1].event_id]["Value.winner"] == games[1].competitors[1].name
+
+
+@pytest.mark.parametrize("field, value", [
+    ("sport", ["NBA"]),
+    ("sport", {"name": "NBA"}),
+    ("event_id", ["401"]),
+    ("event_id", 401),
+    ("winner", ["Boston Celtics"]),
+    ("game_date", 20250315),
+])
+def test_non_string_fields_are_rejected_not_500(client, games, field, value):
+    bad = pick(games[0], **{field: value})
+    response = client.post("/api/picks", json={"picks": [bad, pick(games[1])]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["saved"] == 1 and body["rejected"] == 1
+    assert body["results"][0]["status"] == "rejected"
+    assert body["results"][0]["error"] == f"{field} must be a non-empty string"
+    assert body["results"][1] == {"index": 1, "event_id": games[1].event_id, "status": "saved"}
+
+
+def test_rejections_are_reported_per_pick(client, games):
+    items = [pick(games[0]), pick(games[0]), pick(games[1], winner="Nobody"), "junk",
+             pick(games[2], sport="XFL"), pick(games[2], game_date="15/03/2025")]
+    body = client.post("/api/picks", json={"picks": items}).get_json()
+    assert [result["status"] for result in body["results"]] == ["saved"] + ["rejected"] * 5
+    assert [result.get("error") for result in body["results"][1:]] == [
+        "duplicate event in this batch",
+        f"winner must be one of {[c.name for c in games[1].competitors]}",
+        "pick must be an object",
+        "unknown sport: XFL",
+        "game_date must be YYYY-MM-DD",
+    ]
+
+
+def test_bad_bodies(client, monkeypatch):
+    assert client.post("/api/picks", data="x").status_code == 400
+    monkeypatch.setattr(app, "MAX_BATCH_PICKS", 2)
+    assert client.post("/api/picks", json={"picks": [{}] * 3}).status_code == 413
@@ -0,0 +1,42 @@
+from datetime import date
+
+import dashboard
+import pick_store
+
+
+def test_unchanged_stats_revalidate_without_grading(client, monkeypatch):
+    first = client.get("/api/daily_stats")
+    assert first.status_code == 200 and first.headers["ETag"]
+
+    def fail():
+        raise AssertionError("a 304 must not grade the picks")
+
+    monkeypatch.setattr(dashboard, "grade_all_picks", fail)
+    again = client.get("/api/daily_stats", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+
+def test_saved_pick_changes_the_etag(client):
+    first = client.get("/api/weekly_stats")
+    pick_store.save_picks([{"EventID": "test-1", "Value.winner": "Nobody",
+                            "Value.game_date": "Saturday, March 15, 2025"}])
+    again = client.get("/api/weekly_stats", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 200
+    assert again.headers["ETag"] != first.headers["ETag"]
+
+
+def test_periods_have_distinct_etags(client):
+    daily = client.get("/api/daily_stats").headers["ETag"]
+    monthly = client.get("/api/monthly_stats").headers["ETag"]
+    assert daily != monthly
+
+
+def test_new_day_changes_the_etag(client, monkeypatch):
+    # Tied unfinished games turn from pending into ties once their date has passed.
+    monkeypatch.setattr(dashboard, "today", lambda: date(2025, 3, 15))
+    first = client.get("/api/daily_stats")
+    monkeypatch.setattr(dashboard, "today", lambda: date(2025, 3, 16))
+    again = client.get("/api/daily_stats", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 200
+    assert again.headers["ETag"] != first.headers["ETag"]
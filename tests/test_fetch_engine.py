@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from Data_Queries import fetch_engine, telemetry
+
+
+@pytest.fixture(autouse=True)
+def fast_engine(monkeypatch, tmp_path):
+    monkeypatch.setattr(fetch_engine, "BACKOFF_SECONDS", 0.01)
+    monkeypatch.setattr(fetch_engine, "_host_slots", {})
+    monkeypatch.setattr(telemetry, "LOG_PATH", tmp_path / "fetch_telemetry.jsonl")
+    monkeypatch.setenv("ROBBY_HTTP_CACHE", "off")
+
+
+def parse_events(data, date_str):
+    return [{"date": date_str, "id": event["id"]} for event in data["events"]]
+
+
+def test_retries_retryable_status_then_succeeds(stub_server):
+    stub_server.responses["/day"] = [(503, {}, {}), (503, {}, {}), (200, {"events": [{"id": "1"}]}, {})]
+    info = {}
+    response = fetch_engine._get(stub_server.url + "/day", info=info)
+    assert response is not None and response.json() == {"events": [{"id": "1"}]}
+    assert info["attempts"] == 3 and info["status"] == 200
+    assert stub_server.paths() == ["/day"] * 3
+
+
+def test_gives_up_after_max_retries(stub_server):
+    stub_server.responses["/down"] = [(503, {}, {})]
+    info = {}
+    assert fetch_engine._get(stub_server.url + "/down", retries=2, info=info) is None
+    assert info["attempts"] == 3 and info["status"] == 503 and "error" in info
+    assert len(stub_server.requests) == 3
+
+
+def test_does_not_retry_client_errors(stub_server):
+    stub_server.responses["/missing"] = [(404, {}, {})]
+    assert fetch_engine.fetch_json(stub_server.url + "/missing") is None
+    assert len(stub_server.requests) == 1
+
+
+def test_per_host_limit_caps_concurrency(stub_server, monkeypatch):
+    monkeypatch.setattr(fetch_engine, "PER_HOST_LIMIT", 2)
+    stub_server.delay = 0.05
+    for i in range(8):
+        stub_server.responses[f"/d{i}"] = [(200, {"events": []}, {})]
+    threads = [threading.Thread(target=fetch_engine.fetch_json, args=(f"{stub_server.url}/d{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(stub_server.requests) == 8
+    assert stub_server.max_active == 2
+
+
+def test_fetch_all_rows_keeps_input_order(stub_server):
+    dates = ["20250313", "20250314", "20250315", "20250316"]
+    for date_str in dates:
+        stub_server.responses[f"/{date_str}"] = [(200, {"events": [{"id": date_str}]}, {})]
+    stub_server.responses["/20250315"] = [(500, {}, {}), (200, {"events": [{"id": "20250315"}]}, {})]
+    stub_server.responses["/20250316"] = [(404, {}, {})]
+    results = fetch_engine.fetch_all_rows(dates, lambda d: f"{stub_server.url}/{d}", parse_events, sport="NBA")
+    assert results == [
+        [{"date": "20250313", "id": "20250313"}],
+        [{"date": "20250314", "id": "20250314"}],
+        [{"date": "20250315", "id": "20250315"}],
+        None,
+    ]
+    run = telemetry.read_records()[-1]
+    assert run["sport"] == "NBA" and run["requests"] == 4 and run["failed"] == 1
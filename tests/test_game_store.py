@@ -0,0 +1,106 @@
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+import live_feed
+import live_stream
+import sqlite_store
+import update_data
+from Data_Queries import fetch_engine, nba_games, shards, telemetry
+
+TODAY = date(2025, 7, 15)
+
+
+def day_rows(day, score="100"):
+    """The two competitor rows of one NBA game on an ET date (7:30 PM ET)."""
+    return [{"event.id": f"g{day:%Y%m%d}", "event.date": f"{day:%Y-%m-%d}T23:30Z", "event.name": "AWY @ HOM",
+             "team.id": team, "team.name": team, "team.abbreviation": team, "competitors.score": score,
+             "status.clock": "0.0", "status.period": 4, "status.state": "post"}
+            for team in ("HOM", "AWY")]
+
+
+def fetch(first, last, score="100"):
+    """The rows and YYYYMMDD dates of a fetch covering first..last."""
+    days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    return [row for day in days for row in day_rows(day, score)], [f"{day:%Y%m%d}" for day in days]
+
+
+@pytest.fixture
+def nba_path(fresh_store, tmp_path):
+    path = tmp_path / "nba_games.json"
+    fresh_store.SPORT_FILES["NBA"] = path
+    return path
+
+
+def test_refresh_after_a_partial_month_write_keeps_the_other_days(fresh_store, nba_path):
+    rows, dates = fetch(date(2025, 3, 13), date(2025, 4, 5))
+    shards.write_rows(nba_path, rows, dates, today=TODAY)
+    fresh_store.refresh_data(["NBA"])
+    april = fresh_store._shards[("NBA", "2025-04")]
+    assert len(fresh_store.get_games_for_date("NBA", date(2025, 3, 16))) == 1
+
+    # One day re-fetched (and one that failed, so it is not passed): the rest of March stays on disk.
+    rows, dates = fetch(date(2025, 3, 15), date(2025, 3, 15), score="111")
+    shards.write_rows(nba_path, rows, dates, today=TODAY)
+    fresh_store.refresh_data(["NBA"])
+
+    assert len(fresh_store.get_games("NBA")) == 24
+    assert len(fresh_store.get_games_for_date("NBA", date(2025, 3, 16))) == 1
+    (game,) = fresh_store.get_games_for_date("NBA", date(2025, 3, 15))
+    assert [c.points for c in game.competitors] == [111, 111]
+    # The April shard's hash did not change, so it was not re-parsed.
+    assert fresh_store._shards[("NBA", "2025-04")] is april
+
+
+@pytest.fixture
+def sqlite_db(monkeypatch, tmp_path):
+    monkeypatch.setenv("ROBBY_STORAGE", "sqlite")
+    monkeypatch.setattr(sqlite_store, "DB_PATH", tmp_path / "robby.db")
+    monkeypatch.setattr(sqlite_store, "_local", threading.local())
+    yield
+    conn = getattr(sqlite_store._local, "conn", None)
+    if conn is not None:
+        conn.close()
+
+
+def scoreboard(day, score):
+    """An ESPN NBA scoreboard payload with the game of day_rows()."""
+    competitors = [{"team": {"id": team, "displayName": team, "abbreviation": team}, "score": score}
+                   for team in ("HOM", "AWY")]
+    status = {"displayClock": "0.0", "period": 4, "type": {"state": "post"}}
+    return {"events": [{"id": f"g{day:%Y%m%d}", "date": f"{day:%Y-%m-%d}T23:30Z", "shortName": "AWY @ HOM",
+                        "competitions": [{"status": status, "competitors": competitors}]}]}
+
+
+@pytest.mark.parametrize("storage", ["json", "sqlite"])
+def test_in_process_refresh_keeps_the_days_it_did_not_fetch(storage, request, fresh_store, nba_path, picks_dir,
+                                                            stub_server, monkeypatch, tmp_path):
+    rows, dates = fetch(date(2025, 3, 13), date(2025, 3, 20))
+    shards.write_rows(nba_path, rows, dates, today=TODAY)
+    if storage == "sqlite":
+        request.getfixturevalue("sqlite_db")
+        sqlite_store.upsert_rows("NBA", rows)
+    fresh_store.refresh_data(["NBA"])
+    monkeypatch.setenv("ROBBY_HTTP_CACHE", "off")
+    monkeypatch.setattr(fetch_engine, "_host_slots", {})
+    monkeypatch.setattr(fetch_engine, "BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(telemetry, "LOG_PATH", tmp_path / "telemetry.jsonl")
+    monkeypatch.setattr(live_feed, "FEED_PATH", tmp_path / "live_feed.jsonl")
+    monkeypatch.setattr(live_stream, "_last_seen", {})
+    monkeypatch.setattr(nba_games, "ESPN_URL", stub_server.url + "/nba")
+    monkeypatch.setattr(nba_games, "JSON_FILE_PATH", nba_path)
+    monkeypatch.setattr(nba_games, "date_list", ["20250315", "20250316"])
+    monkeypatch.setattr(update_data, "IN_PROCESS_FETCHERS",
+                        {"nba_games.py": update_data.IN_PROCESS_FETCHERS["nba_games.py"]})
+    stub_server.responses["/nba?dates=20250315"] = [(200, scoreboard(date(2025, 3, 15), "111"), {})]
+    stub_server.responses["/nba?dates=20250316"] = [(503, {}, {})]
+
+    (result,) = update_data.update_all_in_process()
+
+    assert result["saved"] and result["failed_dates"] == ["20250316"]
+    assert len(fresh_store.get_games("NBA")) == 8
+    for day in range(13, 21):
+        assert len(fresh_store.get_games_for_date("NBA", date(2025, 3, day))) == 1
+    (game,) = fresh_store.get_games_for_date("NBA", date(2025, 3, 15))
+    assert [c.points for c in game.competitors] == [111, 111]
@@ -0,0 +1,73 @@
+import pytest
+
+from Data_Queries import fetch_engine, http_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("ROBBY_HTTP_CACHE", "on")
+    monkeypatch.setattr(http_cache, "CACHE_DIR", tmp_path / "http_cache")
+    monkeypatch.setattr(http_cache, "_entries", {})
+    monkeypatch.setattr(fetch_engine, "_host_slots", {})
+    return tmp_path / "http_cache"
+
+
+def counting_parser():
+    """A scoreboard parse function that counts its calls in parse.calls."""
+    def parse(data, date_str):
+        parse.calls += 1
+        return [{"date": date_str, "id": event["id"]} for event in data["events"]]
+    parse.calls = 0
+    return parse
+
+
+def test_not_modified_replays_cached_rows(stub_server, cache_dir):
+    url = stub_server.url + "/20250313"
+    body = {"events": [{"id": "401"}]}
+    stub_server.responses["/20250313"] = [(200, body, {"ETag": '"v1"'}), (304, {}, {"ETag": '"v1"'})]
+    parse = counting_parser()
+
+    first = {}
+    rows = fetch_engine.fetch_rows(url, parse, "20250313", sample=first)
+    assert rows == [{"date": "20250313", "id": "401"}]
+    assert first["cache"] == "miss" and parse.calls == 1
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    second = {}
+    assert fetch_engine.fetch_rows(url, parse, "20250313", sample=second) == rows
+    assert second["cache"] == "not_modified" and second["status"] == 304
+    assert parse.calls == 1
+    assert stub_server.requests[1][1].get("If-None-Match") == '"v1"'
+
+
+def test_cache_survives_a_restart(stub_server, monkeypatch):
+    url = stub_server.url + "/20250314"
+    stub_server.responses["/20250314"] = [(200, {"events": [{"id": "402"}]}, {"ETag": '"v2"'}), (304, {}, {})]
+    parse = counting_parser()
+    rows = fetch_engine.fetch_rows(url, parse, "20250314")
+    monkeypatch.setattr(http_cache, "_entries", {})  # a new process reads the entry from disk
+    assert fetch_engine.fetch_rows(url, parse, "20250314") == rows
+    assert parse.calls == 1
+
+
+def test_unchanged_body_without_validators_skips_parse(stub_server):
+    url = stub_server.url + "/20250315"
+    stub_server.responses["/20250315"] = [(200, {"events": [{"id": "403"}]}, {})]
+    parse = counting_parser()
+    rows = fetch_engine.fetch_rows(url, parse, "20250315")
+    sample = {}
+    assert fetch_engine.fetch_rows(url, parse, "20250315", sample=sample) == rows
+    assert sample["cache"] == "unchanged" and parse.calls == 1
+    assert "If-None-Match" not in stub_server.requests[1][1]
+
+
+def test_changed_body_is_parsed_again(stub_server):
+    url = stub_server.url + "/20250316"
+    stub_server.responses["/20250316"] = [
+        (200, {"events": [{"id": "404"}]}, {"ETag": '"a"'}),
+        (200, {"events": [{"id": "404"}, {"id": "405"}]}, {"ETag": '"b"'}),
+    ]
+    parse = counting_parser()
+    fetch_engine.fetch_rows(url, parse, "20250316")
+    rows = fetch_engine.fetch_rows(url, parse, "20250316")
+    assert [row["id"] for row in rows] == ["404", "405"] and parse.calls == 2
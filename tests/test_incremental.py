@@ -0,0 +1,45 @@
+import pytest
+
+from Data_Queries import fetch_engine, incremental, shards, telemetry
+
+
+@pytest.fixture(autouse=True)
+def quiet_fetch(monkeypatch, tmp_path):
+    monkeypatch.setenv("ROBBY_HTTP_CACHE", "off")
+    monkeypatch.setenv("ROBBY_STORAGE", "json")
+    monkeypatch.setattr(fetch_engine, "_host_slots", {})
+    monkeypatch.setattr(fetch_engine, "BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(telemetry, "LOG_PATH", tmp_path / "telemetry.jsonl")
+
+
+def parse(data, date_str):
+    return [{"event.id": event["id"], "event.date": f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}T23:30Z",
+             "team.name": team, "status.state": event.get("state", "post")}
+            for event in data["events"] for team in event["teams"]]
+
+
+def drop_tbd(rows):
+    return [row for row in rows if row["team.name"] != "TBD"]
+
+
+def test_fetch_and_store_writes_shards_and_only_refetches_what_can_change(stub_server, tmp_path):
+    path = tmp_path / "nba_games.json"
+    url = lambda date_str: f"{stub_server.url}/{date_str}"
+    stub_server.responses["/20250315"] = [(200, {"events": [{"id": "1", "teams": ["A", "B"], "state": "in"},
+                                                            {"id": "2", "teams": ["TBD"]}]}, {})]
+    stub_server.responses["/20250316"] = [(503, {}, {})]
+
+    result = incremental.fetch_and_store("NBA", ["20250315", "20250316"], url, parse, path, transform=drop_tbd)
+
+    assert result["saved"] and result["failed_dates"] == ["20250316"]
+    assert [row["event.id"] for row in shards.read_rows(path)] == ["1", "1"]
+
+    stub_server.responses["/20250316"] = [(200, {"events": [{"id": "3", "teams": ["C", "D"]}]}, {})]
+    result = incremental.fetch_and_store("NBA", ["20250315", "20250316"], url, parse, path,
+                                         incremental_mode=True, transform=drop_tbd)
+
+    assert result["saved"] and result["failed_dates"] == []
+    assert sorted({row["event.id"] for row in shards.read_rows(path)}) == ["1", "3"]
+    assert sorted(incremental.load_state(path)) == ["20250315", "20250316"]
+    # The first full fetch wrote no fetch state and game 1 is unfinished, so both dates were fetched.
+    assert stub_server.paths().count("/20250315") == 2
@@ -0,0 +1,94 @@
+import json
+import queue
+import time
+from datetime import date
+
+import pytest
+
+import live_feed
+import live_stream
+import update_data
+
+GAME_DATE = date(2025, 3, 15)
+
+
+@pytest.fixture
+def feed_path(monkeypatch, tmp_path):
+    path = tmp_path / "live_feed.jsonl"
+    monkeypatch.setattr(live_feed, "FEED_PATH", path)
+    return path
+
+
+def collect(records, count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while len(records) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return records
+
+
+def test_follow_delivers_new_records_across_rotation(feed_path, monkeypatch):
+    live_feed.append({"type": "refresh", "n": 0})  # history: not delivered
+    records = []
+    live_feed.follow(records.append, poll_seconds=0.01)
+    time.sleep(0.05)
+    monkeypatch.setattr(live_feed, "MAX_FEED_BYTES", 150)  # rotates once, at record 7
+    for n in range(1, 11):
+        live_feed.append({"type": "refresh", "n": n})
+    assert [record["n"] for record in collect(records, 10)] == list(range(1, 11))
+    assert feed_path.with_name(feed_path.name + ".1").exists()
+
+
+def test_follow_waits_for_complete_lines(feed_path):
+    records = []
+    live_feed.follow(records.append, poll_seconds=0.01)
+    time.sleep(0.05)
+    with open(feed_path, "ab") as f:
+        f.write(b'{"type": "refr')
+        f.flush()
+        time.sleep(0.1)
+        assert records == []
+        f.write(b'esh"}\n')
+    assert collect(records, 1) == [{"type": "refresh"}]
+
+
+@pytest.fixture
+def subscriber(monkeypatch, fresh_store):
+    """A /stream subscriber to the NBA games on GAME_DATE, with the current events as baseline."""
+    monkeypatch.setattr(live_stream, "_last_seen", {})
+    monkeypatch.setattr(live_stream, "_subscribers", set())
+    events = [event for sport in fresh_store.SPORT_FILES for event in fresh_store.get_games(sport)]
+    live_stream.publish_events(events)
+    stream = live_stream.subscribe(["NBA"], GAME_DATE.isoformat())
+    assert next(stream).startswith("id: 0")
+    (sub,) = live_stream._subscribers
+    yield sub
+    stream.close()
+
+
+def test_live_record_updates_the_store_and_stream(subscriber, fresh_store):
+    game = fresh_store.get_games_for_date("NBA", GAME_DATE)[0]
+    rows = [dict(row, **{"competitors.score": score, "status.state": "in"})
+            for row, score in zip(game_events_rows(game), ("77", "88"))]
+
+    update_data.apply_published({"type": "live", "rows": {"NBA": rows}})
+
+    updated = {event.event_id: event for event in fresh_store.get_games_for_date("NBA", GAME_DATE)}[game.event_id]
+    assert [c.points for c in updated.competitors] == [77, 88]
+    message = subscriber.queue.get(timeout=5)
+    payload = json.loads(message.split("data: ", 1)[1])
+    assert payload["event_id"] == game.event_id and payload["state"] == "in"
+    assert [c["score"] for c in payload["competitors"]] == [77, 88]
+
+
+def test_unchanged_refresh_pushes_nothing(subscriber):
+    update_data.apply_published({"type": "refresh"})
+    with pytest.raises(queue.Empty):
+        subscriber.queue.get(timeout=0.2)
+
+
+def game_events_rows(event):
+    """Feed rows for an event, as the live lane's parse functions produce them."""
+    return [{"event.id": event.event_id, "event.date": event.date, "event.name": event.name,
+             "team.id": c.team_id, "team.name": c.name, "team.abbreviation": c.abbreviation,
+             "competitors.score": c.score, "status.clock": event.clock, "status.period": event.period}
+            for c in event.competitors]
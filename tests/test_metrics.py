@@ -0,0 +1,43 @@
+import pytest
+
+import live_stream
+import metrics
+
+
+@pytest.fixture
+def profile_every_request(monkeypatch, tmp_path):
+    monkeypatch.setattr(metrics, "PROFILE_EVERY", 1)
+    monkeypatch.setattr(metrics, "PROFILE_DIR", tmp_path / "profiles")
+    return tmp_path / "profiles"
+
+
+def test_sampled_request_writes_a_profile(client, profile_every_request):
+    assert client.get("/api/daily_stats").status_code == 200
+    assert len(list(profile_every_request.glob("*.prof"))) == 1
+    assert not metrics._profile_lock.locked()
+
+
+def test_sample_is_skipped_while_another_request_is_profiled(client, profile_every_request):
+    with metrics._profile_lock:
+        assert client.get("/api/daily_stats").status_code == 200
+    assert not profile_every_request.exists()
+
+
+def test_sample_is_skipped_when_another_profiler_is_active(client, profile_every_request, monkeypatch):
+    class ActiveProfiler:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(metrics.cProfile, "Profile", ActiveProfiler)
+    assert client.get("/api/daily_stats").status_code == 200
+    assert not profile_every_request.exists()
+    assert not metrics._profile_lock.locked()
+
+
+def test_open_streams_are_reported_as_a_gauge(client, monkeypatch):
+    monkeypatch.setattr(live_stream, "_subscribers", set())
+    stream = live_stream.subscribe(["NBA"])
+    next(stream)
+    assert "robby_sse_subscribers 1\n" in client.get("/metrics").get_data(as_text=True)
+    stream.close()
+    assert "robby_sse_subscribers 0\n" in client.get("/metrics").get_data(as_text=True)
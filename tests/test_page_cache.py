@@ -0,0 +1,68 @@
+import shutil
+from datetime import date
+
+import pytest
+
+import app
+import game_events
+from Data_Queries import shards
+
+GAME_DATE = date(2025, 3, 15)
+
+
+@pytest.fixture(params=["legacy", "shards"])
+def store(request, fresh_store, tmp_path):
+    if request.param == "shards":
+        path = tmp_path / "nba_games.json"
+        shutil.copy(fresh_store.SPORT_FILES["NBA"], path)
+        shards.migrate(path)
+        path.unlink()
+        fresh_store.SPORT_FILES["NBA"] = path
+    return fresh_store
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """The `games` of every index page actually rendered (cache hits don't render)."""
+    rendered = []
+    render_template = app.render_template
+
+    def recording_render(template, **context):
+        rendered.append(context["games"])
+        return render_template(template, **context)
+
+    monkeypatch.setattr(app, "render_template", recording_render)
+    return rendered
+
+
+def with_score(event, scores):
+    competitors = [c._replace(score=str(score)) for c, score in zip(event.competitors, scores)]
+    return game_events.Event(event.sport, event.event_id, event.name, event.date, event.start,
+                             "5:00", 3, "in", competitors)
+
+
+def test_live_update_makes_the_cached_page_stale(client, store, renders):
+    url = f"/?sport=NBA&game_date={GAME_DATE.isoformat()}"
+    first = client.get(url).get_data()
+    assert client.get(url).get_data() == first
+    assert len(renders) == 1  # the second GET was served from the page cache
+
+    game = store.get_games_for_date("NBA", GAME_DATE)[0]
+    changed = store.apply_events("NBA", [with_score(game, (101, 99))])
+    assert [event.event_id for event in changed] == [game.event_id]
+
+    client.get(url)
+    assert len(renders) == 2
+    updated = {event.event_id: event for event in renders[-1]}[game.event_id]
+    assert [c.points for c in updated.competitors] == [101, 99]
+    client.get(url)
+    assert len(renders) == 2
+
+
+def test_unchanged_live_update_keeps_the_cached_page(client, store, renders):
+    url = f"/?sport=NBA&game_date={GAME_DATE.isoformat()}"
+    client.get(url)
+    game = store.get_games_for_date("NBA", GAME_DATE)[0]
+    assert store.apply_events("NBA", [game]) == []
+    client.get(url)
+    assert len(renders) == 1
@@ -0,0 +1,136 @@
+import hashlib
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from Data_Queries import atomic_json, shards, snapshot
+
+TODAY = date(2025, 7, 15)
+
+
+def day_rows(day, score="100", state="post"):
+    """The two competitor rows of one game on an ET date (7:30 PM ET)."""
+    event_id = f"g{day:%Y%m%d}"
+    return [{"event.id": event_id, "event.date": f"{day:%Y-%m-%d}T23:30Z", "team.name": team,
+             "competitors.score": score, "status.state": state} for team in ("Home", "Away")]
+
+
+def fetch(first, last, **kwargs):
+    """The rows and YYYYMMDD dates of a fetch covering first..last."""
+    days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    return [row for day in days for row in day_rows(day, **kwargs)], [f"{day:%Y%m%d}" for day in days]
+
+
+def event_days(json_path, month="2025-03"):
+    rows = shards.read_shard(json_path, month)
+    return sorted({row["event.id"][1:] for row in rows})
+
+
+@pytest.fixture
+def json_path(tmp_path):
+    return tmp_path / "nba_games.json"
+
+
+def test_partial_month_fetch_keeps_the_other_days(json_path):
+    rows, dates = fetch(date(2025, 3, 13), date(2025, 3, 25))
+    shards.write_rows(json_path, rows, dates, today=TODAY)
+    rows, dates = fetch(date(2025, 3, 20), date(2025, 3, 25), score="111")
+    manifest, written = shards.write_rows(json_path, rows, dates, today=TODAY)
+
+    assert written == 1
+    assert event_days(json_path) == [f"202503{d}" for d in range(13, 26)]
+    shard = shards.read_shard(json_path, "2025-03")
+    scores = {row["event.id"]: row["competitors.score"] for row in shard}
+    assert scores["g20250319"] == "100" and scores["g20250320"] == "111"
+    assert len(shard) == 2 * 13
+    assert [row["event.date"] for row in shard] == sorted(row["event.date"] for row in shard)
+    assert manifest["shards"]["2025-03"]["first"] == "2025-03-13"
+
+
+def test_fetched_day_without_games_drops_its_old_rows(json_path):
+    rows, dates = fetch(date(2025, 3, 13), date(2025, 3, 16))
+    shards.write_rows(json_path, rows, dates, today=TODAY)
+    # The 15th was postponed: re-fetching it returns no games.
+    rows, dates = fetch(date(2025, 3, 14), date(2025, 3, 15))
+    shards.write_rows(json_path, rows[:2], dates, today=TODAY)
+    assert event_days(json_path) == ["20250313", "20250314", "20250316"]
+
+
+def test_failed_dates_are_not_passed_and_keep_their_rows(json_path):
+    rows, dates = fetch(date(2025, 3, 13), date(2025, 3, 14))
+    shards.write_rows(json_path, rows, dates, today=TODAY)
+    shards.write_rows(json_path, [], [], today=TODAY)
+    assert event_days(json_path) == ["20250313", "20250314"]
+
+
+def test_month_emptied_by_a_fetch_is_removed(json_path):
+    rows, dates = fetch(date(2025, 3, 30), date(2025, 4, 2))
+    shards.write_rows(json_path, rows, dates, today=TODAY)
+    manifest, _ = shards.write_rows(json_path, [], ["20250401", "20250402"], today=TODAY)
+    assert list(manifest["shards"]) == ["2025-03"]
+    assert not (shards.shard_dir(json_path) / "2025-04.json").exists()
+
+
+def test_without_dates_months_are_replaced(json_path):
+    rows, dates = fetch(date(2025, 3, 13), date(2025, 3, 25))
+    shards.write_rows(json_path, rows, dates, today=TODAY)
+    rows, _ = fetch(date(2025, 3, 20), date(2025, 3, 21))
+    shards.write_rows(json_path, rows, today=TODAY)
+    assert event_days(json_path) == ["20250320", "20250321"]
+
+
+def test_first_write_merges_the_legacy_file(json_path):
+    legacy, _ = fetch(date(2025, 3, 13), date(2025, 4, 5))
+    json_path.write_text(json.dumps(legacy))
+    rows, dates = fetch(date(2025, 3, 20), date(2025, 3, 22), score="90")
+    manifest, _ = shards.write_rows(json_path, rows, dates, today=TODAY)
+    assert list(manifest["shards"]) == ["2025-03", "2025-04"]
+    assert len(event_days(json_path)) == 19
+    assert manifest["shards"]["2025-04"]["rows"] == 2 * 5
+
+
+def test_unreadable_shard_fails_the_write(json_path):
+    rows, dates = fetch(date(2025, 3, 13), date(2025, 3, 14))
+    shards.write_rows(json_path, rows, dates, today=TODAY)
+    (shards.shard_dir(json_path) / "2025-03.json").write_text("[{")
+    with pytest.raises(OSError):
+        shards.write_rows(json_path, rows, dates, today=TODAY)
+
+
+def test_shards_are_streamed_with_a_version_stamp_and_snapshot(json_path, monkeypatch):
+    rows, dates = fetch(date(2025, 3, 30), date(2025, 4, 2))
+    manifest, written = shards.write_rows(json_path, rows, dates, today=TODAY)
+    directory = shards.shard_dir(json_path)
+    assert written == 2
+    for month in ("2025-03", "2025-04"):
+        path = directory / f"{month}.json"
+        stamp = atomic_json.read_version(path)
+        assert stamp["sha256"] == manifest["shards"][month]["sha256"]
+        assert stamp["sha256"] == hashlib.sha256(path.read_bytes()).hexdigest()
+        assert snapshot.read_snapshot(path) == json.loads(path.read_text())
+
+    # Readers take the snapshot and never decode the shard's JSON.
+    load = json.load
+
+    def load_manifest_or_snapshot(f):
+        assert f.name.endswith(("manifest.json", ".columnar.json")), f"decoded {f.name}"
+        return load(f)
+
+    monkeypatch.setattr(json, "load", load_manifest_or_snapshot)
+    assert len(shards.read_rows(json_path)) == len(rows)
+    monkeypatch.undo()
+
+    shards.write_rows(json_path, [], ["20250401", "20250402"], today=TODAY)
+    assert sorted(p.name for p in directory.iterdir()) == [
+        "2025-03.columnar.json", "2025-03.json", "2025-03.version.json", "manifest.json"]
+
+
+def test_unchanged_shard_is_not_rewritten(json_path):
+    rows, dates = fetch(date(2025, 3, 13), date(2025, 3, 20))
+    shards.write_rows(json_path, rows, dates, today=TODAY)
+    stamp = atomic_json.read_version(shards.shard_dir(json_path) / "2025-03.json")
+    rows, dates = fetch(date(2025, 3, 15), date(2025, 3, 16))
+    _, written = shards.write_rows(json_path, rows, dates, today=TODAY)
+    assert written == 0
+    assert atomic_json.read_version(shards.shard_dir(json_path) / "2025-03.json") == stamp
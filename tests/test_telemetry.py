@@ -0,0 +1,68 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from Data_Queries import telemetry
+
+
+@pytest.fixture(autouse=True)
+def log_path(monkeypatch, tmp_path):
+    path = tmp_path / "fetch_telemetry.jsonl"
+    monkeypatch.setattr(telemetry, "LOG_PATH", path)
+    monkeypatch.setattr(telemetry, "_summary_cache", {"key": None, "summary": None})
+    return path
+
+
+def _append_many(count):
+    for i in range(count):
+        telemetry.record_cycle("full", 0.1, {"NBA": {"saved": True, "rows": i}})
+
+
+def test_concurrent_writers_never_lose_records(monkeypatch, log_path, tmp_path):
+    monkeypatch.setattr(telemetry, "MAX_LOG_BYTES", 4096)
+    rotations = tmp_path / "rotations"
+    replace = os.replace
+
+    def recording_replace(src, dst):
+        time.sleep(0.02)  # widen the window between the size check and the rotation
+        with open(src, "rb") as f:
+            lines = f.read().count(b"\n")
+        replace(src, dst)
+        with open(rotations, "a") as f:
+            f.write(f"{lines}\n")
+
+    monkeypatch.setattr(os, "replace", recording_replace)
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_append_many, args=(200,)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+    rotated = [int(line) for line in rotations.read_text().split()]
+    with open(log_path, "rb") as f:
+        current = f.read().count(b"\n")
+    # Every record is in exactly one rotated generation or the current log.
+    assert len(rotated) > 1
+    assert sum(rotated) + current == 4 * 200
+
+
+def test_summary_is_cached_until_the_log_changes(monkeypatch):
+    telemetry.record_run("NBA", [{"date": "20250313", "ok": True, "rows": 4, "latency_ms": 12}], 0.5)
+    reads = []
+    read_records = telemetry.read_records
+    monkeypatch.setattr(telemetry, "read_records", lambda: reads.append(1) or read_records())
+
+    first = telemetry.summary()
+    assert telemetry.summary() is first
+    assert len(reads) == 1
+    assert telemetry.summary(cycles=5) is not first  # another window is another entry
+    assert len(reads) == 2
+
+    telemetry.record_run("NBA", [{"date": "20250313", "ok": False, "latency_ms": 40}], 0.7)
+    latest = telemetry.summary(cycles=5)
+    assert len(reads) == 3
+    assert latest["sports"]["NBA"]["runs"] == 2
+    assert latest["sports"]["NBA"]["failure_streaks"] == {"20250313": 1}
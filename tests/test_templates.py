@@ -0,0 +1,15 @@
+import json
+import re
+
+
+def test_index_stream_url_is_not_html_escaped(client):
+    body = client.get("/?sport=NBA&game_date=2025-03-15").get_data(as_text=True)
+    match = re.search(r"new EventSource\((.*?)\)", body)
+    assert match is not None
+    assert json.loads(match.group(1)) == "/stream?sport=NBA&game_date=2025-03-15"
+    assert "&amp;" not in match.group(1)
+
+
+def test_dashboard_stream_url(client):
+    body = client.get("/dashboard").get_data(as_text=True)
+    assert 'new EventSource("/stream")' in body
@@ -1,8 +1,10 @@
 import argparse
+import importlib
 import subprocess
 import sys
 import os
 import time
+from datetime import datetime, timedelta
 from threading import Thread
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -15,14 +17,50 @@ except ImportError:
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
+import event_registry
+import game_events
+import game_store
+import live_feed
+import live_stream
+import sqlite_store
+from Data_Queries import fetch_engine, telemetry
+
 # Force UTF-8 encoding in all subprocesses.
 os.environ["PYTHONUTF8"] = "1"
 
-def run_script(script_path, wait=True):
+# In-process mode: script -> (sport, module, entry point). The entry points return
+# {"rows", "saved", "failed_dates", "error"} (see Data_Queries.fetch_engine.fetch_result).
+IN_PROCESS_FETCHERS = {
+    "march_madness_games.py": ("MarchMadness", "Data_Queries.march_madness_games", "fetch_and_store_march_madness_games"),
+    "mlb_games.py": ("MLB", "Data_Queries.mlb_games", "fetch_and_store_mlb_games"),
+    "nba_games.py": ("NBA", "Data_Queries.nba_games", "fetch_and_store_nba_games"),
+    "nhl_games.py": ("NHL", "Data_Queries.nhl_games", "fetch_and_store_nhl_games"),
+}
+
+# Live lane: sport -> (module, url function, parse function) used to re-poll only the dates
+# with games in progress or about to start.
+LIVE_FETCHERS = {
+    "MarchMadness": ("Data_Queries.march_madness_games", "march_madness_url", "parse_march_madness_games"),
+    "MLB": ("Data_Queries.mlb_games", "mlb_url", "parse_mlb_games"),
+    "NBA": ("Data_Queries.nba_games", "nba_url", "parse_nba_games"),
+    "NHL": ("Data_Queries.nhl_games", "nhl_url", "parse_nhl_games"),
+}
+UPDATE_INTERVAL_MINUTES = 10  # full refresh of every sport
+LIVE_TICK_SECONDS = 15      # dates with games in progress are polled every tick
+LIVE_SOON_SECONDS = 30      # dates with games only about to start are polled at most this often
+LIVE_LEAD = timedelta(minutes=30)   # how long before its start a game counts as "starting soon"
+LIVE_MAX_LENGTH = timedelta(hours=6)  # unfinished games older than this are left to the full sweep
+
+_live_last_poll = {}
+
+# Shared executor for in-process runs so threads are reused across update cycles.
+_in_process_executor = ThreadPoolExecutor(max_workers=len(IN_PROCESS_FETCHERS), thread_name_prefix="fetcher")
+
+def run_script(script_path, wait=True, script_args=()):
     """Run a Python script using the current interpreter in UTF-8 mode."""
     try:
         print(f"Running {script_path}...")
-        cmd = [sys.executable, "-X", "utf8", script_path]
+        cmd = [sys.executable, "-X", "utf8", script_path, *script_args]
         if wait:
             result = subprocess.run(
                 cmd,
@@ -45,8 +83,71 @@ def run_script(script_path, wait=True):
         print(f"An exception occurred while running {script_path}: {e}")
         return False
 
-def update_all_scripts():
-    """Run all update scripts concurrently and publish the updated data."""
+def run_in_process(script_path, incremental=False):
+    """
+    Import a Data_Queries fetcher and run it in this interpreter.
+    Returns a structured result with the sport, rows, elapsed seconds and any errors.
+    """
+    sport, module_name, entry_point = IN_PROCESS_FETCHERS[os.path.basename(script_path)]
+    print(f"Running {module_name}.{entry_point} in-process...")
+    start = time.perf_counter()
+    result = {"script": script_path, "sport": sport, "rows": [], "saved": False,
+              "failed_dates": [], "errors": []}
+    try:
+        module = importlib.import_module(module_name)
+        outcome = getattr(module, entry_point)(incremental_mode=incremental) or {}
+        result["rows"] = outcome.get("rows", [])
+        result["saved"] = outcome.get("saved", False)
+        result["failed_dates"] = outcome.get("failed_dates", [])
+        if outcome.get("error"):
+            result["errors"].append(outcome["error"])
+    except Exception as e:
+        print(f"An exception occurred while running {module_name}: {e}")
+        result["errors"].append(str(e))
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+def update_all_in_process(incremental=False):
+    """Run every fetcher in-process on the shared executor and publish the sports that were saved."""
+    start = time.perf_counter()
+    futures = [
+        _in_process_executor.submit(run_in_process, script, incremental)
+        for script in IN_PROCESS_FETCHERS
+    ]
+    results = [future.result() for future in futures]
+
+    print("\nUpdate Summary:")
+    for result in results:
+        status = "Succeeded" if result["saved"] else "Failed"
+        detail = f"{len(result['rows'])} rows in {result['elapsed']:.1f}s"
+        if result["failed_dates"]:
+            detail += f", {len(result['failed_dates'])} dates failed"
+        if result["errors"]:
+            detail += f", errors: {'; '.join(result['errors'])}"
+        print(f"  {result['sport']}: {status} ({detail})")
+    telemetry.record_cycle("in-process", time.perf_counter() - start, {
+        result["sport"]: {
+            "saved": result["saved"],
+            "rows": len(result["rows"]),
+            "elapsed": round(result["elapsed"], 3),
+            "failed_dates": result["failed_dates"],
+            "errors": result["errors"],
+        }
+        for result in results
+    })
+
+    publish_data(sorted(r["sport"] for r in results if r["saved"]))
+    return results
+
+def update_all_scripts(incremental=False, in_process=False):
+    """
+    Run all update scripts concurrently and publish the updated data.
+    With incremental=True the scripts only re-fetch dates whose games can still change.
+    With in_process=True the fetchers run as imported modules instead of subprocesses.
+    """
+    if in_process:
+        return update_all_in_process(incremental=incremental)
+
     update_scripts = [
         "Data_Queries/march_madness_games.py",
         "Data_Queries/mlb_games.py",
@@ -68,9 +169,14 @@ def update_all_scripts():
                 print(f"Warning: Script {script} not found, skipping.")
     
     # Run scripts concurrently using ThreadPoolExecutor.
+    start = time.perf_counter()
     results = []
+    script_args = ["--incremental"] if incremental else []
     with ThreadPoolExecutor(max_workers=len(scripts_to_run)) as executor:
-        future_to_script = {executor.submit(run_script, script): script for script in scripts_to_run}
+        future_to_script = {
+            executor.submit(run_script, script, script_args=script_args): script
+            for script in scripts_to_run
+        }
         for future in as_completed(future_to_script):
             script = future_to_script[future]
             try:
@@ -85,27 +191,126 @@ def update_all_scripts():
     for script, success in results:
         status = "Succeeded" if success else "Failed"
         print(f"  {os.path.basename(script)}: {status}")
-    
+    # Per-date timings are logged by the scripts themselves; record the cycle totals here.
+    sports = {IN_PROCESS_FETCHERS[os.path.basename(script)][0]: {"saved": bool(success)}
+              for script, success in results}
+    telemetry.record_cycle("subprocess", time.perf_counter() - start, sports)
+
     publish_data()
 
-def publish_data():
-    """Publish the updated data when it's ready."""
+def publish_data(sports=None):
+    """Publish the updated data when it's ready; `sports` limits the reload to the sports that were written."""
     print("Data published and ready to serve!")
     if app and hasattr(app, 'refresh_data'):
         try:
-            app.refresh_data()
+            app.refresh_data(sports)
             print("App data refreshed successfully.")
         except Exception as e:
             print(f"Error refreshing app data: {e}")
+            return
+        # Push the events whose scores/status/pick results changed to /stream subscribers,
+        # here and (through the live feed) in the serve.py workers.
+        events = [event for sport in game_store.SPORT_FILES for event in game_store.get_games(sport)]
+        live_stream.publish_events(events)
+        live_feed.append({"type": "refresh"})
+
+def live_dates(events, now):
+    """
+    Return ({ESPN date: in_progress}, event ids) for the events that are in progress or
+    start within LIVE_LEAD, judged from the stored start times and status.
+    """
+    dates = {}
+    event_ids = set()
+    for event in events:
+        if event.start is None or event.final:
+            continue
+        in_progress = event.state == "in" or event.start <= now
+        if in_progress and now - event.start > LIVE_MAX_LENGTH:
+            continue
+        if in_progress or event.start - now <= LIVE_LEAD:
+            date_str = event.et_date.strftime("%Y%m%d")
+            dates[date_str] = dates.get(date_str, False) or in_progress
+            event_ids.add(event.event_id)
+    return dates, event_ids
+
+def poll_live_games(now=None):
+    """
+    Fast lane: re-fetch only the dates with live or imminent games and push the changed
+    events into the served data. Returns {sport: [changed Event, ...]}.
+    """
+    now = now or datetime.now(game_events.EASTERN)
+    changed = {}
+    changed_rows = {}
+    for sport, (module_name, url_name, parse_name) in LIVE_FETCHERS.items():
+        dates, event_ids = live_dates(game_store.get_games(sport), now)
+        due = []
+        for date_str, in_progress in dates.items():
+            last_poll = _live_last_poll.get((sport, date_str))
+            if in_progress or last_poll is None or (now - last_poll).total_seconds() >= LIVE_SOON_SECONDS:
+                due.append(date_str)
+        if not due:
+            continue
+        module = importlib.import_module(module_name)
+        results = fetch_engine.fetch_all_rows(due, getattr(module, url_name), getattr(module, parse_name))
+        rows = []
+        for date_str, date_rows in zip(due, results):
+            if date_rows is not None:
+                _live_last_poll[(sport, date_str)] = now
+                rows.extend(row for row in date_rows if row.get("event.id") in event_ids)
+        if not rows:
+            continue
+        if sqlite_store.enabled():
+            sqlite_store.upsert_rows(sport, rows)
+        updated = game_store.apply_events(sport, game_events.from_rows(sport, rows))
+        if updated:
+            changed[sport] = updated
+            updated_ids = {event.event_id for event in updated}
+            changed_rows[sport] = [row for row in rows if row.get("event.id") in updated_ids]
+    if changed:
+        publish_live(changed, changed_rows)
+    return changed
+
+def publish_live(changed, rows=None):
+    """
+    Push events updated by the live lane (already swapped into the game store) to /stream.
+    `rows` ({sport: rows of the changed events}) also go to the live feed for serve.py's workers.
+    """
+    summary = ", ".join(f"{sport}: {len(events)}" for sport, events in changed.items())
+    print(f"Live update published ({summary} changed events)")
+    live_stream.publish_events([event for events in changed.values() for event in events])
+    if rows:
+        live_feed.append({"type": "live", "rows": rows})
+
+def apply_published(record):
+    """
+    Apply a live feed record written by another process's publish_data()/publish_live()
+    to this process's data and push the changed events to its /stream subscribers.
+    """
+    if record.get("type") == "live":
+        changed = []
+        for sport, rows in record.get("rows", {}).items():
+            changed.extend(game_store.apply_events(sport, game_events.from_rows(sport, rows)))
+        live_stream.publish_events(changed)
+    elif record.get("type") == "refresh":
+        # Sports whose files changed are re-read here; unchanged ones stay cached.
+        events = [event for sport in game_store.SPORT_FILES for event in game_store.get_games(sport)]
+        event_registry.sync()
+        live_stream.publish_events(events)
+
+def main(run_server=False, incremental=False, in_process=False, live=True):
+    update_kwargs = {"incremental": incremental, "in_process": in_process}
 
-def main(run_server=False):
     # Start the background scheduler to update data every 10 minutes.
     scheduler = BackgroundScheduler()
-    scheduler.add_job(update_all_scripts, 'interval', minutes=10)
+    scheduler.add_job(update_all_scripts, 'interval', minutes=UPDATE_INTERVAL_MINUTES, kwargs=update_kwargs)
+    if live and app:
+        # Fast lane for games in progress; it does nothing while no game is live or about to start.
+        scheduler.add_job(poll_live_games, 'interval', seconds=LIVE_TICK_SECONDS,
+                          max_instances=1, coalesce=True)
     scheduler.start()
 
     # Run an immediate update in a non-daemon thread to ensure it completes.
-    immediate_update_thread = Thread(target=update_all_scripts)
+    immediate_update_thread = Thread(target=update_all_scripts, kwargs=update_kwargs)
     immediate_update_thread.daemon = False
     immediate_update_thread.start()
 
@@ -126,5 +331,12 @@ def main(run_server=False):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run the update script as a standalone Python script.")
     parser.add_argument("--server", action="store_true", help="Start the Flask server if available.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-fetch today, upcoming dates and dates with unfinished games.")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run the fetchers as imported modules instead of one subprocess per sport.")
+    parser.add_argument("--no-live", action="store_true",
+                        help="Disable the fast polling lane for games in progress.")
     args = parser.parse_args()
-    main(run_server=args.server)
+    main(run_server=args.server, incremental=args.incremental, in_process=args.in_process,
+         live=not args.no_live)